@@ -0,0 +1,140 @@
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import hydrolib.core
+import typer
+
+from benchmarks.models import SIZES, generate_model
+from benchmarks.suite import (
+    BenchmarkResult,
+    compare_results,
+    create_benchmarks,
+    run_benchmarks,
+)
+
+
+app = typer.Typer(help="Benchmark the hot paths of the FlowFM-inspector core.")
+
+RESULTS_FOLDER = Path(__file__).parent / "results"
+
+
+def get_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_result(name: str, result: BenchmarkResult) -> None:
+    typer.echo(
+        f"{name:<32} {result.median * 1000:10.3f} ms "
+        f"(min {result.min * 1000:.3f} ms, stdev {result.stdev * 1000:.3f} ms, "
+        f"{result.rounds} x {result.number})"
+    )
+
+
+@app.command()
+def run(
+    size: str = typer.Option(
+        "large", help=f"The size of the generated model: {', '.join(SIZES)}."
+    ),
+    rounds: int = typer.Option(5, min=1, help="The number of measured rounds."),
+    select: Optional[str] = typer.Option(
+        None, help="Only run the benchmarks of which the name contains this text."
+    ),
+    model: Optional[Path] = typer.Option(
+        None,
+        exists=True,
+        dir_okay=False,
+        help="Benchmark an existing MDU file instead of a generated model.",
+    ),
+    output: Optional[Path] = typer.Option(
+        None,
+        dir_okay=False,
+        help=(
+            "The JSON file to write the results to. "
+            "Defaults to benchmarks/results/<commit>-<size>.json."
+        ),
+    ),
+):
+    """
+    Run the benchmarks and write the results to a JSON file.
+    """
+    if size not in SIZES:
+        raise typer.BadParameter(f"Unknown size {size}.", param_hint="--size")
+
+    commit = get_commit()
+
+    with tempfile.TemporaryDirectory(prefix="flowfm-inspector-benchmarks-") as tmp:
+        folder = Path(tmp)
+        model_path = model or generate_model(folder / "model", SIZES[size])
+
+        typer.echo(f"Benchmarking {model_path}")
+        benchmarks = create_benchmarks(model_path, folder)
+        results = run_benchmarks(benchmarks, rounds, select, print_result)
+
+    content = {
+        "created": datetime.now().isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "hydrolib": hydrolib.core.__version__,
+        "platform": platform.platform(),
+        "model": str(model) if model else size,
+        "size": None if model else SIZES[size]._asdict(),
+        "results": {name: result.dict() for name, result in results.items()},
+    }
+
+    label = "custom" if model else size
+    output = output or RESULTS_FOLDER / f"{commit or 'local'}-{label}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(content, indent=2))
+    typer.echo(f"Results written to {output}")
+
+
+@app.command()
+def compare(
+    baseline: Path = typer.Argument(..., exists=True, dir_okay=False),
+    current: Path = typer.Argument(..., exists=True, dir_okay=False),
+    threshold: float = typer.Option(
+        0.1, min=0.0, help="The relative slow down considered a regression."
+    ),
+):
+    """
+    Compare two results files, and fail if any benchmark regressed.
+    """
+    baseline_content = json.loads(baseline.read_text())
+    current_content = json.loads(current.read_text())
+    ratios = compare_results(baseline_content, current_content)
+
+    regressions = 0
+    for name, ratio in ratios.items():
+        if ratio is None:
+            typer.echo(f"{name:<32} {'new':>8}")
+            continue
+
+        regressed = ratio > 1.0 + threshold
+        regressions += regressed
+        marker = "  REGRESSION" if regressed else ""
+        typer.echo(f"{name:<32} {ratio:8.2f}x{marker}")
+
+    if regressions:
+        typer.echo(
+            f"{regressions} benchmark(s) regressed by more than {threshold:.0%}."
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    app()
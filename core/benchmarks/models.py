@@ -0,0 +1,166 @@
+import re
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+
+from hydrolib.core.io.mdu.models import FMModel
+
+
+class ModelSize(NamedTuple):
+    """ModelSize describes the number of objects of a generated model.
+
+    Properties:
+        structures (int): The number of weirs in each structure file.
+        structure_files (int): The number of structure files.
+        cross_sections (int): The number of cross-section definitions and locations.
+        boundaries (int): The number of boundaries of the external forcing file.
+        timesteps (int): The number of rows of the time series of each boundary.
+        observation_files (int): The number of observation point files.
+    """
+
+    structures: int
+    structure_files: int
+    cross_sections: int
+    boundaries: int
+    timesteps: int
+    observation_files: int
+
+
+SIZES: Dict[str, ModelSize] = {
+    "small": ModelSize(
+        structures=10,
+        structure_files=1,
+        cross_sections=10,
+        boundaries=4,
+        timesteps=24,
+        observation_files=1,
+    ),
+    "large": ModelSize(
+        structures=250,
+        structure_files=4,
+        cross_sections=2000,
+        boundaries=100,
+        timesteps=500,
+        observation_files=5,
+    ),
+}
+
+
+def _ini(file_type: str, file_version: str, sections: List[str]) -> str:
+    header = f"[General]\nfileVersion = {file_version}\nfileType = {file_type}\n"
+    return "\n".join([header] + sections)
+
+
+def _write_structures(folder: Path, size: ModelSize) -> List[str]:
+    names = []
+    for n in range(size.structure_files):
+        sections = [
+            f"[Structure]\nid = weir_{n}_{i}\nname = weir_{n}_{i}\ntype = weir\n"
+            f"branchId = branch_{i % 100}\nchainage = {10.0 * i}\n"
+            f"allowedFlowDir = both\ncrestLevel = {1.0 + i % 7 * 0.25}\n"
+            f"crestWidth = 5.0\ncorrCoeff = 1.0\nuseVelocityHeight = true\n"
+            for i in range(size.structures)
+        ]
+        name = f"structures_{n}.ini"
+        (folder / name).write_text(_ini("structure", "3.00", sections))
+        names.append(name)
+    return names
+
+
+def _write_cross_sections(folder: Path, size: ModelSize) -> List[str]:
+    definitions = [
+        f"[Definition]\nid = definition_{i}\ntype = circle\n"
+        f"diameter = {1.0 + i % 5}\nfrictionId = Channels\n"
+        for i in range(size.cross_sections)
+    ]
+    locations = [
+        f"[CrossSection]\nid = crosssection_{i}\nbranchId = branch_{i % 100}\n"
+        f"chainage = {5.0 * i}\nshift = 0.0\ndefinitionId = definition_{i}\n"
+        for i in range(size.cross_sections)
+    ]
+    (folder / "crsdef.ini").write_text(_ini("crossDef", "3.00", definitions))
+    (folder / "crsloc.ini").write_text(_ini("crossLoc", "3.00", locations))
+    return ["crsdef.ini", "crsloc.ini"]
+
+
+def _write_boundaries(folder: Path, size: ModelSize) -> str:
+    # hydrolib parses a forcing file again for every boundary referencing it,
+    # and fails to parse forcing files with a single forcing, as such the
+    # boundaries share a forcing file per pair.
+    rows = "\n".join(
+        f"{60.0 * t} {1.0 + (t % 12) * 0.1:.2f}" for t in range(size.timesteps)
+    )
+    forcings: Dict[str, List[str]] = {}
+    boundaries = []
+    for i in range(size.boundaries):
+        name = f"boundaries_{i // 2}.bc"
+        forcings.setdefault(name, []).append(
+            f"[Forcing]\nname = node_{i}\nfunction = timeseries\n"
+            f"timeInterpolation = linear\n"
+            f"quantity = time\nunit = minutes since 2001-01-01\n"
+            f"quantity = waterlevelbnd\nunit = m\n{rows}\n"
+        )
+        boundaries.append(
+            f"[Boundary]\nquantity = waterlevelbnd\nnodeId = node_{i}\n"
+            f"forcingFile = {name}\n"
+        )
+
+    for name, sections in forcings.items():
+        (folder / name).write_text(_ini("boundConds", "1.01", sections))
+    (folder / "forcings.ext").write_text(_ini("extForce", "2.01", boundaries))
+    return "forcings.ext"
+
+
+def _write_observation_files(folder: Path, size: ModelSize) -> List[str]:
+    names = []
+    for i in range(size.observation_files):
+        points = "\n".join(f"{10.0 * j} {10.0 * i} 'obs_{i}_{j}'" for j in range(50))
+        name = f"observations_{i}_obs.xyn"
+        (folder / name).write_text(points + "\n")
+        names.append(name)
+    return names
+
+
+def _set_value(content: str, key: str, value: str) -> str:
+    pattern = re.compile(
+        rf"^(\s*{re.escape(key)}\s*=).*$", re.MULTILINE | re.IGNORECASE
+    )
+    return pattern.sub(lambda match: f"{match.group(1)} {value}", content, count=1)
+
+
+def generate_model(folder: Path, size: ModelSize) -> Path:
+    """Generate an MDU file with all of its fields and referenced files.
+
+    The MDU file contains every field of the FMModel, as written by hydrolib,
+    while the number of objects in the referenced files is set by the size.
+
+    Args:
+        folder (Path): The folder to write the files to, which is created.
+        size (ModelSize): The number of objects of the model.
+
+    Returns:
+        Path: The path of the MDU file.
+    """
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / "model.mdu"
+
+    model = FMModel()
+    model.filepath = path
+    model.save()
+
+    references = {
+        "structureFile": ";".join(_write_structures(folder, size)),
+        "crossDefFile": _write_cross_sections(folder, size)[0],
+        "crossLocFile": "crsloc.ini",
+        "extForceFileNew": _write_boundaries(folder, size),
+        "obsFile": ";".join(_write_observation_files(folder, size)),
+        # hydrolib writes these lists with the wrong delimiter.
+        "cdBreakpoints": "0.00063 0.00723",
+        "windSpeedBreakpoints": "0.0 100.0",
+    }
+
+    content = path.read_text()
+    for key, value in references.items():
+        content = _set_value(content, key, value)
+    path.write_text(content)
+
+    return path
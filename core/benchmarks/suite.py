@@ -0,0 +1,266 @@
+import statistics
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from hydrolib.core.io.mdu.models import FMModel
+from pydantic import BaseModel as PydanticBaseModel
+
+from flowfm_inspector.basemodel import BaseModel
+from flowfm_inspector.internal.appdata import AppDataManager
+from flowfm_inspector.internal.network import disable_network_loading
+from flowfm_inspector.internal.schema import (
+    SchemaRegistry,
+    get_sanitized_schema,
+    serialize_json,
+)
+from flowfm_inspector.internal.serialization import ModelSerializationCache
+from flowfm_inspector.internal.updates import (
+    FieldUpdate,
+    apply_update,
+    apply_updates,
+)
+
+
+class BenchmarkResult(BaseModel):
+    """BenchmarkResult describes the measured duration of a single benchmark.
+
+    Properties:
+        number (int): The number of calls per round.
+        rounds (int): The number of measured rounds.
+        min (float): The fastest duration of a call in seconds.
+        median (float): The median duration of a call in seconds.
+        mean (float): The mean duration of a call in seconds.
+        stdev (float): The standard deviation of the duration of a call in seconds.
+    """
+
+    number: int
+    rounds: int
+    min: float
+    median: float
+    mean: float
+    stdev: float
+
+
+class Benchmark(NamedTuple):
+    """Benchmark describes a single timed operation.
+
+    Properties:
+        name (str): The name of the benchmark.
+        run (Callable[[], object]): The operation to time, set up beforehand.
+    """
+
+    name: str
+    run: Callable[[], object]
+
+
+class _AppDataDescription:
+    def __init__(self, config_path: Path) -> None:
+        self._config_path = config_path
+
+    @property
+    def config_path(self) -> Path:
+        return self._config_path
+
+
+def measure(run: Callable[[], object], rounds: int) -> BenchmarkResult:
+    """Measure the duration of the provided operation.
+
+    The number of calls per round is chosen such that a round takes at least
+    0.2 seconds, and the first round is discarded as warm up.
+
+    Args:
+        run (Callable[[], object]): The operation to time.
+        rounds (int): The number of measured rounds.
+
+    Returns:
+        BenchmarkResult: The duration of a call.
+    """
+    timer = timeit.Timer(run)
+    number, _ = timer.autorange()
+    durations = [t / number for t in timer.repeat(repeat=rounds + 1, number=number)]
+    durations = durations[1:]
+
+    return BenchmarkResult(
+        number=number,
+        rounds=rounds,
+        min=min(durations),
+        median=statistics.median(durations),
+        mean=statistics.mean(durations),
+        stdev=statistics.stdev(durations) if len(durations) > 1 else 0.0,
+    )
+
+
+def _schema_benchmarks(model: FMModel) -> Iterator[Benchmark]:
+    submodels = [
+        type(value)
+        for value in model.__dict__.values()
+        if isinstance(value, PydanticBaseModel)
+    ]
+    registry = SchemaRegistry({"mdu": {m.__name__.lower(): m for m in submodels}})
+
+    def sanitized_schemas():
+        for submodel in submodels:
+            # pydantic caches the generated schema of a model.
+            submodel.__schema_cache__.clear()
+            get_sanitized_schema(submodel)
+
+    yield Benchmark("schema.sanitized_schemas", sanitized_schemas)
+    yield Benchmark("schema.registry_category", lambda: registry.get_category("mdu"))
+
+
+def _serialization_benchmarks(model: FMModel) -> Iterator[Benchmark]:
+    def model_dict():
+        return model.dict(
+            by_alias=True,
+            exclude_defaults=False,
+            exclude_none=False,
+            exclude_unset=False,
+        )
+
+    id = uuid4()
+    cache = ModelSerializationCache()
+    cache.serialize(id, model)
+
+    yield Benchmark("serialization.model_dict", model_dict)
+    yield Benchmark(
+        "serialization.model_json",
+        lambda: serialize_json(jsonable_encoder(model_dict())),
+    )
+    yield Benchmark(
+        "serialization.cache_cold",
+        lambda: ModelSerializationCache().serialize(id, model),
+    )
+    yield Benchmark("serialization.cache_warm", lambda: cache.serialize(id, model))
+
+
+def _update_benchmarks(model: FMModel) -> Iterator[Benchmark]:
+    single = [
+        FieldUpdate(submodel="time", field="tstop", value=value)
+        for value in (7200.0, 3600.0)
+    ]
+    batches = [
+        [
+            FieldUpdate(submodel="time", field="tstop", value=value),
+            FieldUpdate(submodel="geometry", field="bedlevuni", value=-value / 1000),
+            FieldUpdate(submodel="physics", field="ag", value=9.81 + value / 1e6),
+            FieldUpdate(submodel="numerics", field="cflmax", value=0.7),
+            FieldUpdate(
+                submodel="general",
+                field="program",
+                type="comments",
+                value=f"Updated {value}",
+            ),
+        ]
+        * 10
+        for value in (7200.0, 3600.0)
+    ]
+    counter = iter(range(1 << 62))
+
+    def update_single():
+        apply_update(model, single[next(counter) % 2])
+
+    def update_batch():
+        results = apply_updates(model, batches[next(counter) % 2])
+        assert all(result.ok for result in results)
+
+    yield Benchmark("updates.single", update_single)
+    yield Benchmark("updates.batch_50", update_batch)
+
+
+def _appdata_benchmarks(folder: Path) -> Iterator[Benchmark]:
+    projects = []
+    for i in range(20):
+        path = folder / "projects" / f"project_{i}.mdu"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+        projects.append(path)
+
+    manager = AppDataManager(_AppDataDescription(folder / "appdata" / "config.json"))
+    for path in projects:
+        manager.update_recent_project(path)
+    counter = iter(range(1 << 62))
+
+    yield Benchmark(
+        "appdata.update_recent_project",
+        lambda: manager.update_recent_project(projects[next(counter) % len(projects)]),
+    )
+
+
+def create_benchmarks(model_path: Path, folder: Path) -> List[Benchmark]:
+    """Create the benchmarks of the core hot paths for the provided model.
+
+    Args:
+        model_path (Path): The path of the MDU file to benchmark.
+        folder (Path): The folder to write temporary files to.
+
+    Returns:
+        List[Benchmark]: The benchmarks, set up and ready to run.
+    """
+    disable_network_loading()
+    model = FMModel(model_path)
+
+    return [
+        Benchmark("load.parse_model", lambda: FMModel(model_path)),
+        *_schema_benchmarks(model),
+        *_serialization_benchmarks(model),
+        *_update_benchmarks(model),
+        *_appdata_benchmarks(folder),
+    ]
+
+
+def run_benchmarks(
+    benchmarks: List[Benchmark],
+    rounds: int,
+    selection: Optional[str] = None,
+    report: Optional[Callable[[str, BenchmarkResult], None]] = None,
+) -> Dict[str, BenchmarkResult]:
+    """Run the provided benchmarks in order.
+
+    Args:
+        benchmarks (List[Benchmark]): The benchmarks to run.
+        rounds (int): The number of measured rounds per benchmark.
+        selection (Optional[str], optional):
+            Only run the benchmarks of which the name contains this text.
+            Defaults to None.
+        report (Optional[Callable[[str, BenchmarkResult], None]], optional):
+            Called with the result of each benchmark once measured.
+            Defaults to None.
+
+    Returns:
+        Dict[str, BenchmarkResult]: The result per benchmark name.
+    """
+    results: Dict[str, BenchmarkResult] = {}
+
+    for benchmark in benchmarks:
+        if selection is not None and selection not in benchmark.name:
+            continue
+
+        results[benchmark.name] = measure(benchmark.run, rounds)
+        if report is not None:
+            report(benchmark.name, results[benchmark.name])
+
+    return results
+
+
+def compare_results(baseline: Dict, current: Dict) -> Dict[str, Optional[float]]:
+    """Compare the median durations of two benchmark results.
+
+    Args:
+        baseline (Dict): The content of the baseline results file.
+        current (Dict): The content of the current results file.
+
+    Returns:
+        Dict[str, Optional[float]]:
+            The ratio of the current to the baseline median per benchmark of the
+            current results, None if the benchmark is not part of the baseline.
+    """
+    ratios: Dict[str, Optional[float]] = {}
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        ratios[name] = (
+            None if previous is None else result["median"] / previous["median"]
+        )
+    return ratios
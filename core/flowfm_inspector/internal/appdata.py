@@ -2,9 +2,10 @@ from datetime import datetime
 from pathlib import Path
 from platformdirs import user_data_dir
 from pydantic import validator
-from typing import List, Protocol
+from typing import List, Optional, Protocol
 
 from flowfm_inspector.basemodel import BaseModel
+from flowfm_inspector.internal.metrics import MetricsRegistry, span
 
 
 class RecentProject(BaseModel):
@@ -93,6 +94,14 @@ class AppDataFileDescription(BaseModel):
     def config_path(self) -> Path:
         return Path(user_data_dir(self.name, self.author)) / "config.json"
 
+    @property
+    def parse_cache_path(self) -> Path:
+        return Path(user_data_dir(self.name, self.author)) / "parse-cache"
+
+    @property
+    def profiles_path(self) -> Path:
+        return Path(user_data_dir(self.name, self.author)) / "profiles"
+
 
 class AppDataContent(BaseModel):
     """AppDataContent describes the data stored in the AppDataFile
@@ -110,8 +119,13 @@ class AppDataManager:
     content to file.
     """
 
-    def __init__(self, appdata_description: AppDataFileDescriptionProtocol) -> None:
+    def __init__(
+        self,
+        appdata_description: AppDataFileDescriptionProtocol,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
         self._description: AppDataFileDescriptionProtocol = appdata_description
+        self._metrics = metrics
         self._content: AppDataContent = self._init_content()
 
     def _init_content(self) -> AppDataContent:
@@ -131,9 +145,10 @@ class AppDataManager:
 
     def _write(self) -> None:
         """Write this AppDataContent to the appdata location."""
-        AppDataManager._write_content_to_disk(
-            self._description.config_path, self._content
-        )
+        with span(self._metrics, "appdata_write"):
+            AppDataManager._write_content_to_disk(
+                self._description.config_path, self._content
+            )
 
     @property
     def content(self) -> AppDataContent:
@@ -0,0 +1,305 @@
+import asyncio
+import glob
+import multiprocessing
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from hydrolib.core.basemodel import FileModel
+from pydantic.types import UUID4
+
+from flowfm_inspector.basemodel import BaseModel
+from flowfm_inspector.internal.diskcache import DiskParseCache
+from flowfm_inspector.internal.network import disable_network_loading
+
+
+class BatchLoadResult(BaseModel):
+    """BatchLoadResult describes the outcome of loading a single model of a batch.
+
+    Properties:
+        path (Path): The path of the model file.
+        model_id (Optional[UUID4]): The id of the loaded model, if it was loaded.
+        error (Optional[str]): The error message, if the model failed to load.
+        duration (float): The time in seconds it took to load the model.
+    """
+
+    path: Path
+    model_id: Optional[UUID4] = None
+    error: Optional[str] = None
+    duration: float = 0.0
+
+
+def find_model_files(pattern: str, suffix: str = ".mdu") -> List[Path]:
+    """Find the model files matching the provided directory or glob pattern.
+
+    Args:
+        pattern (str):
+            Either a directory, which is searched recursively for files with the
+            suffix, or a glob pattern, in which "**" matches any sub directory.
+        suffix (str, optional): The suffix of the model files. Defaults to ".mdu".
+
+    Returns:
+        List[Path]: The sorted, resolved paths of the matching files.
+    """
+    directory = Path(pattern)
+    if directory.is_dir():
+        paths = (p for p in directory.rglob("*") if p.suffix.lower() == suffix)
+    else:
+        paths = (Path(p) for p in glob.iglob(pattern, recursive=True))
+
+    return sorted({p.resolve() for p in paths if p.is_file()})
+
+
+class ParseCache:
+    """The ParseCache keeps the parsed data of recently parsed files, such that
+    files referenced by multiple models, such as shared forcing files, are only
+    parsed once.
+
+    Entries are keyed by the model type, path, modification time and size of the
+    file, and stored pickled, such that every model receives its own copy. The
+    least recently used entries are evicted once the total size of the pickled
+    entries exceeds the maximum size. Files which are not in memory are retrieved
+    from the DiskParseCache, if any.
+    """
+
+    def __init__(
+        self, max_size: int = 64 * 1024 * 1024, disk: Optional[DiskParseCache] = None
+    ) -> None:
+        """Create a new ParseCache.
+
+        Args:
+            max_size (int, optional):
+                The maximum size of the entries kept in memory in bytes.
+                Defaults to 64 MB.
+            disk (Optional[DiskParseCache], optional):
+                The cache on disk to fall back to. Defaults to None.
+        """
+        self.disk = disk
+        self._lock = threading.Lock()
+        self._max_size = max_size
+        self._size = 0
+        self._entries: "OrderedDict[Tuple[str, Path, int, int], bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, model_type: Type[FileModel], path: Path, parse: Callable) -> Dict:
+        stat = path.stat()
+        key = (model_type.__qualname__, path, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return pickle.loads(data)
+
+        if self.disk is not None:
+            result = self.disk.parse(model_type, path, parse)
+        else:
+            result = parse()
+
+        data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with self._lock:
+            self.misses += 1
+            if len(data) > self._max_size:
+                return result
+
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self._max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+        return result
+
+
+_parse_cache: Optional[ParseCache] = None
+
+
+def install_parse_cache(cache: ParseCache) -> None:
+    """Route the parsing of files by hydrolib through the provided cache.
+
+    Args:
+        cache (ParseCache): The cache to use within this process.
+    """
+    global _parse_cache
+    if _parse_cache is None:
+        parse = FileModel._parse.__func__  # type: ignore[attr-defined]
+
+        def cached_parse(cls, path: Path) -> Dict:
+            return _parse_cache.parse(cls, path, lambda: parse(cls, path))
+
+        FileModel._parse = classmethod(cached_parse)  # type: ignore[assignment]
+
+    _parse_cache = cache
+
+
+def initialize_process(disk_cache: Optional[DiskParseCache]) -> None:
+    """Prepare a spawned process for parsing models with parse_model.
+
+    Args:
+        disk_cache (Optional[DiskParseCache]): The cache on disk to use, if any.
+    """
+    disable_network_loading()
+    install_parse_cache(ParseCache(disk=disk_cache))
+
+
+def parse_model(model_type: Type[FileModel], path: Path) -> bytes:
+    """Parse the model at the specified path and return it pickled."""
+    return pickle.dumps(model_type(path), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class BatchLoader:
+    """The BatchLoader loads batches of models in parallel on a process pool.
+
+    Every process keeps its own ParseCache, such that files shared between the
+    models parsed by a process are only parsed once. The parsed models are
+    transferred pickled, and unpickled and registered on the executor, such that
+    the event loop remains responsive.
+
+    The number of models being loaded at the same time is capped over all
+    batches, which bounds the number of parsed models waiting to be registered.
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        model_type: Type[FileModel],
+        register: Callable[[FileModel], UUID4],
+        max_processes: int = 2,
+        max_concurrency: int = 8,
+    ) -> None:
+        """Create a new BatchLoader.
+
+        Args:
+            executor (Executor):
+                The executor on which parsed models are unpickled and registered.
+            model_type (Type[FileModel]): The type of the models to load.
+            register (Callable[[FileModel], UUID4]):
+                Callback to register a loaded model, returning its id.
+            max_processes (int, optional):
+                The number of processes parsing models. Defaults to 2.
+            max_concurrency (int, optional):
+                The maximum number of models being loaded at the same time.
+                Defaults to 8.
+        """
+        self._executor = executor
+        self._model_type = model_type
+        self._register = register
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.configure(max_processes, max_concurrency)
+
+    def configure(
+        self,
+        max_processes: int,
+        max_concurrency: int,
+        disk_cache: Optional[DiskParseCache] = None,
+    ) -> None:
+        """Change the number of processes, the concurrency cap and the cache on
+        disk used by the processes.
+
+        This needs to be called before the first batch is loaded.
+        """
+        self._max_processes = max_processes
+        self._max_concurrency = max_concurrency
+        self._disk_cache = disk_cache
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        # Processes are spawned rather than forked, as forking a process running
+        # threads is not safe and spawning is the only option on Windows.
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self._max_processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=initialize_process,
+                initargs=(self._disk_cache,),
+            )
+        return self._process_pool
+
+    def shutdown(self) -> None:
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+
+    def _discard_broken_pool(self, pool: ProcessPoolExecutor) -> None:
+        # Every other model loaded by the broken pool fails with the same error,
+        # as such the pool might already have been replaced, which should be
+        # left running. The futures of a broken pool have all failed already,
+        # and are not cancelled such that no CancelledError is raised.
+        if self._process_pool is pool:
+            self._process_pool = None
+        pool.shutdown(wait=False)
+
+    async def load(self, paths: Iterable[Path]) -> AsyncIterator[BatchLoadResult]:
+        """Load the models at the provided paths, yielding the result of each
+        model as soon as it has been loaded.
+
+        Note that this needs to be called from within the running event loop.
+
+        Args:
+            paths (Iterable[Path]): The paths of the model files.
+
+        Yields:
+            BatchLoadResult: The result of each model, in order of completion.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        tasks = [asyncio.create_task(self._load_model(path)) for path in paths]
+
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _load_model(self, path: Path) -> BatchLoadResult:
+        loop = asyncio.get_running_loop()
+
+        async with self._semaphore:
+            start = time.perf_counter()
+            pool = self._get_process_pool()
+            try:
+                data = await loop.run_in_executor(
+                    pool, parse_model, self._model_type, path
+                )
+                model = await loop.run_in_executor(self._executor, pickle.loads, data)
+                model_id = await loop.run_in_executor(
+                    self._executor, self._register, model
+                )
+            except BrokenProcessPool as e:
+                # A crashed process breaks the pool, a new pool is created for the
+                # models loaded after it.
+                self._discard_broken_pool(pool)
+                return BatchLoadResult(
+                    path=path, error=str(e), duration=time.perf_counter() - start
+                )
+            except Exception as e:
+                return BatchLoadResult(
+                    path=path, error=str(e), duration=time.perf_counter() - start
+                )
+
+        return BatchLoadResult(
+            path=path, model_id=model_id, duration=time.perf_counter() - start
+        )
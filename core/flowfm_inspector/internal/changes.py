@@ -0,0 +1,195 @@
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Sequence, Tuple
+
+from pydantic import BaseModel as PydanticBaseModel
+from pydantic.types import UUID4
+
+from flowfm_inspector.basemodel import BaseModel
+from flowfm_inspector.internal.updates import (
+    DataSpecification,
+    FieldUpdate,
+    read_value,
+)
+
+
+class FieldChange(BaseModel):
+    """FieldChange describes a single applied change of a value or comment.
+
+    Properties:
+        version (int): The model version introduced by this change.
+        submodel (str): The name of the submodel containing the field.
+        field (str): The name of the changed field.
+        type (DataSpecification): Whether the value or the comment changed.
+        value (Any): The value or comment after the change.
+    """
+
+    version: int
+    submodel: str
+    field: str
+    type: DataSpecification
+    value: Any
+
+
+class ModelChanges(BaseModel):
+    """ModelChanges describes the changes of a model since some version.
+
+    Properties:
+        version (int): The current version of the model.
+        resync (bool):
+            Whether the changes since the requested version are no longer
+            available, in which case the full model needs to be retrieved.
+        changes (List[FieldChange]): The changes since the requested version.
+    """
+
+    version: int
+    resync: bool = False
+    changes: List[FieldChange] = []
+
+
+class ModelChangeLog:
+    """The ModelChangeLog keeps track of the version of a single model, together
+    with a bounded log of the most recent field changes.
+
+    Every recorded batch of updates increases the version by one. Once the log
+    is full, the oldest changes are evicted; clients requesting changes since an
+    evicted version need to retrieve the full model again.
+    """
+
+    def __init__(self, max_changes: int = 1000) -> None:
+        """Create a new ModelChangeLog at version 0.
+
+        Args:
+            max_changes (int, optional):
+                The maximum number of changes to retain. Defaults to 1000.
+        """
+        self._lock = threading.Lock()
+        self._version = 0
+        self._evicted_version = 0
+        self._changes: Deque[FieldChange] = deque()
+        self._max_changes = max_changes
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def record(
+        self, model: PydanticBaseModel, updates: Sequence[FieldUpdate]
+    ) -> List[FieldChange]:
+        """Record the provided updates, which have been applied to the model, as a
+        new version.
+
+        Args:
+            model (PydanticBaseModel): The model the updates have been applied to.
+            updates (Sequence[FieldUpdate]): The applied updates.
+
+        Returns:
+            List[FieldChange]: The recorded changes.
+        """
+        with self._lock:
+            self._version += 1
+            changes = [
+                FieldChange(
+                    version=self._version,
+                    submodel=update.submodel,
+                    field=update.field,
+                    type=update.type,
+                    value=read_value(model, update),
+                )
+                for update in updates
+            ]
+
+            self._append(changes)
+            return changes
+
+    def record_fields(
+        self,
+        model: PydanticBaseModel,
+        fields: Sequence[Tuple[str, str, DataSpecification]],
+    ) -> List[FieldChange]:
+        """Record the provided fields, which have been changed in the model by
+        other means than updates, e.g. by reloading files, as a new version.
+
+        Args:
+            model (PydanticBaseModel): The changed model.
+            fields (Sequence[Tuple[str, str, DataSpecification]]):
+                The submodel, field and specification of each changed field.
+
+        Returns:
+            List[FieldChange]: The recorded changes.
+        """
+        with self._lock:
+            self._version += 1
+            changes = []
+            for submodel, field, type in fields:
+                target = getattr(model, submodel)
+                if type == DataSpecification.comments:
+                    target = getattr(target, "comments", None)
+
+                changes.append(
+                    FieldChange(
+                        version=self._version,
+                        submodel=submodel,
+                        field=field,
+                        type=type,
+                        value=getattr(target, field, None),
+                    )
+                )
+
+            self._append(changes)
+            return changes
+
+    def _append(self, changes: List[FieldChange]) -> None:
+        self._changes.extend(changes)
+        while len(self._changes) > self._max_changes:
+            self._evicted_version = self._changes.popleft().version
+
+    def changes_since(self, version: int) -> ModelChanges:
+        """Get the changes applied after the specified version.
+
+        Args:
+            version (int): The version known by the client.
+
+        Returns:
+            ModelChanges:
+                The changes since the version, or a resync if these are no longer
+                available or the version is unknown.
+        """
+        with self._lock:
+            if version < self._evicted_version or version > self._version:
+                return ModelChanges(version=self._version, resync=True)
+
+            changes = [c for c in self._changes if c.version > version]
+            return ModelChanges(version=self._version, changes=changes)
+
+
+class ChangeLogRegistry:
+    """The ChangeLogRegistry provides the ModelChangeLog of each model."""
+
+    def __init__(self, max_changes: int = 1000) -> None:
+        """Create a new empty ChangeLogRegistry.
+
+        Args:
+            max_changes (int, optional):
+                The maximum number of changes retained per model. Defaults to 1000.
+        """
+        self._max_changes = max_changes
+        self._logs: Dict[UUID4, ModelChangeLog] = {}
+
+    def __getitem__(self, id: UUID4) -> ModelChangeLog:
+        return self._logs[id]
+
+    def create(self, id: UUID4) -> ModelChangeLog:
+        """Create a new empty ModelChangeLog for the specified model.
+
+        Args:
+            id (UUID4): The id of the newly registered model.
+
+        Returns:
+            ModelChangeLog: The change log of the model.
+        """
+        self._logs[id] = ModelChangeLog(self._max_changes)
+        return self._logs[id]
+
+    def discard(self, id: UUID4) -> None:
+        self._logs.pop(id, None)
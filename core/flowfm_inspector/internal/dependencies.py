@@ -0,0 +1,309 @@
+import stat
+import threading
+from concurrent.futures import Executor
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from hydrolib.core.basemodel import FileModel, ResolveRelativeMode
+from pydantic import BaseModel as PydanticBaseModel
+from pydantic.types import UUID4
+
+from flowfm_inspector.basemodel import BaseModel
+
+
+# Fields referring to files written by the simulation rather than read by it.
+OUTPUT_FIELDS = {
+    "outputdir",
+    "waqoutputdir",
+    "flowgeomfile",
+    "hisfile",
+    "mapfile",
+    "classmapfile",
+}
+
+
+class FileReference(BaseModel):
+    """FileReference describes a reference from one file of a model to another.
+
+    Properties:
+        source (Path): The absolute path of the referencing file.
+        target (Path): The absolute path of the referenced file.
+        field (str): The field containing the reference, e.g. "geometry.netfile".
+    """
+
+    source: Path
+    target: Path
+    field: str
+
+
+class FileState(str, Enum):
+    present = "present"
+    missing = "missing"
+    modified = "modified"
+
+
+class FileNode(BaseModel):
+    """FileNode describes a single file of a model.
+
+    Properties:
+        path (Path): The absolute path of the file.
+        state (FileState):
+            Whether the file is present, missing, or modified since it was first
+            checked.
+        size (Optional[int]): The size in bytes, if the file exists.
+        modified (Optional[datetime]): The modification time, if the file exists.
+    """
+
+    path: Path
+    state: FileState
+    size: Optional[int] = None
+    modified: Optional[datetime] = None
+
+
+class DependencyGraph(BaseModel):
+    """DependencyGraph describes the files of a model and their references.
+
+    Properties:
+        root (Path): The absolute path of the model file.
+        files (List[FileNode]): Every file of the model, starting with the root.
+        references (List[FileReference]): The references between the files.
+        missing (List[Path]): The referenced files which do not exist.
+        modified (List[Path]): The files which changed since they were first checked.
+    """
+
+    root: Path
+    files: List[FileNode]
+    references: List[FileReference]
+    missing: List[Path] = []
+    modified: List[Path] = []
+
+
+def _resolve(path: Path, parent: Path, anchor: Path, mode: ResolveRelativeMode) -> Path:
+    if path.is_absolute():
+        return path
+    if mode == ResolveRelativeMode.ToAnchor:
+        return anchor / path
+    return parent / path
+
+
+class _FileEntry(NamedTuple):
+    field: str
+    source: Path
+    target: Path
+    model: Optional[FileModel]
+
+
+def _walk(model: FileModel) -> Iterator[_FileEntry]:
+    root = model.save_location
+    mode = model._relative_mode
+    visited: Set[int] = {id(model)}
+
+    def visit(node: PydanticBaseModel, source: Path, prefix: str):
+        for name in node.__fields__:
+            if name in OUTPUT_FIELDS or name == "filepath":
+                continue
+
+            value = getattr(node, name, None)
+            values = value if isinstance(value, list) else [value]
+
+            for i, item in enumerate(values):
+                field = f"{prefix}{name}" + (
+                    f"[{i}]" if isinstance(value, list) else ""
+                )
+
+                if isinstance(item, FileModel):
+                    if item.filepath is None or id(item) in visited:
+                        continue
+                    visited.add(id(item))
+
+                    target = _resolve(item.filepath, source.parent, root.parent, mode)
+                    yield _FileEntry(field, source, target, item)
+                    yield from visit(item, target, f"{field}.")
+                elif isinstance(item, Path):
+                    target = _resolve(item, source.parent, root.parent, mode)
+                    yield _FileEntry(field, source, target, None)
+                elif isinstance(item, PydanticBaseModel) and id(item) not in visited:
+                    visited.add(id(item))
+                    yield from visit(item, source, f"{prefix}{name}.")
+
+    return visit(model, root, "")
+
+
+def collect_references(model: FileModel) -> List[FileReference]:
+    """Collect the references to other files within the provided model tree.
+
+    Both child file models and plain path fields are collected, except for the
+    paths of output files. Relative paths are resolved the same way hydrolib
+    resolves them, relative to the referencing file or to the model file,
+    depending on the relative mode of the model.
+
+    Args:
+        model (FileModel): The root model.
+
+    Returns:
+        List[FileReference]: The references, in order of the fields.
+    """
+    return [
+        FileReference(source=entry.source, target=entry.target, field=entry.field)
+        for entry in _walk(model)
+    ]
+
+
+def collect_file_models(model: FileModel) -> List[Tuple[str, FileModel, Path]]:
+    """Collect the file models within the provided model tree.
+
+    Args:
+        model (FileModel): The root model.
+
+    Returns:
+        List[Tuple[str, FileModel, Path]]:
+            The field, model and absolute path of every file model, starting with
+            the root model, of which the field is an empty string.
+    """
+    return [("", model, model.save_location)] + [
+        (entry.field, entry.model, entry.target)
+        for entry in _walk(model)
+        if entry.model is not None
+    ]
+
+
+class FileInfo(NamedTuple):
+    path: Path
+    exists: bool
+    size: Optional[int] = None
+    mtime_ns: Optional[int] = None
+
+    @property
+    def version(self) -> Optional[Tuple[int, int]]:
+        """The modification time and size of a regular file, which change when
+        the file is written, or None if it is missing or not a regular file.
+        """
+        if self.size is None or self.mtime_ns is None:
+            return None
+        return self.mtime_ns, self.size
+
+
+def get_file_info(path: Path) -> FileInfo:
+    """Get the state of the file at the specified path."""
+    try:
+        result = path.stat()
+    except OSError:
+        return FileInfo(path=path, exists=False)
+
+    if not stat.S_ISREG(result.st_mode):
+        return FileInfo(path=path, exists=True, mtime_ns=result.st_mtime_ns)
+
+    return FileInfo(
+        path=path, exists=True, size=result.st_size, mtime_ns=result.st_mtime_ns
+    )
+
+
+class DependencyTracker:
+    """The DependencyTracker builds the dependency graphs of models, and reports
+    the files which changed since the first check of each model.
+
+    A file is considered modified when its modification time or size differs
+    from the first check. The content is never read, as such checks remain
+    cheap, even on network shares where every access is slow.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None) -> None:
+        """Create a new DependencyTracker.
+
+        Args:
+            executor (Optional[Executor], optional):
+                The executor on which the state of the files is retrieved in
+                parallel, if None the files are retrieved one by one.
+                Defaults to None.
+        """
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._baselines: Dict[UUID4, Dict[Path, Optional[Tuple[int, int]]]] = {}
+
+    def check(self, id: UUID4, model: FileModel) -> DependencyGraph:
+        """Build the dependency graph of the specified model.
+
+        The first check of a model records the modification time and size of
+        each file, against which later checks determine whether a file was
+        modified.
+
+        Args:
+            id (UUID4): The id of the model.
+            model (FileModel): The model.
+
+        Returns:
+            DependencyGraph: The dependency graph of the model.
+        """
+        root = model.save_location
+        references = collect_references(model)
+        paths = list(dict.fromkeys([root] + [r.target for r in references]))
+        infos = self._get_file_infos(paths)
+
+        with self._lock:
+            baseline = self._baselines.setdefault(id, {})
+            for path in paths:
+                if baseline.get(path) is None:
+                    baseline[path] = infos[path].version
+            baseline = dict(baseline)
+
+        files = [self._to_node(infos[path], baseline.get(path)) for path in paths]
+        return DependencyGraph(
+            root=root,
+            files=files,
+            references=references,
+            missing=[f.path for f in files if f.state == FileState.missing],
+            modified=[f.path for f in files if f.state == FileState.modified],
+        )
+
+    def _get_file_infos(self, paths: List[Path]) -> Dict[Path, FileInfo]:
+        if self._executor is None:
+            return {path: get_file_info(path) for path in paths}
+
+        # This is usually called on the executor itself, as such the calling
+        # thread retrieves the files which no worker has started on, rather than
+        # waiting for workers which might all be waiting in the same way.
+        futures = [self._executor.submit(get_file_info, path) for path in paths]
+        return {
+            path: get_file_info(path) if future.cancel() else future.result()
+            for path, future in zip(paths, futures)
+        }
+
+    @staticmethod
+    def _to_node(info: FileInfo, baseline: Optional[Tuple[int, int]]) -> FileNode:
+        if not info.exists:
+            return FileNode(path=info.path, state=FileState.missing)
+
+        state = (
+            FileState.modified
+            if baseline is not None
+            and info.version is not None
+            and baseline != info.version
+            else FileState.present
+        )
+        return FileNode(
+            path=info.path,
+            state=state,
+            size=info.size,
+            modified=datetime.fromtimestamp(info.mtime_ns / 1e9),
+        )
+
+    def reset(self, id: UUID4, paths: Optional[Iterable[Path]] = None) -> None:
+        """Forget the recorded state of the files of the specified model, such that
+        the next check records them again.
+
+        Args:
+            id (UUID4): The id of the model.
+            paths (Optional[Iterable[Path]], optional):
+                The paths to forget, if None all paths are forgotten.
+                Defaults to None.
+        """
+        with self._lock:
+            if paths is None:
+                self._baselines.pop(id, None)
+                return
+
+            baseline = self._baselines.get(id, {})
+            for path in paths:
+                baseline.pop(path, None)
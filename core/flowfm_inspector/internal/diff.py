@@ -0,0 +1,118 @@
+import json
+from typing import Any, Dict, List
+
+from pydantic import BaseModel as PydanticBaseModel
+from pydantic.types import UUID4
+
+from flowfm_inspector.basemodel import BaseModel
+from flowfm_inspector.internal.serialization import ModelSerializationCache
+from flowfm_inspector.internal.updates import DataSpecification
+
+
+class FieldDifference(BaseModel):
+    """FieldDifference describes a field of which the value or comment differs
+    between two models.
+
+    Properties:
+        submodel (str): The field name of the submodel containing the field.
+        field (str): The name of the field.
+        type (DataSpecification): Whether the value or the comment differs.
+        a (Any): The value or comment within the first model.
+        b (Any): The value or comment within the second model.
+    """
+
+    submodel: str
+    field: str
+    type: DataSpecification
+    a: Any
+    b: Any
+
+
+class ModelDiff(BaseModel):
+    """ModelDiff describes the differences between two models.
+
+    Properties:
+        a (UUID4): The id of the first model.
+        b (UUID4): The id of the second model.
+        identical (List[str]): The submodels which are identical.
+        differences (List[FieldDifference]): The fields which differ.
+    """
+
+    a: UUID4
+    b: UUID4
+    identical: List[str] = []
+    differences: List[FieldDifference] = []
+
+
+def _diff_dicts(
+    submodel: str,
+    type: DataSpecification,
+    a: Dict[str, Any],
+    b: Dict[str, Any],
+    names: Dict[str, str],
+) -> List[FieldDifference]:
+    return [
+        FieldDifference(
+            submodel=submodel,
+            field=names.get(key, key),
+            type=type,
+            a=a.get(key),
+            b=b.get(key),
+        )
+        for key in dict.fromkeys([*a, *b])
+        if a.get(key) != b.get(key)
+    ]
+
+
+def diff_models(
+    cache: ModelSerializationCache,
+    id_a: UUID4,
+    model_a: PydanticBaseModel,
+    id_b: UUID4,
+    model_b: PydanticBaseModel,
+) -> ModelDiff:
+    """Compute the differences between the submodels of two models.
+
+    Submodels with equal content digests are skipped without comparing their
+    fields. Only the submodels which differ are decoded from their cached
+    serialized JSON and compared field by field.
+
+    Args:
+        cache (ModelSerializationCache): The cache of the serialized submodels.
+        id_a (UUID4): The id of the first model.
+        model_a (PydanticBaseModel): The first model.
+        id_b (UUID4): The id of the second model.
+        model_b (PydanticBaseModel): The second model.
+
+    Returns:
+        ModelDiff: The differences between the models.
+    """
+    result = ModelDiff(a=id_a, b=id_b)
+
+    for name, field in model_a.__fields__.items():
+        if not (
+            isinstance(field.type_, type) and issubclass(field.type_, PydanticBaseModel)
+        ):
+            continue
+
+        if cache.submodel_digest(id_a, model_a, name) == cache.submodel_digest(
+            id_b, model_b, name
+        ):
+            result.identical.append(name)
+            continue
+
+        a = json.loads(cache.serialize_submodel(id_a, model_a, name)) or {}
+        b = json.loads(cache.serialize_submodel(id_b, model_b, name)) or {}
+        names = {f.alias: n for n, f in field.type_.__fields__.items()}
+
+        comments_a = a.pop("comments", None) or {}
+        comments_b = b.pop("comments", None) or {}
+
+        result.differences.extend(
+            _diff_dicts(name, DataSpecification.values, a, b, names)
+        )
+        result.differences.extend(
+            _diff_dicts(name, DataSpecification.comments, comments_a, comments_b, names)
+        )
+
+    return result
@@ -0,0 +1,224 @@
+import hashlib
+import os
+import pickle
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Type
+from uuid import uuid4
+
+import hydrolib.core
+from hydrolib.core.basemodel import FileModel
+
+from flowfm_inspector.basemodel import BaseModel
+
+
+class DiskParseCacheStats(BaseModel):
+    """DiskParseCacheStats describes the current state of a DiskParseCache.
+
+    Properties:
+        max_size (int): The maximum size of the entries on disk in bytes.
+        size (int): The size of the entries on disk in bytes.
+        entry_count (int): The number of entries on disk.
+        hits (int): The number of files read from the cache.
+        misses (int): The number of files parsed and added to the cache.
+    """
+
+    max_size: int
+    size: int
+    entry_count: int
+    hits: int
+    misses: int
+
+
+class DiskParseCache:
+    """The DiskParseCache keeps the parsed data of files on disk, such that
+    reopening an unchanged model does not require parsing its files again.
+
+    Entries are keyed by the content of the file, the model type and the
+    hydrolib version, as such renamed or copied files are found as well, and
+    entries written by other versions of hydrolib are never used. Each entry is
+    stored as a compressed pickle. Once the entries exceed the maximum size,
+    the least recently used entries are removed, where the modification time of
+    an entry file records its last use, such that the order is retained between
+    sessions.
+
+    Multiple processes can share the same folder, entries are written to a
+    temporary file first which then replaces the entry file.
+    """
+
+    _suffix = ".bin"
+
+    def __init__(self, folder: Path, max_size: int = 512 * 1024 * 1024) -> None:
+        """Create a new DiskParseCache.
+
+        Args:
+            folder (Path): The folder containing the entries.
+            max_size (int, optional):
+                The maximum size of the entries in bytes. Defaults to 512 MB.
+        """
+        self._folder = folder
+        self._max_size = max_size
+
+        self._lock = threading.Lock()
+        self._entries: Optional["OrderedDict[str, int]"] = None
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+
+    def __reduce__(self):
+        # Only the configuration is transferred to other processes.
+        return (DiskParseCache, (self._folder, self._max_size))
+
+    @property
+    def folder(self) -> Path:
+        return self._folder
+
+    @property
+    def stats(self) -> DiskParseCacheStats:
+        with self._lock:
+            entries = self._get_entries()
+            return DiskParseCacheStats(
+                max_size=self._max_size,
+                size=self._size,
+                entry_count=len(entries),
+                hits=self._hits,
+                misses=self._misses,
+            )
+
+    def _get_entries(self) -> "OrderedDict[str, int]":
+        if self._entries is None:
+            files = []
+            if self._folder.is_dir():
+                for path in self._folder.glob(f"*{self._suffix}"):
+                    try:
+                        result = path.stat()
+                    except OSError:
+                        continue
+                    files.append((result.st_mtime_ns, path.stem, result.st_size))
+
+            self._entries = OrderedDict((key, size) for _, key, size in sorted(files))
+            self._size = sum(self._entries.values())
+
+        return self._entries
+
+    @staticmethod
+    def compute_key(model_type: Type[FileModel], content: bytes) -> str:
+        """Compute the key of the entry of a file.
+
+        Args:
+            model_type (Type[FileModel]): The type of the model parsing the file.
+            content (bytes): The content of the file.
+
+        Returns:
+            str: The hexadecimal key.
+        """
+        sha1 = hashlib.sha1(
+            f"{hydrolib.core.__version__}:{model_type.__module__}."
+            f"{model_type.__qualname__}:".encode("utf-8")
+        )
+        sha1.update(content)
+        return sha1.hexdigest()
+
+    def _get_path(self, key: str) -> Path:
+        return self._folder / f"{key}{self._suffix}"
+
+    def parse(self, model_type: Type[FileModel], path: Path, parse: Callable) -> Dict:
+        """Get the parsed data of the file at the specified path from the cache,
+        or parse and add it to the cache.
+
+        Args:
+            model_type (Type[FileModel]): The type of the model parsing the file.
+            path (Path): The path of the file.
+            parse (Callable): The function parsing the file.
+
+        Returns:
+            Dict: The parsed data.
+        """
+        key = DiskParseCache.compute_key(model_type, path.read_bytes())
+
+        result = self._read(key)
+        if result is not None:
+            return result
+
+        result = parse()
+        self._write(key, result)
+        return result
+
+    def _read(self, key: str) -> Optional[Dict]:
+        entry_path = self._get_path(key)
+
+        try:
+            data = entry_path.read_bytes()
+            result = pickle.loads(zlib.decompress(data))
+            os.utime(entry_path)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # The entry is corrupt, e.g. because it was written by an interrupted
+            # process without atomic replace support.
+            self._remove(key)
+            return None
+
+        with self._lock:
+            entries = self._get_entries()
+            if key not in entries:
+                self._size += len(data)
+            entries[key] = len(data)
+            entries.move_to_end(key)
+            self._hits += 1
+
+        return result
+
+    def _write(self, key: str, result: Dict) -> None:
+        try:
+            data = zlib.compress(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return
+
+        with self._lock:
+            self._misses += 1
+        if len(data) > self._max_size:
+            return
+
+        entry_path = self._get_path(key)
+        temporary_path = entry_path.with_name(f".{key}.{uuid4().hex}.tmp")
+
+        try:
+            self._folder.mkdir(parents=True, exist_ok=True)
+            temporary_path.write_bytes(data)
+            os.replace(temporary_path, entry_path)
+        except OSError:
+            temporary_path.unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            entries = self._get_entries()
+            self._size += len(data) - entries.pop(key, 0)
+            entries[key] = len(data)
+
+            evicted = []
+            while self._size > self._max_size and len(entries) > 1:
+                evicted_key, size = entries.popitem(last=False)
+                self._size -= size
+                evicted.append(evicted_key)
+
+        for evicted_key in evicted:
+            self._get_path(evicted_key).unlink(missing_ok=True)
+
+    def _remove(self, key: str) -> None:
+        self._get_path(key).unlink(missing_ok=True)
+
+        with self._lock:
+            self._size -= self._get_entries().pop(key, 0)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            keys = list(self._get_entries())
+            self._entries = OrderedDict()
+            self._size = 0
+
+        for key in keys:
+            self._get_path(key).unlink(missing_ok=True)
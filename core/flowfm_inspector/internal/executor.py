@@ -0,0 +1,150 @@
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from flowfm_inspector.basemodel import BaseModel
+from flowfm_inspector.internal.profiling import current_session, run_profiled
+
+
+T = TypeVar("T")
+
+
+class WorkerPoolStats(BaseModel):
+    """WorkerPoolStats describes how saturated a WorkerPool currently is.
+
+    Properties:
+        name (str): The name of the worker pool.
+        max_workers (int): The maximum number of concurrently running tasks.
+        active (int): The number of tasks currently running.
+        queued (int): The number of tasks waiting for a free worker.
+        completed (int): The number of tasks completed since the start.
+        peak_queued (int): The largest number of waiting tasks observed.
+        saturation (float): The number of active and queued tasks per worker.
+        mean_wait_time (float): The mean time in seconds tasks waited for a worker.
+    """
+
+    name: str
+    max_workers: int
+    active: int
+    queued: int
+    completed: int
+    peak_queued: int
+    saturation: float
+    mean_wait_time: float
+
+
+class WorkerPool(Executor):
+    """The WorkerPool is a bounded thread pool used to run blocking work, such as
+    hydrolib parsing and pydantic serialization, outside of the event loop.
+
+    It keeps track of the number of active and queued tasks, such that the
+    saturation of the pool can be inspected.
+    """
+
+    def __init__(self, name: str, max_workers: int) -> None:
+        """Create a new WorkerPool.
+
+        Args:
+            name (str): The name of this pool, used to name its threads.
+            max_workers (int): The maximum number of concurrently running tasks.
+        """
+        self._name = name
+        self._lock = threading.Lock()
+        self._max_workers = max_workers
+        self._executor = self._create_executor(max_workers)
+
+        self._active = 0
+        self._queued = 0
+        self._completed = 0
+        self._peak_queued = 0
+        self._total_wait_time = 0.0
+
+    def _create_executor(self, max_workers: int) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=self._name
+        )
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def resize(self, max_workers: int) -> None:
+        """Change the number of workers of this WorkerPool.
+
+        Tasks submitted before the resize finish on the previous workers.
+
+        Args:
+            max_workers (int): The new maximum number of concurrently running tasks.
+        """
+        with self._lock:
+            previous = self._executor
+            self._executor = self._create_executor(max_workers)
+            self._max_workers = max_workers
+
+        previous.shutdown(wait=False)
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        submitted = time.perf_counter()
+        # Work submitted on behalf of a profiled request is profiled as well.
+        session = current_session()
+
+        def execute() -> T:
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._total_wait_time += time.perf_counter() - submitted
+
+            try:
+                return run_profiled(session, fn, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+
+        with self._lock:
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+            future = self._executor.submit(execute)
+
+        future.add_done_callback(self._discard_cancelled)
+        return future
+
+    def _discard_cancelled(self, future: Future) -> None:
+        # A task cancelled while queued never runs.
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run the provided function on this WorkerPool and await its result.
+
+        Args:
+            fn (Callable[..., T]): The blocking function to execute.
+
+        Returns:
+            T: The result of the function.
+        """
+        return await asyncio.wrap_future(
+            self.submit(functools.partial(fn, *args, **kwargs))
+        )
+
+    def shutdown(self, wait: bool = True, **kwargs: Any) -> None:
+        self._executor.shutdown(wait=wait, **kwargs)
+
+    @property
+    def stats(self) -> WorkerPoolStats:
+        with self._lock:
+            started = self._active + self._completed
+            return WorkerPoolStats(
+                name=self._name,
+                max_workers=self._max_workers,
+                active=self._active,
+                queued=self._queued,
+                completed=self._completed,
+                peak_queued=self._peak_queued,
+                saturation=(self._active + self._queued) / self._max_workers,
+                mean_wait_time=self._total_wait_time / started if started else 0.0,
+            )
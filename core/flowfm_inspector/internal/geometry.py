@@ -0,0 +1,127 @@
+import struct
+from enum import Enum
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from flowfm_inspector.internal.network import LazyNetwork
+
+
+class GeometryKind(str, Enum):
+    nodes = "nodes"
+    edges = "edges"
+    faces = "faces"
+
+
+class GeometryDataType(int, Enum):
+    float64 = 1
+    int32 = 2
+
+
+# The binary geometry format consists of a fixed size little-endian header
+# followed by the row-major little-endian values of the requested elements:
+#
+#   magic       4 bytes   b"FMGM"
+#   version     uint8     1
+#   data type   uint8     GeometryDataType
+#   components  uint16    values per element
+#   start       uint64    index of the first element
+#   count       uint64    number of elements
+GEOMETRY_MAGIC = b"FMGM"
+GEOMETRY_VERSION = 1
+GEOMETRY_HEADER = struct.Struct("<4sBBHQQ")
+
+
+class GeometryRange(NamedTuple):
+    """GeometryRange describes a range of geometry elements of a mesh.
+
+    Properties:
+        kind (GeometryKind): The kind of elements.
+        data_type (GeometryDataType): The type of the values.
+        components (int): The number of values per element.
+        start (int): The index of the first element.
+        count (int): The number of elements.
+    """
+
+    kind: GeometryKind
+    data_type: GeometryDataType
+    components: int
+    start: int
+    count: int
+
+    @property
+    def header(self) -> bytes:
+        return GEOMETRY_HEADER.pack(
+            GEOMETRY_MAGIC,
+            GEOMETRY_VERSION,
+            self.data_type.value,
+            self.components,
+            self.start,
+            self.count,
+        )
+
+    @property
+    def content_length(self) -> int:
+        item_size = 8 if self.data_type == GeometryDataType.float64 else 4
+        return GEOMETRY_HEADER.size + self.count * self.components * item_size
+
+
+def get_geometry_range(
+    network: LazyNetwork,
+    mesh: str,
+    kind: GeometryKind,
+    start: int = 0,
+    count: Optional[int] = None,
+) -> GeometryRange:
+    """Get the range of elements of the specified mesh, clipped to the mesh size.
+
+    The range of a kind of elements the mesh does not define is empty, with zero
+    components for faces.
+
+    Args:
+        network (LazyNetwork): The network containing the mesh.
+        mesh (str): The name of the mesh.
+        kind (GeometryKind): The kind of elements.
+        start (int, optional): The index of the first element. Defaults to 0.
+        count (Optional[int], optional):
+            The number of elements, if None all remaining elements. Defaults to None.
+
+    Raises:
+        KeyError: When the mesh does not exist.
+
+    Returns:
+        GeometryRange: The clipped range.
+    """
+    size, components = network.get_size(mesh, kind.value)
+    data_type = (
+        GeometryDataType.float64
+        if kind == GeometryKind.nodes
+        else GeometryDataType.int32
+    )
+
+    start = min(start, size)
+    stop = size if count is None else min(size, start + count)
+    return GeometryRange(kind, data_type, components, start, stop - start)
+
+
+def read_geometry_chunk(
+    network: LazyNetwork, mesh: str, kind: GeometryKind, start: int, count: int
+) -> bytes:
+    """Read a chunk of geometry elements encoded as little-endian values.
+
+    Args:
+        network (LazyNetwork): The network containing the mesh.
+        mesh (str): The name of the mesh.
+        kind (GeometryKind): The kind of elements.
+        start (int): The index of the first element.
+        count (int): The number of elements.
+
+    Returns:
+        bytes: The row-major values of the elements.
+    """
+    if kind == GeometryKind.nodes:
+        data = network.read_nodes(mesh, start, count)
+        return np.ascontiguousarray(data, dtype="<f8").tobytes()
+
+    data = network.read_connectivity(mesh, kind.value, start, count)
+    return np.ascontiguousarray(data, dtype="<i4").tobytes()
@@ -0,0 +1,235 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor
+from datetime import datetime, timedelta
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Type
+from uuid import uuid4
+
+from hydrolib.core.basemodel import FileModel
+from pydantic.types import UUID4
+
+from flowfm_inspector.basemodel import BaseModel
+
+if TYPE_CHECKING:
+    from flowfm_inspector.internal.prewarm import Prewarmer
+
+
+class LoadStatus(str, Enum):
+    pending = "pending"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+class LoadJob(BaseModel):
+    """LoadJob describes the state of a single model being loaded from disk.
+
+    Properties:
+        id (UUID4): The id of this job.
+        path (Path): The path of the model file being loaded.
+        status (LoadStatus): The current status of this job.
+        loaded_files (int): The number of files parsed so far.
+        current_file (Optional[Path]): The file currently being parsed.
+        model_id (Optional[UUID4]): The id of the loaded model once completed.
+        error (Optional[str]): The error message if the job failed.
+        created (datetime): The time this job was created.
+        started (Optional[datetime]): The time the parsing started.
+        finished (Optional[datetime]): The time the job completed or failed.
+    """
+
+    id: UUID4
+    path: Path
+    status: LoadStatus = LoadStatus.pending
+    loaded_files: int = 0
+    current_file: Optional[Path] = None
+    model_id: Optional[UUID4] = None
+    error: Optional[str] = None
+    created: datetime
+    started: Optional[datetime] = None
+    finished: Optional[datetime] = None
+
+
+class _LoadProgressHandler(logging.Handler):
+    """Track the files parsed by hydrolib per loading thread.
+
+    hydrolib logs every file it starts parsing, which we use to report the
+    progress of the jobs running on the worker threads.
+    """
+
+    _loading_message_prefix = "Loading data from "
+
+    def __init__(self) -> None:
+        super().__init__(level=logging.INFO)
+        self._jobs: Dict[int, LoadJob] = {}
+
+    def track(self, job: LoadJob) -> None:
+        self._jobs[threading.get_ident()] = job
+
+    def untrack(self) -> None:
+        self._jobs.pop(threading.get_ident(), None)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        job = self._jobs.get(record.thread)  # type: ignore[arg-type]
+        message = record.getMessage()
+
+        if job is None or not message.startswith(self._loading_message_prefix):
+            return
+
+        job.loaded_files += 1
+        job.current_file = Path(message[len(self._loading_message_prefix) :])
+
+
+class ModelLoader:
+    """The ModelLoader loads models from disk on an executor, such that the
+    event loop remains responsive while large models are being parsed.
+
+    Loaded models are handed to the register callback, which is executed on
+    the executor and returns the id under which the model is registered.
+
+    Models pre-loaded by the Prewarmer, if any, are taken instead of parsing
+    them again. Pre-loading is paused while jobs are running.
+
+    Finished jobs are kept for job_ttl seconds, after which they are discarded.
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        model_type: Type[FileModel],
+        register: Callable[[FileModel], UUID4],
+        prewarmer: Optional["Prewarmer"] = None,
+        job_ttl: float = 600.0,
+    ) -> None:
+        """Create a new ModelLoader.
+
+        Args:
+            executor (Executor): The executor on which models are parsed.
+            model_type (Type[FileModel]): The type of the models to load.
+            register (Callable[[FileModel], UUID4]):
+                Callback to register a loaded model, returning its id.
+            prewarmer (Optional[Prewarmer], optional):
+                The Prewarmer pre-loading models. Defaults to None.
+            job_ttl (float, optional):
+                The number of seconds finished jobs are kept. Defaults to 600.
+        """
+        self._executor = executor
+        self._model_type = model_type
+        self._register = register
+        self._prewarmer = prewarmer
+        self._job_ttl = timedelta(seconds=job_ttl)
+        self._jobs: Dict[UUID4, LoadJob] = {}
+        self._tasks: Dict[UUID4, asyncio.Task] = {}
+
+        self._progress = _LoadProgressHandler()
+        hydrolib_logger = logging.getLogger("hydrolib.core.basemodel")
+        hydrolib_logger.addHandler(self._progress)
+        if not hydrolib_logger.isEnabledFor(logging.INFO):
+            hydrolib_logger.setLevel(logging.INFO)
+
+    @property
+    def jobs(self) -> List[LoadJob]:
+        self._prune()
+        return list(self._jobs.values())
+
+    def get_job(self, job_id: UUID4) -> Optional[LoadJob]:
+        """Get the specified job.
+
+        Args:
+            job_id (UUID4): The id of the job.
+
+        Returns:
+            Optional[LoadJob]:
+                The job, or None if it is unknown or finished more than job_ttl
+                seconds ago.
+        """
+        self._prune()
+        return self._jobs.get(job_id)
+
+    def submit(self, path: Path) -> LoadJob:
+        """Start loading the model at the specified path.
+
+        This returns immediately, the state of the load can be retrieved with the
+        id of the returned LoadJob. Note that this needs to be called from within
+        the running event loop.
+
+        Args:
+            path (Path): The path to the model file.
+
+        Returns:
+            LoadJob: The job loading the model.
+        """
+        self._prune()
+
+        job = LoadJob(id=uuid4(), path=path, created=datetime.now())
+        self._jobs[job.id] = job
+        self._tasks[job.id] = asyncio.create_task(self._run(job))
+        return job
+
+    async def wait(self, job_id: UUID4) -> LoadJob:
+        """Wait until the specified job has completed or failed.
+
+        Args:
+            job_id (UUID4): The id of the job to wait for.
+
+        Raises:
+            KeyError: When the job is unknown.
+
+        Returns:
+            LoadJob: The finished job.
+        """
+        job = self._jobs[job_id]
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.shield(task)
+        return job
+
+    def _prune(self) -> None:
+        expired = datetime.now() - self._job_ttl
+        for job in list(self._jobs.values()):
+            if job.finished is not None and job.finished < expired:
+                del self._jobs[job.id]
+
+    async def _run(self, job: LoadJob) -> None:
+        loop = asyncio.get_running_loop()
+
+        try:
+            model = await self._take_or_load(job)
+            job.model_id = await loop.run_in_executor(
+                self._executor, self._register, model
+            )
+            job.status = LoadStatus.completed
+        except Exception as e:
+            job.error = str(e)
+            job.status = LoadStatus.failed
+        finally:
+            job.current_file = None
+            job.finished = datetime.now()
+            self._tasks.pop(job.id, None)
+
+    async def _take_or_load(self, job: LoadJob) -> FileModel:
+        loop = asyncio.get_running_loop()
+
+        if self._prewarmer is None:
+            return await loop.run_in_executor(self._executor, self._load, job)
+
+        with self._prewarmer.interactive():
+            job.status = LoadStatus.running
+            job.started = datetime.now()
+
+            model = await self._prewarmer.take(job.path)
+            if model is None:
+                model = await loop.run_in_executor(self._executor, self._load, job)
+            return model
+
+    def _load(self, job: LoadJob) -> FileModel:
+        job.status = LoadStatus.running
+        job.started = datetime.now()
+
+        self._progress.track(job)
+        try:
+            return self._model_type(job.path)
+        finally:
+            self._progress.untrack()
@@ -0,0 +1,390 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import (
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from starlette.routing import BaseRoute, Match
+
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Starlette appends the charset to text media types.
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Metric:
+    """Metric is the base of the metrics of a MetricsRegistry.
+
+    Metrics can be updated concurrently from multiple threads.
+    """
+
+    kind = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, labels: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _check(self, values: LabelValues) -> None:
+        if len(values) != len(self.labels):
+            raise ValueError(
+                f"{self.name} expects the labels {self.labels}, got {values}."
+            )
+
+    def _samples(self) -> Iterator[str]:
+        return iter(())
+
+    def render(self) -> Iterator[str]:
+        """Render this metric in the Prometheus text format."""
+        yield f"# HELP {self.name} {_escape(self.documentation)}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self._samples()
+
+
+class Counter(Metric):
+    """Counter is a metric which only increases, such as a number of requests."""
+
+    kind = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labels: Sequence[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *values: str, amount: float = 1.0) -> None:
+        self._check(values)
+        with self._lock:
+            self._values[values] = self._values.get(values, 0.0) + amount
+
+    def get(self, *values: str) -> float:
+        with self._lock:
+            return self._values.get(values, 0.0)
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            labels = _format_labels(self.labels, label_values)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class Gauge(Metric):
+    """Gauge is a metric of which the values are collected upon rendering, such
+    as the number of loaded models.
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], Dict[LabelValues, float]],
+        labels: Sequence[str] = (),
+    ) -> None:
+        """Create a new Gauge.
+
+        Args:
+            name (str): The name of the metric.
+            documentation (str): The description of the metric.
+            collect (Callable[[], Dict[LabelValues, float]]):
+                Function returning the current value per label values.
+            labels (Sequence[str], optional): The names of the labels.
+        """
+        super().__init__(name, documentation, labels)
+        self._collect = collect
+
+    def _samples(self) -> Iterator[str]:
+        for label_values, value in sorted(self._collect().items()):
+            labels = _format_labels(self.labels, label_values)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class _HistogramValue:
+    def __init__(self, n_buckets: int) -> None:
+        self.counts = [0] * n_buckets
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(Metric):
+    """Histogram is a metric counting observations, such as durations, in
+    cumulative buckets.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._values: Dict[LabelValues, _HistogramValue] = {}
+
+    def observe(self, value: float, *values: str) -> None:
+        self._check(values)
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            histogram = self._values.get(values)
+            if histogram is None:
+                histogram = self._values[values] = _HistogramValue(len(self.buckets))
+            histogram.counts[index] += 1
+            histogram.sum += value
+            histogram.count += 1
+
+    @contextmanager
+    def time(self, *values: str) -> Iterator[None]:
+        """Observe the duration in seconds of the context."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *values)
+
+    def get_count(self, *values: str) -> int:
+        with self._lock:
+            histogram = self._values.get(values)
+            return 0 if histogram is None else histogram.count
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(
+                (v, list(h.counts), h.sum, h.count) for v, h in self._values.items()
+            )
+
+        bucket_labels = self.labels + ("le",)
+        for label_values, counts, total, count in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(
+                    bucket_labels, label_values + (_format_value(bound),)
+                )
+                yield f"{self.name}_bucket{labels} {cumulative}"
+
+            labels = _format_labels(self.labels, label_values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class MetricsRegistry:
+    """The MetricsRegistry contains the metrics of the application, and renders
+    them in the Prometheus text format.
+
+    Besides the registered metrics, the registry records the duration of named
+    spans, such as the serialization of a model, in a single histogram, and the
+    number and duration of the HTTP requests recorded by the MetricsMiddleware.
+    """
+
+    def __init__(self, prefix: str = "flowfm_inspector") -> None:
+        """Create a new MetricsRegistry.
+
+        Args:
+            prefix (str, optional):
+                The prefix of the names of the metrics.
+                Defaults to "flowfm_inspector".
+        """
+        self._prefix = prefix
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Metric] = {}
+
+        self.spans = self.histogram(
+            "span_duration_seconds",
+            "The duration of the instrumented operations in seconds.",
+            labels=("span",),
+        )
+        # The requests are recorded here rather than by the middleware, as
+        # Starlette creates a new middleware stack whenever one is added.
+        self.requests = self.counter(
+            "http_requests_total",
+            "The number of handled HTTP requests.",
+            labels=("method", "route", "status"),
+        )
+        self.request_durations = self.histogram(
+            "http_request_duration_seconds",
+            "The duration of the handled HTTP requests in seconds.",
+            labels=("method", "route"),
+        )
+
+    def _register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"The metric {metric.name} already exists.")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labels: Sequence[str] = ()
+    ) -> Counter:
+        """Create and register a new Counter, of which the name is prefixed."""
+        counter = Counter(f"{self._prefix}_{name}", documentation, labels)
+        self._register(counter)
+        return counter
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create and register a new Histogram, of which the name is prefixed."""
+        histogram = Histogram(f"{self._prefix}_{name}", documentation, labels, buckets)
+        self._register(histogram)
+        return histogram
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], Dict[LabelValues, float]],
+        labels: Sequence[str] = (),
+    ) -> Gauge:
+        """Create and register a new Gauge, of which the name is prefixed."""
+        gauge = Gauge(f"{self._prefix}_{name}", documentation, collect, labels)
+        self._register(gauge)
+        return gauge
+
+    def span(self, name: str) -> ContextManager[None]:
+        """Record the duration of the context as the span with the provided name."""
+        return self.spans.time(name)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text format.
+
+        Note that rendering collects the values of the gauges, which can be
+        blocking.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def span(metrics: Optional[MetricsRegistry], name: str) -> ContextManager[None]:
+    """Record the duration of the context as a span, if metrics are recorded.
+
+    Args:
+        metrics (Optional[MetricsRegistry]): The registry to record to, if any.
+        name (str): The name of the span.
+
+    Returns:
+        ContextManager[None]: The context to time.
+    """
+    return nullcontext() if metrics is None else metrics.span(name)
+
+
+class MetricsMiddleware:
+    """The MetricsMiddleware records the number and duration of the HTTP
+    requests per route.
+
+    Requests are labelled with the path template of the matching route, such
+    that requests to e.g. different models are counted as the same route.
+    Requests not matching any route are labelled "unmatched". The duration
+    includes streaming the response body.
+    """
+
+    def __init__(
+        self, app, metrics: MetricsRegistry, routes: Sequence[BaseRoute]
+    ) -> None:
+        """Create a new MetricsMiddleware.
+
+        Args:
+            app: The wrapped ASGI application.
+            metrics (MetricsRegistry): The registry to record the requests to.
+            routes (Sequence[BaseRoute]):
+                The routes of the application, routes added later on are matched
+                as well as long as the same sequence is extended.
+        """
+        self._app = app
+        self._metrics = metrics
+        self._routes = routes
+
+    def _get_route(self, scope) -> str:
+        partial = None
+        for route in self._routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", "unmatched")
+            if match == Match.PARTIAL and partial is None:
+                partial = getattr(route, "path", None)
+        return partial or "unmatched"
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self._app(scope, receive, send_with_status)
+        finally:
+            route = self._get_route(scope)
+            method = scope["method"]
+            self._metrics.request_durations.observe(
+                time.perf_counter() - start, method, route
+            )
+            self._metrics.requests.inc(method, route, str(status_code))
@@ -0,0 +1,462 @@
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import netCDF4 as nc
+import numpy as np
+from hydrolib.core.basemodel import FileModel
+from hydrolib.core.io.net.models import NetworkModel
+from pydantic.types import UUID4
+
+from flowfm_inspector.basemodel import BaseModel
+
+
+class BoundingBox(BaseModel):
+    xmin: float
+    ymin: float
+    xmax: float
+    ymax: float
+
+
+class CoordinateSystem(BaseModel):
+    """CoordinateSystem describes the coordinate system of a network.
+
+    Properties:
+        name (str): The name of the coordinate system variable.
+        epsg (Optional[int]): The EPSG code, if defined.
+        grid_mapping_name (Optional[str]): The CF grid mapping name, if defined.
+        wkt (Optional[str]): The well-known text representation, if defined.
+    """
+
+    name: str
+    epsg: Optional[int] = None
+    grid_mapping_name: Optional[str] = None
+    wkt: Optional[str] = None
+
+
+class MeshMetadata(BaseModel):
+    """MeshMetadata describes a single UGRID mesh topology of a network.
+
+    Properties:
+        name (str): The name of the mesh topology variable.
+        topology_dimension (int): 1 for one dimensional, 2 for two dimensional meshes.
+        node_count (int): The number of nodes.
+        edge_count (int): The number of edges.
+        face_count (int): The number of faces.
+        max_face_nodes (int): The maximum number of nodes of a single face.
+        bounding_box (Optional[BoundingBox]): The bounding box of the nodes.
+    """
+
+    name: str
+    topology_dimension: int
+    node_count: int
+    edge_count: int
+    face_count: int
+    max_face_nodes: int
+    bounding_box: Optional[BoundingBox] = None
+
+
+class NetworkMetadata(BaseModel):
+    path: Path
+    coordinate_system: Optional[CoordinateSystem] = None
+    meshes: List[MeshMetadata] = []
+
+
+def _get_fill_value(variable: nc.Variable) -> Optional[float]:
+    # Values which have never been written contain the default fill value,
+    # unless the variable defines its own.
+    default = nc.default_fillvals.get(variable.dtype.str[1:])
+    return getattr(variable, "_FillValue", default)
+
+
+class _Connectivity:
+    """The variable describing the edge or face node connectivity of a mesh."""
+
+    def __init__(self, variable: nc.Variable) -> None:
+        self.variable = variable
+        self.count: int = variable.shape[0]
+        self.max_nodes: int = variable.shape[1]
+        self.fill_value = _get_fill_value(variable)
+        self.start_index = int(getattr(variable, "start_index", 0))
+
+
+class _MeshTopology:
+    """The variables describing a single UGRID mesh topology.
+
+    The sizes and attributes of the variables are read upon opening, such that
+    afterwards only the data itself is read from the dataset.
+    """
+
+    def __init__(self, dataset: nc.Dataset, variable: nc.Variable) -> None:
+        self.name: str = variable.name
+        self.topology_dimension = int(getattr(variable, "topology_dimension", 2))
+
+        node_x, node_y = getattr(variable, "node_coordinates").split()[:2]
+        self.node_x: nc.Variable = dataset.variables[node_x]
+        self.node_y: nc.Variable = dataset.variables[node_y]
+        self.node_count: int = self.node_x.shape[0]
+        self.node_fill_values = (
+            _get_fill_value(self.node_x),
+            _get_fill_value(self.node_y),
+        )
+
+        self.edge_nodes = self._get_connectivity(
+            dataset, variable, "edge_node_connectivity"
+        )
+        self.face_nodes = self._get_connectivity(
+            dataset, variable, "face_node_connectivity"
+        )
+
+    @staticmethod
+    def _get_connectivity(
+        dataset: nc.Dataset, topology: nc.Variable, attribute: str
+    ) -> Optional[_Connectivity]:
+        name = getattr(topology, attribute, None)
+        variable = dataset.variables.get(name) if name else None
+        return _Connectivity(variable) if variable is not None else None
+
+    @property
+    def edge_count(self) -> int:
+        return self.edge_nodes.count if self.edge_nodes is not None else 0
+
+    @property
+    def face_count(self) -> int:
+        return self.face_nodes.count if self.face_nodes is not None else 0
+
+    @property
+    def max_face_nodes(self) -> int:
+        return self.face_nodes.max_nodes if self.face_nodes is not None else 0
+
+    def get_connectivity(self, kind: str) -> _Connectivity:
+        connectivity = {"edges": self.edge_nodes, "faces": self.face_nodes}[kind]
+        if connectivity is None:
+            raise KeyError(f"Mesh {self.name} does not define {kind}.")
+        return connectivity
+
+
+class LazyNetwork:
+    """The LazyNetwork provides access to a UGRID net file without loading it.
+
+    Only the structure of the file is read upon opening. The metadata is
+    computed upon first request, and coordinate and connectivity arrays are
+    read on demand in ranges, such that the full mesh never needs to be held
+    in memory.
+
+    netCDF4 does not support concurrent access to a single file, as such all
+    access to the dataset is serialized with a lock. The dataset is closed when
+    the network is closed or no longer referenced, such that readers holding on
+    to a network can finish after it has been replaced.
+    """
+
+    # The number of values read at a time when computing the bounding box.
+    chunk_size = 1 << 20
+
+    def __init__(self, path: Path) -> None:
+        """Open the net file at the specified path.
+
+        Args:
+            path (Path): The path to the net file.
+
+        Raises:
+            FileNotFoundError: When no file exists at the path.
+        """
+        if not path.is_file():
+            raise FileNotFoundError(f"No net file at {path}.")
+
+        self._path = path
+        self._lock = threading.Lock()
+
+        with self._lock:
+            self._dataset = nc.Dataset(path, "r")
+            self._dataset.set_auto_mask(False)
+
+            self._meshes: Dict[str, _MeshTopology] = {
+                variable.name: _MeshTopology(self._dataset, variable)
+                for variable in self._dataset.variables.values()
+                if getattr(variable, "cf_role", None) == "mesh_topology"
+                and hasattr(variable, "node_coordinates")
+            }
+        self._metadata: Optional[NetworkMetadata] = None
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def mesh_names(self) -> List[str]:
+        return list(self._meshes.keys())
+
+    def close(self) -> None:
+        with self._lock:
+            self._dataset.close()
+
+    @property
+    def metadata(self) -> NetworkMetadata:
+        """Get the metadata of this network.
+
+        The bounding boxes are computed by reading the node coordinates in
+        chunks upon the first request, after which the metadata is cached.
+        """
+        if self._metadata is None:
+            with self._lock:
+                meshes = [
+                    MeshMetadata(
+                        name=mesh.name,
+                        topology_dimension=mesh.topology_dimension,
+                        node_count=mesh.node_count,
+                        edge_count=mesh.edge_count,
+                        face_count=mesh.face_count,
+                        max_face_nodes=mesh.max_face_nodes,
+                        bounding_box=self._compute_bounding_box(mesh),
+                    )
+                    for mesh in self._meshes.values()
+                ]
+                self._metadata = NetworkMetadata(
+                    path=self._path,
+                    coordinate_system=self._read_coordinate_system(),
+                    meshes=meshes,
+                )
+
+        return self._metadata
+
+    def _compute_bounding_box(self, mesh: _MeshTopology) -> Optional[BoundingBox]:
+        if mesh.node_count == 0:
+            return None
+
+        fill_x, fill_y = mesh.node_fill_values
+        bounds = [np.inf, np.inf, -np.inf, -np.inf]
+        for start in range(0, mesh.node_count, self.chunk_size):
+            stop = min(start + self.chunk_size, mesh.node_count)
+            x = mesh.node_x[start:stop]
+            y = mesh.node_y[start:stop]
+
+            valid = np.isfinite(x) & np.isfinite(y)
+            if fill_x is not None:
+                valid &= x != fill_x
+            if fill_y is not None:
+                valid &= y != fill_y
+
+            x, y = x[valid], y[valid]
+            if x.size == 0:
+                continue
+
+            bounds = [
+                min(bounds[0], float(x.min())),
+                min(bounds[1], float(y.min())),
+                max(bounds[2], float(x.max())),
+                max(bounds[3], float(y.max())),
+            ]
+
+        if bounds[0] > bounds[2]:
+            return None
+
+        return BoundingBox(
+            xmin=bounds[0], ymin=bounds[1], xmax=bounds[2], ymax=bounds[3]
+        )
+
+    def _read_coordinate_system(self) -> Optional[CoordinateSystem]:
+        for variable in self._dataset.variables.values():
+            attributes = variable.ncattrs()
+            if "grid_mapping_name" not in attributes and "epsg" not in attributes:
+                continue
+
+            epsg = getattr(variable, "epsg", None)
+            if epsg is None:
+                epsg = getattr(variable, "EPSG_code", "").replace("EPSG:", "") or None
+
+            return CoordinateSystem(
+                name=variable.name,
+                epsg=int(epsg) if epsg is not None else None,
+                grid_mapping_name=getattr(variable, "grid_mapping_name", None),
+                wkt=getattr(variable, "wkt", None)
+                or getattr(variable, "crs_wkt", None),
+            )
+
+        return None
+
+    def _get_mesh(self, mesh: str) -> _MeshTopology:
+        if mesh not in self._meshes:
+            raise KeyError(f"No mesh named {mesh} in {self._path}.")
+        return self._meshes[mesh]
+
+    @staticmethod
+    def _clip_range(start: int, count: Optional[int], size: int) -> Tuple[int, int]:
+        start = max(0, min(start, size))
+        stop = size if count is None else min(size, start + max(0, count))
+        return start, stop
+
+    def get_size(self, mesh: str, kind: str) -> Tuple[int, int]:
+        """Get the number of elements of the specified mesh and their number of values.
+
+        The sizes are read upon opening, as such this does not access the dataset.
+        A kind of elements the mesh does not define has zero elements.
+
+        Args:
+            mesh (str): The name of the mesh.
+            kind (str): Either "nodes", "edges" or "faces".
+
+        Raises:
+            KeyError: When the mesh does not exist.
+
+        Returns:
+            Tuple[int, int]:
+                The number of elements and the number of values per element, which
+                are the coordinates of nodes and the node indices of edges and faces.
+        """
+        topology = self._get_mesh(mesh)
+        if kind == "nodes":
+            return topology.node_count, 2
+        if kind == "edges":
+            return topology.edge_count, 2
+        return topology.face_count, topology.max_face_nodes
+
+    def read_nodes(
+        self,
+        mesh: str,
+        start: int = 0,
+        count: Optional[int] = None,
+        masked: bool = False,
+    ) -> np.ndarray:
+        """Read a range of node coordinates of the specified mesh.
+
+        Args:
+            mesh (str): The name of the mesh.
+            start (int, optional): The index of the first node. Defaults to 0.
+            count (Optional[int], optional):
+                The number of nodes to read, if None all remaining nodes are read.
+                Defaults to None.
+            masked (bool, optional):
+                Whether to set the coordinates of nodes of which either coordinate
+                is a fill value to NaN. Defaults to False.
+
+        Returns:
+            np.ndarray: The (n, 2) float64 array of x and y coordinates.
+        """
+        topology = self._get_mesh(mesh)
+        start, stop = self._clip_range(start, count, topology.node_count)
+
+        with self._lock:
+            x = topology.node_x[start:stop]
+            y = topology.node_y[start:stop]
+
+        nodes = np.column_stack((x, y)).astype(np.float64, copy=False)
+        if masked:
+            fill_x, fill_y = topology.node_fill_values
+            missing = np.zeros(len(nodes), dtype=bool)
+            if fill_x is not None:
+                missing |= x == fill_x
+            if fill_y is not None:
+                missing |= y == fill_y
+            nodes[missing] = np.nan
+
+        return nodes
+
+    def read_connectivity(
+        self, mesh: str, kind: str, start: int = 0, count: Optional[int] = None
+    ) -> np.ndarray:
+        """Read a range of the edge or face node connectivity of the specified mesh.
+
+        The indices are converted to zero-based indices, missing nodes of faces
+        with fewer than the maximum number of nodes are set to -1.
+
+        Args:
+            mesh (str): The name of the mesh.
+            kind (str): Either "edges" or "faces".
+            start (int, optional): The index of the first element. Defaults to 0.
+            count (Optional[int], optional):
+                The number of elements to read, if None all remaining elements are
+                read. Defaults to None.
+
+        Returns:
+            np.ndarray: The (n, nodes per element) int32 connectivity array.
+        """
+        connectivity = self._get_mesh(mesh).get_connectivity(kind)
+        start, stop = self._clip_range(start, count, connectivity.count)
+
+        with self._lock:
+            data = np.asarray(connectivity.variable[start:stop], dtype=np.int64)
+
+        start_index = connectivity.start_index
+        missing = data < start_index
+        if connectivity.fill_value is not None:
+            missing |= data == connectivity.fill_value
+
+        data = data - start_index
+        data[missing] = -1
+        return data.astype(np.int32)
+
+
+def disable_network_loading() -> None:
+    """Prevent hydrolib from loading the network of net files.
+
+    The network is currently problematic and we do not want to load it, instead it
+    is accessed lazily through the LazyNetwork. This needs to be called in every
+    process that parses models.
+    """
+    NetworkModel.__fields__.pop("network", None)
+    NetworkModel._post_init_load = FileModel._post_init_load
+
+
+def resolve_netfile_path(model: FileModel) -> Optional[Path]:
+    """Resolve the absolute path of the net file referenced by the provided model.
+
+    Args:
+        model (FileModel): The FMModel referencing the net file.
+
+    Returns:
+        Optional[Path]: The absolute path, or None if no net file is referenced.
+    """
+    netfile = model.geometry.netfile
+    if netfile is None or netfile.filepath is None:
+        return None
+
+    path = Path(netfile.filepath)
+    if path.is_absolute():
+        return path
+    if model.filepath is not None and model.filepath.is_absolute():
+        return model.filepath.parent / path
+    return netfile.save_location
+
+
+class NetworkRegistry:
+    """The NetworkRegistry keeps the opened LazyNetwork of each model.
+
+    A network is opened upon its first request, and reopened when the net
+    file referenced by the model has changed. Replaced and discarded networks
+    are not closed explicitly, as requests might still be reading them, instead
+    their dataset is closed once they are no longer referenced.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._networks: Dict[UUID4, LazyNetwork] = {}
+
+    def get(self, id: UUID4, model: FileModel) -> LazyNetwork:
+        """Get the network of the specified model.
+
+        Args:
+            id (UUID4): The id of the model.
+            model (FileModel): The model referencing the net file.
+
+        Raises:
+            FileNotFoundError: When the model does not reference an existing net file.
+
+        Returns:
+            LazyNetwork: The opened network.
+        """
+        path = resolve_netfile_path(model)
+        if path is None:
+            raise FileNotFoundError("The model does not reference a net file.")
+
+        with self._lock:
+            network = self._networks.get(id)
+
+            if network is None or network.path != path:
+                network = LazyNetwork(path)
+                self._networks[id] = network
+
+            return network
+
+    def discard(self, id: UUID4) -> None:
+        with self._lock:
+            self._networks.pop(id, None)
@@ -0,0 +1,148 @@
+import asyncio
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Set, Tuple
+
+from pydantic.types import UUID4
+
+from flowfm_inspector.basemodel import BaseModel
+from flowfm_inspector.internal.changes import FieldChange
+
+
+class ChangeNotification(BaseModel):
+    """ChangeNotification describes a batch of changes pushed to a subscriber.
+
+    Properties:
+        version (int): The version of the model after the changes.
+        resync (bool):
+            Whether the subscriber fell too far behind, in which case the changes
+            are dropped and the full model needs to be retrieved.
+        changes (List[FieldChange]): The latest change of each changed field.
+    """
+
+    version: int
+    resync: bool = False
+    changes: List[FieldChange] = []
+
+
+class ChangeSubscription:
+    """A ChangeSubscription collects the changes for a single subscriber.
+
+    Changes are coalesced per field until the subscriber retrieves them, as
+    such a slow subscriber only receives the latest value of each field. The
+    number of pending fields is bounded, once exceeded the pending changes are
+    replaced by a resync notification.
+    """
+
+    def __init__(self, version: int, max_pending: int = 1000) -> None:
+        """Create a new ChangeSubscription.
+
+        Args:
+            version (int): The current version of the model.
+            max_pending (int, optional):
+                The maximum number of pending fields. Defaults to 1000.
+        """
+        self._version = version
+        self._max_pending = max_pending
+        self._pending: "OrderedDict[Tuple[str, str, str], FieldChange]" = OrderedDict()
+        self._resync = False
+        self._available = asyncio.Event()
+
+    def push(self, version: int, changes: Sequence[FieldChange]) -> None:
+        self._version = version
+
+        if not self._resync:
+            for change in changes:
+                key = (change.submodel, change.field, change.type)
+                self._pending.pop(key, None)
+                self._pending[key] = change
+
+            if len(self._pending) > self._max_pending:
+                self._pending.clear()
+                self._resync = True
+
+        self._available.set()
+
+    async def next(self, coalesce_delay: float = 0.0) -> ChangeNotification:
+        """Wait for and retrieve the next notification.
+
+        Args:
+            coalesce_delay (float, optional):
+                The time in seconds to wait for further changes after the first
+                change arrived, such that bursts are sent as one notification.
+                Defaults to 0.0.
+
+        Returns:
+            ChangeNotification: The pending changes.
+        """
+        await self._available.wait()
+
+        if coalesce_delay > 0.0:
+            await asyncio.sleep(coalesce_delay)
+
+        self._available.clear()
+        notification = ChangeNotification(
+            version=self._version,
+            resync=self._resync,
+            changes=list(self._pending.values()),
+        )
+
+        self._pending.clear()
+        self._resync = False
+        return notification
+
+
+class ChangeBroadcaster:
+    """The ChangeBroadcaster distributes the changes of models to the
+    subscriptions of each model.
+
+    The ChangeBroadcaster is expected to be used from the event loop.
+    """
+
+    def __init__(self, max_pending: int = 1000) -> None:
+        """Create a new ChangeBroadcaster.
+
+        Args:
+            max_pending (int, optional):
+                The maximum number of pending fields per subscription.
+                Defaults to 1000.
+        """
+        self._max_pending = max_pending
+        self._subscriptions: Dict[UUID4, Set[ChangeSubscription]] = {}
+
+    @contextmanager
+    def subscribe(self, id: UUID4, version: int) -> Iterator[ChangeSubscription]:
+        """Subscribe to the changes of the specified model for the duration of the
+        context.
+
+        Args:
+            id (UUID4): The id of the model.
+            version (int): The current version of the model.
+
+        Yields:
+            ChangeSubscription: The subscription receiving the changes.
+        """
+        subscription = ChangeSubscription(version, self._max_pending)
+        subscriptions = self._subscriptions.setdefault(id, set())
+        subscriptions.add(subscription)
+
+        try:
+            yield subscription
+        finally:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(id, None)
+
+    def publish(self, id: UUID4, version: int, changes: Sequence[FieldChange]) -> None:
+        """Publish the changes of the specified model to all of its subscriptions.
+
+        Args:
+            id (UUID4): The id of the model.
+            version (int): The version of the model after the changes.
+            changes (Sequence[FieldChange]): The changes.
+        """
+        for subscription in self._subscriptions.get(id, ()):
+            subscription.push(version, changes)
+
+    def subscriber_count(self, id: UUID4) -> int:
+        return len(self._subscriptions.get(id, ()))
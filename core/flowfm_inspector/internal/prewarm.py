@@ -0,0 +1,296 @@
+import asyncio
+import ctypes
+import multiprocessing
+import os
+import pickle
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from hydrolib.core.basemodel import FileModel
+
+from flowfm_inspector.basemodel import BaseModel
+from flowfm_inspector.internal.appdata import RecentProjectData
+from flowfm_inspector.internal.batch import initialize_process, parse_model
+from flowfm_inspector.internal.dependencies import collect_file_models
+from flowfm_inspector.internal.diskcache import DiskParseCache
+
+
+class PrewarmState(str, Enum):
+    pending = "pending"
+    loading = "loading"
+    ready = "ready"
+    taken = "taken"
+    skipped = "skipped"
+    failed = "failed"
+    cancelled = "cancelled"
+
+
+class PrewarmEntry(BaseModel):
+    """PrewarmEntry describes the state of a single model being pre-loaded.
+
+    Properties:
+        path (Path): The path of the model file.
+        state (PrewarmState): The current state of the model.
+        footprint (Optional[int]): The estimated footprint in bytes, once parsed.
+        error (Optional[str]): Why the model failed to load or was skipped.
+    """
+
+    path: Path
+    state: PrewarmState = PrewarmState.pending
+    footprint: Optional[int] = None
+    error: Optional[str] = None
+
+
+def select_recent_projects(projects: RecentProjectData, count: int) -> List[Path]:
+    """Select the model files of the most recently opened projects.
+
+    Args:
+        projects (RecentProjectData): The recent projects.
+        count (int): The maximum number of projects to select.
+
+    Returns:
+        List[Path]: The paths of the model files, most recently opened first.
+    """
+    recent = sorted(projects.recent_projects, key=lambda p: p.last_opened, reverse=True)
+    return [p.project_path.resolve() for p in recent if p.project_path.is_file()][
+        :count
+    ]
+
+
+_FileKeys = Dict[Path, Optional[Tuple[int, int]]]
+
+
+def _get_file_keys(model: FileModel) -> _FileKeys:
+    keys: _FileKeys = {}
+    for _, _, path in collect_file_models(model):
+        try:
+            result = path.stat()
+            keys[path] = (result.st_mtime_ns, result.st_size)
+        except OSError:
+            keys[path] = None
+    return keys
+
+
+# The priority class of processes on Windows, which do not have a nice value.
+_BELOW_NORMAL_PRIORITY_CLASS = 0x4000
+
+
+def _lower_process_priority() -> None:
+    try:
+        if sys.platform == "win32":
+            kernel32 = ctypes.windll.kernel32  # type: ignore[attr-defined]
+            kernel32.SetPriorityClass(
+                kernel32.GetCurrentProcess(), _BELOW_NORMAL_PRIORITY_CLASS
+            )
+        else:
+            os.nice(10)
+    except (AttributeError, OSError):
+        pass
+
+
+def _initialize_prewarm_process(disk_cache: Optional[DiskParseCache]) -> None:
+    # Lower the priority, such that pre-loading only uses otherwise idle cores.
+    _lower_process_priority()
+    initialize_process(disk_cache)
+
+
+class Prewarmer:
+    """The Prewarmer pre-loads models in the background, such that opening them
+    later on is instant.
+
+    Models are parsed one at a time on a separate process with a lowered
+    priority. No new model is started while interactive loads are in progress,
+    and models are dropped if the footprint of the pre-loaded models would
+    exceed the memory ceiling. A pre-loaded model is handed out once, and only if
+    none of its files changed since it was parsed.
+
+    The Prewarmer is expected to be used from the event loop.
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        model_type: Type[FileModel],
+        memory_ceiling: int = 1024 * 1024 * 1024,
+        disk_cache: Optional[DiskParseCache] = None,
+    ) -> None:
+        """Create a new Prewarmer.
+
+        Args:
+            executor (Executor): The executor on which parsed models are unpickled.
+            model_type (Type[FileModel]): The type of the models to load.
+            memory_ceiling (int, optional):
+                The maximum footprint of the pre-loaded models in bytes.
+                Defaults to 1 GB.
+            disk_cache (Optional[DiskParseCache], optional):
+                The cache on disk used by the process. Defaults to None.
+        """
+        self._executor = executor
+        self._model_type = model_type
+        self.memory_ceiling = memory_ceiling
+        self.disk_cache = disk_cache
+
+        self._entries: Dict[Path, PrewarmEntry] = {}
+        self._models: Dict[Path, Tuple[FileModel, _FileKeys]] = {}
+        self._loading: Dict[Path, asyncio.Task] = {}
+        self._interactive = 0
+        self._idle: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def entries(self) -> List[PrewarmEntry]:
+        return list(self._entries.values())
+
+    @property
+    def footprint(self) -> int:
+        return sum(self._entries[path].footprint or 0 for path in self._models)
+
+    def _get_idle(self) -> asyncio.Event:
+        if self._idle is None:
+            self._idle = asyncio.Event()
+            if self._interactive == 0:
+                self._idle.set()
+        return self._idle
+
+    def start(self, paths: Iterable[Path]) -> None:
+        """Start pre-loading the models at the provided paths in order.
+
+        Note that this needs to be called from within the running event loop.
+
+        Args:
+            paths (Iterable[Path]): The paths of the model files.
+        """
+        self.cancel()
+        for path in paths:
+            if path not in self._models:
+                self._entries[path] = PrewarmEntry(path=path)
+
+        pending = [
+            entry.path
+            for entry in self._entries.values()
+            if entry.state == PrewarmState.pending
+        ]
+        self._task = asyncio.create_task(self._run(pending))
+
+    def cancel(self) -> None:
+        """Stop pre-loading, the models pre-loaded so far are kept."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        for entry in self._entries.values():
+            if entry.state in (PrewarmState.pending, PrewarmState.loading):
+                entry.state = PrewarmState.cancelled
+
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+
+    @contextmanager
+    def interactive(self) -> Iterator[None]:
+        """Pause starting new models for the duration of the context."""
+        idle = self._get_idle()
+        self._interactive += 1
+        idle.clear()
+
+        try:
+            yield
+        finally:
+            self._interactive -= 1
+            if self._interactive == 0:
+                idle.set()
+
+    async def take(self, path: Path) -> Optional[FileModel]:
+        """Take the pre-loaded model at the specified path, waiting for it if it
+        is being loaded. A model which is not being loaded yet is no longer
+        pre-loaded.
+
+        Args:
+            path (Path): The path of the model file.
+
+        Returns:
+            Optional[FileModel]:
+                The model, or None if it was not pre-loaded or its files changed.
+        """
+        loading = self._loading.get(path)
+        if loading is not None:
+            await asyncio.wait([loading])
+
+        entry = self._entries.get(path)
+        if entry is not None and entry.state == PrewarmState.pending:
+            del self._entries[path]
+
+        item = self._models.pop(path, None)
+        if item is None:
+            return None
+
+        model, keys = item
+        self._entries[path].state = PrewarmState.taken
+
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(self._executor, _get_file_keys, model) != keys:
+            return None
+        return model
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initialize_prewarm_process,
+                initargs=(self.disk_cache,),
+            )
+        return self._process_pool
+
+    async def _run(self, paths: List[Path]) -> None:
+        for path in paths:
+            await self._get_idle().wait()
+
+            entry = self._entries.get(path)
+            if entry is None or entry.state != PrewarmState.pending:
+                continue
+
+            task = asyncio.create_task(self._load(entry))
+            self._loading[path] = task
+            try:
+                await task
+            finally:
+                self._loading.pop(path, None)
+
+        self.shutdown()
+
+    async def _load(self, entry: PrewarmEntry) -> None:
+        loop = asyncio.get_running_loop()
+        entry.state = PrewarmState.loading
+
+        try:
+            data = await loop.run_in_executor(
+                self._get_process_pool(), parse_model, self._model_type, entry.path
+            )
+        except asyncio.CancelledError:
+            entry.state = PrewarmState.cancelled
+            raise
+        except Exception as e:
+            entry.state = PrewarmState.failed
+            entry.error = str(e)
+            return
+
+        entry.footprint = len(data)
+        if self.footprint + entry.footprint > self.memory_ceiling:
+            entry.state = PrewarmState.skipped
+            entry.error = "The memory ceiling would be exceeded."
+            return
+
+        model = await loop.run_in_executor(self._executor, pickle.loads, data)
+        keys = await loop.run_in_executor(self._executor, _get_file_keys, model)
+
+        self._models[entry.path] = (model, keys)
+        entry.state = PrewarmState.ready
@@ -0,0 +1,303 @@
+import asyncio
+import cProfile
+import fnmatch
+import logging
+import pstats
+import re
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+from uuid import uuid4
+
+from flowfm_inspector.basemodel import BaseModel
+
+try:
+    from pyinstrument import Profiler as SamplingProfiler
+except ImportError:
+    SamplingProfiler = None
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ProfilerKind(str, Enum):
+    cprofile = "cprofile"
+    sampling = "sampling"
+
+
+class ProfileInfo(BaseModel):
+    """ProfileInfo describes a profile written by the RequestProfiler.
+
+    Properties:
+        name (str): The file name of the profile.
+        kind (ProfilerKind): The profiler which recorded the profile.
+        method (str): The HTTP method of the profiled request.
+        path (str): The path of the profiled request.
+        status_code (Optional[int]): The status code of the response, if any.
+        duration (float): The duration of the request in seconds.
+        created (datetime): The time the request was received.
+        size (int): The size of the profile file in bytes.
+    """
+
+    name: str
+    kind: ProfilerKind
+    method: str
+    path: str
+    status_code: Optional[int]
+    duration: float
+    created: datetime
+    size: int
+
+
+class ProfileSession:
+    """ProfileSession collects the cProfile profiles recorded on the worker
+    threads on behalf of a single request.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.profiles: List[cProfile.Profile] = []
+
+    def add(self, profile: cProfile.Profile) -> None:
+        with self._lock:
+            self.profiles.append(profile)
+
+
+_current_session: ContextVar[Optional[ProfileSession]] = ContextVar(
+    "profile_session", default=None
+)
+
+
+def current_session() -> Optional[ProfileSession]:
+    """Get the ProfileSession of the request being handled, if it is profiled."""
+    return _current_session.get()
+
+
+def run_profiled(
+    session: Optional[ProfileSession], fn: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Run the provided function, and profile it as part of the session if any.
+
+    Args:
+        session (Optional[ProfileSession]): The session of the profiled request.
+        fn (Callable[..., T]): The function to run.
+
+    Returns:
+        T: The result of the function.
+    """
+    if session is None:
+        return fn(*args, **kwargs)
+
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(fn, *args, **kwargs)
+    finally:
+        session.add(profile)
+
+
+def _to_slug(path: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_")[:64] or "root"
+
+
+class RequestProfiler:
+    """The RequestProfiler profiles the requests carrying the profile header or
+    matching the route pattern, and writes a profile per request.
+
+    The event loop is profiled with a sampling profiler if pyinstrument is
+    installed and with cProfile otherwise. With cProfile, the work submitted to a
+    WorkerPool on behalf of the request is profiled on the worker thread as well,
+    and merged into the same profile. Only one request at a time profiles the
+    event loop, concurrent profiled requests only profile their work on the
+    worker pools with cProfile. Note that a profile of the event loop includes
+    any other request handled on the event loop in the mean time.
+    """
+
+    header = "x-profile"
+
+    def __init__(
+        self,
+        folder: Path,
+        pattern: Optional[str] = None,
+        sampling: bool = True,
+        enabled: bool = False,
+    ) -> None:
+        """Create a new RequestProfiler.
+
+        Args:
+            folder (Path): The folder to write the profiles to.
+            pattern (Optional[str], optional):
+                The glob pattern of the paths of the requests to profile, besides
+                the requests carrying the profile header. Defaults to None.
+            sampling (bool, optional):
+                Whether to use the sampling profiler if it is installed.
+                Defaults to True.
+            enabled (bool, optional):
+                Whether requests are profiled at all. Defaults to False.
+        """
+        self.folder = folder
+        self.pattern = pattern
+        self.sampling = sampling
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._profiles: Dict[str, ProfileInfo] = {}
+        self._profiling_loop = False
+
+    @property
+    def kind(self) -> ProfilerKind:
+        if self.sampling and SamplingProfiler is not None:
+            return ProfilerKind.sampling
+        return ProfilerKind.cprofile
+
+    def should_profile(self, scope) -> bool:
+        """Whether the request of the provided ASGI scope should be profiled."""
+        if not self.enabled or scope["type"] != "http":
+            return False
+
+        if self.pattern is not None and fnmatch.fnmatchcase(
+            scope["path"], self.pattern
+        ):
+            return True
+
+        header = self.header.encode("latin-1")
+        return any(
+            name.lower() == header and value.lower() not in (b"", b"0", b"false")
+            for name, value in scope["headers"]
+        )
+
+    @property
+    def profiles(self) -> List[ProfileInfo]:
+        """The profiles which still exist on disk, most recent first."""
+        with self._lock:
+            profiles = list(self._profiles.values())
+        return [p for p in reversed(profiles) if (self.folder / p.name).is_file()]
+
+    def get_path(self, name: str) -> Optional[Path]:
+        """Get the path of the profile with the specified name, if it exists."""
+        with self._lock:
+            if name not in self._profiles:
+                return None
+
+        path = self.folder / name
+        return path if path.is_file() else None
+
+    def _acquire_loop(self) -> bool:
+        with self._lock:
+            if self._profiling_loop:
+                return False
+            self._profiling_loop = True
+            return True
+
+    def _release_loop(self) -> None:
+        with self._lock:
+            self._profiling_loop = False
+
+    async def __call__(self, app, scope, receive, send) -> None:
+        """Handle the request of the provided ASGI scope with the wrapped app,
+        while profiling it.
+
+        The name of the profile is added to the response as the X-Profile-Name
+        header.
+        """
+        created = datetime.now()
+        profiles_loop = self._acquire_loop()
+        kind = self.kind if profiles_loop else ProfilerKind.cprofile
+        suffix = ".html" if kind == ProfilerKind.sampling else ".prof"
+        name = (
+            f"{created:%Y%m%d-%H%M%S}-{scope['method'].lower()}-"
+            f"{_to_slug(scope['path'])}-{uuid4().hex[:8]}{suffix}"
+        )
+
+        status_code: Optional[int] = None
+
+        async def send_with_name(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-name", name.encode("latin-1"))
+                ]
+            await send(message)
+
+        session = ProfileSession()
+        loop_profiler: Any = None
+        if profiles_loop:
+            if kind == ProfilerKind.sampling:
+                loop_profiler = SamplingProfiler(async_mode="enabled")
+                loop_profiler.start()
+            else:
+                loop_profiler = cProfile.Profile()
+                loop_profiler.enable()
+
+        token = _current_session.set(session if kind == ProfilerKind.cprofile else None)
+        start = time.perf_counter()
+        try:
+            await app(scope, receive, send_with_name)
+        finally:
+            duration = time.perf_counter() - start
+            _current_session.reset(token)
+
+            if loop_profiler is not None:
+                if kind == ProfilerKind.sampling:
+                    loop_profiler.stop()
+                else:
+                    loop_profiler.disable()
+                    session.add(loop_profiler)
+            if profiles_loop:
+                self._release_loop()
+
+            info = dict(
+                name=name,
+                kind=kind,
+                method=scope["method"],
+                path=scope["path"],
+                status_code=status_code,
+                duration=duration,
+                created=created,
+            )
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._write, info, loop_profiler, session
+            )
+
+    def _write(self, info: Dict, loop_profiler: Any, session: ProfileSession) -> None:
+        path = self.folder / info["name"]
+
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+
+            if info["kind"] == ProfilerKind.sampling:
+                path.write_text(loop_profiler.output_html(), encoding="utf-8")
+            elif session.profiles:
+                stats = pstats.Stats(*session.profiles)
+                stats.dump_stats(path)
+            else:
+                return
+        except Exception:
+            logger.exception("Failed to write the profile %s.", path)
+            return
+
+        with self._lock:
+            self._profiles[info["name"]] = ProfileInfo(**info, size=path.stat().st_size)
+
+
+class ProfilingMiddleware:
+    """The ProfilingMiddleware passes the requests to be profiled to the
+    RequestProfiler, other requests are passed on as is.
+    """
+
+    def __init__(self, app, profiler: RequestProfiler) -> None:
+        self._app = app
+        self._profiler = profiler
+
+    async def __call__(self, scope, receive, send) -> None:
+        if self._profiler.should_profile(scope):
+            await self._profiler(self._app, scope, receive, send)
+        else:
+            await self._app(scope, receive, send)
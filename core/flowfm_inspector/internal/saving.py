@@ -0,0 +1,136 @@
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Set
+from uuid import uuid4
+
+from hydrolib.core.basemodel import FileModel
+from hydrolib.core.io.net.models import NetworkModel
+from pydantic.types import UUID4
+
+from flowfm_inspector.basemodel import BaseModel
+from flowfm_inspector.internal.dependencies import collect_file_models
+
+
+# The field of the root model file within the dirty fields.
+ROOT_FILE = ""
+
+
+class SaveResult(BaseModel):
+    """SaveResult describes the files written when saving a model.
+
+    Properties:
+        written (List[Path]): The files which were written.
+        unchanged (List[Path]): The files which were not changed and thus skipped.
+    """
+
+    written: List[Path] = []
+    unchanged: List[Path] = []
+
+
+def write_atomic(model: FileModel, path: Path) -> None:
+    """Write the provided file model to the specified path, such that the file
+    at the path either contains the previous or the new content, even if the
+    process is terminated while writing.
+
+    The model is written to a temporary file next to the path, which then
+    replaces the file at the path. The model itself is not modified, instead
+    a shallow copy with the temporary path is written.
+
+    Args:
+        model (FileModel): The model to write.
+        path (Path): The absolute path to write the model to.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+
+    try:
+        model.copy(update={"filepath": temporary_path})._save()
+        os.replace(temporary_path, path)
+    finally:
+        temporary_path.unlink(missing_ok=True)
+
+
+class ModelSaver:
+    """The ModelSaver tracks which files of each model are dirty, and writes
+    only those files when the model is saved.
+
+    Files are identified by the field referencing them, of which the root model
+    file is identified by ROOT_FILE. Files which do not exist yet, for example
+    after the path of a child file was changed, are written as well. The net
+    file is never written, as its network is not loaded by the inspector.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._dirty: Dict[UUID4, Set[str]] = {}
+        self._save_locks: Dict[UUID4, threading.Lock] = {}
+
+    def mark_dirty(self, id: UUID4, field: str = ROOT_FILE) -> None:
+        """Mark the file of the specified model referenced by the field as dirty.
+
+        Args:
+            id (UUID4): The id of the model.
+            field (str, optional):
+                The field referencing the file. Defaults to the root model file.
+        """
+        with self._lock:
+            self._dirty.setdefault(id, set()).add(field)
+
+    def get_dirty(self, id: UUID4) -> Set[str]:
+        with self._lock:
+            return set(self._dirty.get(id, ()))
+
+    def save(self, id: UUID4, model: FileModel) -> SaveResult:
+        """Write the dirty and missing files of the specified model.
+
+        The dirty files are cleared before writing, such that changes made while
+        saving mark their files dirty again. If writing fails, the files which
+        were not written are marked dirty again.
+
+        Args:
+            id (UUID4): The id of the model.
+            model (FileModel): The model to save.
+
+        Raises:
+            ValueError: When the model has no file path to save to.
+
+        Returns:
+            SaveResult: The files written and skipped.
+        """
+        if model.filepath is None:
+            raise ValueError(f"Model {id} has no file path to save to.")
+
+        with self._lock:
+            save_lock = self._save_locks.setdefault(id, threading.Lock())
+
+        with save_lock:
+            with self._lock:
+                dirty = self._dirty.pop(id, set())
+
+            result = SaveResult()
+            pending = [
+                (field, file_model, path)
+                for field, file_model, path in collect_file_models(model)
+                if not isinstance(file_model, NetworkModel)
+            ]
+
+            try:
+                for field, file_model, path in pending:
+                    if field in dirty or not path.exists():
+                        write_atomic(file_model, path)
+                        dirty.discard(field)
+                        result.written.append(path)
+                    else:
+                        result.unchanged.append(path)
+            except BaseException:
+                with self._lock:
+                    self._dirty.setdefault(id, set()).update(dirty)
+                raise
+
+            return result
+
+    def discard(self, id: UUID4) -> None:
+        with self._lock:
+            self._dirty.pop(id, None)
+            self._save_locks.pop(id, None)
@@ -0,0 +1,183 @@
+import hashlib
+import json
+from typing import Dict, NamedTuple, Optional, Type
+
+from flowfm_inspector.internal.metrics import MetricsRegistry, span
+
+
+# Note that this has currently been set up for MDU files.
+def get_sanitized_schema(model_type: Type) -> Dict:
+    schema = dict(model_type.schema())
+
+    # No need to send unnecessary data
+    schema.pop("description", None)
+    schema.pop("definitions", None)
+
+    if "properties" in schema:
+        schema["properties"].pop("comments", None)
+
+        # we assume that every ref is a reference to another file
+        # and as such replace it with a filepath.
+        update_model_properties(schema["properties"])
+
+    return schema
+
+
+def update_model_properties(properties: dict) -> None:
+    for (key, value) in properties.items():
+        if "$ref" in value:
+            properties[key] = {
+                "title": key.capitalize(),
+                "type": "string",
+                "format": "path",
+            }
+
+        elif value["type"] == "array":
+            if (
+                "$ref" in value["items"] or "anyOf" in value["items"]
+            ):  # "anyOf" only occurs for dryPointsFile in mdu.
+                value["items"] = {
+                    "type": "string",
+                    "format": "path",
+                }
+
+
+def serialize_json(data: object) -> bytes:
+    """Serialize the provided data to compact JSON bytes.
+
+    The output matches the encoding used by the default FastAPI JSONResponse.
+
+    Args:
+        data (object): The JSON compatible data to serialize.
+
+    Returns:
+        bytes: The UTF-8 encoded JSON.
+    """
+    return json.dumps(
+        data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class SerializedSchema(NamedTuple):
+    """SerializedSchema holds the serialized JSON of a sanitized schema.
+
+    Properties:
+        content (bytes): The serialized JSON of the schema.
+        etag (str): The quoted entity tag identifying the content.
+    """
+
+    content: bytes
+    etag: str
+
+    @classmethod
+    def from_data(cls, data: object) -> "SerializedSchema":
+        return cls.from_content(serialize_json(data))
+
+    @classmethod
+    def from_content(cls, content: bytes) -> "SerializedSchema":
+        etag = f'"{hashlib.sha1(content).hexdigest()}"'
+        return cls(content=content, etag=etag)
+
+
+class SchemaRegistry:
+    """The SchemaRegistry provides the sanitized schemas of the supported models.
+
+    The schemas do not change while the application runs, as such each schema
+    is generated and serialized only once, upon its first request.
+    """
+
+    def __init__(
+        self,
+        schema_mapping: Dict[str, Dict[str, Type]],
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        """Create a new SchemaRegistry.
+
+        Args:
+            schema_mapping (Dict[str, Dict[str, Type]]):
+                The model types per model name per model category.
+            metrics (Optional[MetricsRegistry], optional):
+                The registry recording the duration of generating the schemas,
+                if any. Defaults to None.
+        """
+        self._metrics = metrics
+        self._schema_mapping = schema_mapping
+        self._schemas: Dict[str, Dict[str, SerializedSchema]] = {}
+        self._category_schemas: Dict[str, SerializedSchema] = {}
+
+    def to_model(self, model_category: str, model_name: str) -> Type:
+        return self._schema_mapping[model_category][model_name]
+
+    def get(self, model_category: str, model_name: str) -> SerializedSchema:
+        """Get the serialized schema of the specified model.
+
+        Args:
+            model_category (str): The category of the model, e.g. "mdu".
+            model_name (str): The name of the model within the category.
+
+        Raises:
+            KeyError: When the model is not part of this SchemaRegistry.
+
+        Returns:
+            SerializedSchema: The serialized sanitized schema.
+        """
+        category_schemas = self._schemas.get(model_category, {})
+
+        if model_name not in category_schemas:
+            model_type = self.to_model(model_category, model_name)
+            category_schemas = self._schemas.setdefault(model_category, {})
+            with span(self._metrics, "schema"):
+                category_schemas[model_name] = SerializedSchema.from_data(
+                    get_sanitized_schema(model_type)
+                )
+
+        return category_schemas[model_name]
+
+    def get_cached(
+        self, model_category: str, model_name: Optional[str] = None
+    ) -> Optional[SerializedSchema]:
+        """Get the serialized schema of the specified model, or of all models
+        within the category if no model name is specified, if it has already
+        been generated.
+
+        This never generates a schema, as such it is cheap enough to call on the
+        event loop.
+
+        Args:
+            model_category (str): The category of the model, e.g. "mdu".
+            model_name (Optional[str], optional):
+                The name of the model within the category. Defaults to None.
+
+        Returns:
+            Optional[SerializedSchema]: The serialized schema, if already generated.
+        """
+        if model_name is None:
+            return self._category_schemas.get(model_category)
+        return self._schemas.get(model_category, {}).get(model_name)
+
+    def get_category(self, model_category: str) -> SerializedSchema:
+        """Get the serialized schemas of all models within the specified category.
+
+        The result is a single JSON object mapping each model name to its schema,
+        which is composed from the cached serialized schemas of the models.
+
+        Args:
+            model_category (str): The category of the models, e.g. "mdu".
+
+        Raises:
+            KeyError: When the category is not part of this SchemaRegistry.
+
+        Returns:
+            SerializedSchema: The serialized sanitized schemas of the category.
+        """
+        if model_category not in self._category_schemas:
+            model_names = self._schema_mapping[model_category].keys()
+            members = (
+                serialize_json(name) + b":" + self.get(model_category, name).content
+                for name in model_names
+            )
+            self._category_schemas[model_category] = SerializedSchema.from_content(
+                b"{" + b",".join(members) + b"}"
+            )
+
+        return self._category_schemas[model_category]
@@ -0,0 +1,202 @@
+import hashlib
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel as PydanticBaseModel
+from pydantic.types import UUID4
+
+from flowfm_inspector.internal.metrics import MetricsRegistry, span
+from flowfm_inspector.internal.schema import serialize_json
+
+
+def submodel_to_dict(
+    submodel: PydanticBaseModel, include: Optional[Dict[str, Any]] = None
+) -> Dict:
+    return submodel.dict(
+        by_alias=True,
+        include=include,
+        exclude_defaults=False,
+        exclude_none=False,
+        exclude_unset=False,
+    )
+
+
+def serialize_submodel(
+    submodel: PydanticBaseModel,
+    fields: Optional[Iterable[str]] = None,
+    comments: bool = True,
+) -> bytes:
+    """Serialize (a selection of) the provided submodel.
+
+    Args:
+        submodel (PydanticBaseModel): The submodel to serialize.
+        fields (Optional[Iterable[str]], optional):
+            The names of the fields to serialize. If None, all fields are
+            serialized. Defaults to None.
+        comments (bool, optional):
+            Whether to serialize the comments of the selected fields.
+            Defaults to True.
+
+    Returns:
+        bytes: The serialized JSON of the submodel.
+    """
+    include: Optional[Dict[str, Any]] = None
+
+    if fields is not None or not comments:
+        selected = set(submodel.__dict__.keys() if fields is None else fields)
+        selected.discard("comments")
+
+        include = {field: ... for field in selected}
+        if comments and "comments" in submodel.__dict__:
+            include["comments"] = {field: ... for field in selected}
+
+    return serialize_json(jsonable_encoder(submodel_to_dict(submodel, include)))
+
+
+class ModelSerializationCache:
+    """The ModelSerializationCache keeps the serialized JSON of each submodel of
+    the registered models.
+
+    A model is serialized by composing the serialized submodels, only the
+    submodels which have been invalidated since the last serialization are
+    serialized again. Scalar fields of the model itself, such as the filepath,
+    are cheap to serialize and as such are never cached.
+
+    Serialization can safely run on worker threads while submodels are being
+    invalidated on the event loop; a submodel serialized from a state that
+    has been invalidated in the mean time is not stored.
+    """
+
+    def __init__(self, metrics: Optional[MetricsRegistry] = None) -> None:
+        """Create a new empty ModelSerializationCache.
+
+        Args:
+            metrics (Optional[MetricsRegistry], optional):
+                The registry recording the duration of serializing submodels,
+                if any. Defaults to None.
+        """
+        self._metrics = metrics
+        self._lock = threading.Lock()
+        self._submodels: Dict[UUID4, Dict[str, bytes]] = {}
+        self._model_generations: Dict[UUID4, int] = {}
+        self._generations: Dict[Tuple[UUID4, str], int] = {}
+        self._digests: Dict[UUID4, Dict[str, str]] = {}
+
+    def serialize(self, id: UUID4, model: PydanticBaseModel) -> bytes:
+        """Serialize the provided model, reusing the cached serialized submodels.
+
+        The result is equal to the JSON encoded `model.dict(by_alias=True)`.
+
+        Args:
+            id (UUID4): The id of the model.
+            model (PydanticBaseModel): The model to serialize.
+
+        Returns:
+            bytes: The serialized JSON of the model.
+        """
+        members = (
+            serialize_json(field.alias) + b":" + self._serialize_field(id, model, name)
+            for name, field in model.__fields__.items()
+        )
+        return b"{" + b",".join(members) + b"}"
+
+    def serialize_submodel(
+        self, id: UUID4, model: PydanticBaseModel, name: str
+    ) -> bytes:
+        """Serialize the specified submodel of the provided model, reusing the
+        cached serialized submodel if it is still valid.
+
+        Args:
+            id (UUID4): The id of the model.
+            model (PydanticBaseModel): The model containing the submodel.
+            name (str): The field name of the submodel.
+
+        Returns:
+            bytes: The serialized JSON of the submodel.
+        """
+        return self._serialize_field(id, model, name)
+
+    def submodel_digest(self, id: UUID4, model: PydanticBaseModel, name: str) -> str:
+        """Get the SHA-1 digest of the serialized JSON of the specified submodel.
+
+        Equal digests imply equal submodels, as such submodels can be compared
+        without comparing their fields. The digest is cached together with the
+        serialized submodel.
+
+        Args:
+            id (UUID4): The id of the model.
+            model (PydanticBaseModel): The model containing the submodel.
+            name (str): The field name of the submodel.
+
+        Returns:
+            str: The hexadecimal digest.
+        """
+        with self._lock:
+            generation = self._generation(id, name)
+            digest = self._digests.get(id, {}).get(name)
+
+        if digest is None:
+            digest = hashlib.sha1(self._serialize_field(id, model, name)).hexdigest()
+
+            with self._lock:
+                if self._generation(id, name) == generation:
+                    self._digests.setdefault(id, {})[name] = digest
+
+        return digest
+
+    def _serialize_field(self, id: UUID4, model: PydanticBaseModel, name: str) -> bytes:
+        value = getattr(model, name)
+
+        if not isinstance(value, PydanticBaseModel):
+            return serialize_json(jsonable_encoder(value))
+
+        with self._lock:
+            generation = self._generation(id, name)
+            content = self._submodels.get(id, {}).get(name)
+
+        if content is None:
+            with span(self._metrics, "serialization"):
+                content = serialize_submodel(value)
+
+            with self._lock:
+                if self._generation(id, name) == generation:
+                    self._submodels.setdefault(id, {})[name] = content
+
+        return content
+
+    def _generation(self, id: UUID4, name: str) -> Tuple[int, int]:
+        return (
+            self._model_generations.get(id, 0),
+            self._generations.get((id, name), 0),
+        )
+
+    def invalidate(self, id: UUID4, submodel: Optional[str] = None) -> None:
+        """Invalidate the cached serialized submodel of the specified model.
+
+        Args:
+            id (UUID4): The id of the model.
+            submodel (Optional[str], optional):
+                The field name of the submodel to invalidate. If None, all
+                submodels of the model are invalidated. Defaults to None.
+        """
+        if submodel is None:
+            self.discard(id)
+            return
+
+        with self._lock:
+            self._submodels.get(id, {}).pop(submodel, None)
+            self._digests.get(id, {}).pop(submodel, None)
+            key = (id, submodel)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def discard(self, id: UUID4) -> None:
+        """Remove all cached data of the specified model.
+
+        Args:
+            id (UUID4): The id of the model.
+        """
+        with self._lock:
+            self._submodels.pop(id, None)
+            self._digests.pop(id, None)
+            self._model_generations[id] = self._model_generations.get(id, 0) + 1
@@ -0,0 +1,340 @@
+import math
+import threading
+from concurrent.futures import Executor, Future
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from flowfm_inspector.basemodel import BaseModel
+from flowfm_inspector.internal.network import LazyNetwork
+
+
+class SpatialKind(str, Enum):
+    nodes = "nodes"
+    faces = "faces"
+
+
+class NearestElement(BaseModel):
+    """NearestElement describes the element nearest to a queried location.
+
+    Properties:
+        index (int): The zero-based index of the element.
+        x (float): The x coordinate of the node or face center.
+        y (float): The y coordinate of the node or face center.
+        distance (float): The distance to the queried location.
+    """
+
+    index: int
+    x: float
+    y: float
+    distance: float
+
+
+class ElementsWithin(BaseModel):
+    """ElementsWithin describes the elements within a queried bounding box.
+
+    Properties:
+        count (int): The total number of elements within the bounding box.
+        indices (List[int]): The zero-based indices of the elements, up to the limit.
+        truncated (bool): Whether the indices were truncated to the limit.
+    """
+
+    count: int
+    indices: List[int]
+    truncated: bool = False
+
+
+class UniformGridIndex:
+    """The UniformGridIndex buckets points into the cells of a uniform grid
+    spanning their bounding box, to answer nearest point and bounding box
+    queries without scanning all points.
+
+    The point indices are stored sorted by cell, such that the points of a
+    row of consecutive cells form a single contiguous slice. Points with NaN or
+    infinite coordinates are not indexed, but keep their index.
+    """
+
+    def __init__(self, points: np.ndarray, points_per_cell: int = 8) -> None:
+        """Create a new UniformGridIndex over the provided points.
+
+        Args:
+            points (np.ndarray): The (n, 2) array of point coordinates.
+            points_per_cell (int, optional):
+                The targeted mean number of points per cell. Defaults to 8.
+        """
+        self._points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self._indices = np.flatnonzero(np.isfinite(self._points).all(axis=1))
+        valid = self._points[self._indices]
+        n_points = len(valid)
+
+        if n_points:
+            self._min = valid.min(axis=0)
+            self._max = valid.max(axis=0)
+        else:
+            self._min = np.zeros(2)
+            self._max = np.zeros(2)
+
+        self._nx, self._ny = self._get_shape(n_points, points_per_cell)
+        extent = self._max - self._min
+        extent = np.where(extent > 0.0, extent, 1.0)
+        self._cell_size = extent / (self._nx, self._ny)
+
+        ix, iy = self._to_cell(valid[:, 0], valid[:, 1])
+        cells = iy * self._nx + ix
+        self._order = self._indices[np.argsort(cells, kind="stable")]
+        self._starts = np.zeros(self._nx * self._ny + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(cells, minlength=self._nx * self._ny), out=self._starts[1:]
+        )
+
+    def _get_shape(self, n_points: int, points_per_cell: int) -> Tuple[int, int]:
+        n_cells = max(1, n_points // points_per_cell)
+        width, height = self._max - self._min
+
+        if width <= 0.0 and height <= 0.0:
+            return 1, 1
+        if height <= 0.0:
+            return n_cells, 1
+        if width <= 0.0:
+            return 1, n_cells
+
+        nx = max(1, min(n_cells, round(math.sqrt(n_cells * width / height))))
+        return nx, max(1, n_cells // nx)
+
+    def _to_cell(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        ix = np.floor((x - self._min[0]) / self._cell_size[0]).astype(np.int64)
+        iy = np.floor((y - self._min[1]) / self._cell_size[1]).astype(np.int64)
+        return np.clip(ix, 0, self._nx - 1), np.clip(iy, 0, self._ny - 1)
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    @property
+    def points(self) -> np.ndarray:
+        return self._points
+
+    def _row_candidates(self, iy: int, ix0: int, ix1: int) -> np.ndarray:
+        first = iy * self._nx + ix0
+        last = iy * self._nx + ix1
+        return self._order[self._starts[first] : self._starts[last + 1]]
+
+    def within(self, xmin: float, ymin: float, xmax: float, ymax: float) -> np.ndarray:
+        """Get the indices of all points within the specified bounding box.
+
+        Args:
+            xmin (float): The minimum x coordinate.
+            ymin (float): The minimum y coordinate.
+            xmax (float): The maximum x coordinate.
+            ymax (float): The maximum y coordinate.
+
+        Returns:
+            np.ndarray:
+                The sorted indices of the points within the bounding box, which is
+                empty if the bounding box is inverted.
+        """
+        # Written such that NaN coordinates also yield an empty result.
+        if (
+            not len(self)
+            or not (xmin <= xmax and ymin <= ymax)
+            or xmax < self._min[0]
+            or ymax < self._min[1]
+            or xmin > self._max[0]
+            or ymin > self._max[1]
+        ):
+            return np.empty(0, dtype=np.int64)
+
+        (ix0, ix1), (iy0, iy1) = self._to_cell(
+            np.array([xmin, xmax]), np.array([ymin, ymax])
+        )
+        candidates = np.concatenate(
+            [self._row_candidates(iy, ix0, ix1) for iy in range(iy0, iy1 + 1)]
+        )
+
+        x = self._points[candidates, 0]
+        y = self._points[candidates, 1]
+        inside = (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
+        return np.sort(candidates[inside])
+
+    def nearest(self, x: float, y: float) -> Tuple[int, float]:
+        """Get the point nearest to the specified location.
+
+        The cells are searched in rings of increasing size around the cell
+        containing the location, until no unsearched point can be nearer than
+        the nearest point found so far.
+
+        Args:
+            x (float): The x coordinate of the location.
+            y (float): The y coordinate of the location.
+
+        Returns:
+            Tuple[int, float]:
+                The index of the nearest point and its distance, or (-1, inf) if
+                the index is empty.
+        """
+        best_index, best_distance = -1, math.inf
+        if not len(self):
+            return best_index, best_distance
+
+        cx, cy = (int(v[0]) for v in self._to_cell(np.array([x]), np.array([y])))
+
+        for ring in range(max(self._nx, self._ny)):
+            ix0, ix1 = max(0, cx - ring), min(self._nx - 1, cx + ring)
+            iy0, iy1 = max(0, cy - ring), min(self._ny - 1, cy + ring)
+
+            rows = []
+            for iy in range(iy0, iy1 + 1):
+                if iy in (cy - ring, cy + ring):
+                    rows.append(self._row_candidates(iy, ix0, ix1))
+                else:
+                    if cx - ring >= 0:
+                        rows.append(self._row_candidates(iy, cx - ring, cx - ring))
+                    if cx + ring < self._nx and ring > 0:
+                        rows.append(self._row_candidates(iy, cx + ring, cx + ring))
+
+            candidates = np.concatenate(rows) if rows else np.empty(0, np.int64)
+            if len(candidates):
+                distances = np.hypot(
+                    self._points[candidates, 0] - x, self._points[candidates, 1] - y
+                )
+                i = int(np.argmin(distances))
+                if distances[i] < best_distance:
+                    best_index, best_distance = int(candidates[i]), float(distances[i])
+
+            # Every point not searched yet lies outside the searched cells.
+            searched_min = self._min + (cx - ring, cy - ring) * self._cell_size
+            searched_max = self._min + (cx + ring + 1, cy + ring + 1) * self._cell_size
+            bound = min(
+                x - searched_min[0] if cx - ring > 0 else math.inf,
+                searched_max[0] - x if cx + ring < self._nx - 1 else math.inf,
+                y - searched_min[1] if cy - ring > 0 else math.inf,
+                searched_max[1] - y if cy + ring < self._ny - 1 else math.inf,
+            )
+            if best_distance <= bound:
+                break
+
+        return best_index, best_distance
+
+
+def compute_face_centers(nodes: np.ndarray, face_nodes: np.ndarray) -> np.ndarray:
+    """Compute the mean of the node coordinates of each face.
+
+    Args:
+        nodes (np.ndarray): The (n, 2) node coordinates.
+        face_nodes (np.ndarray): The zero-based face node connectivity, -1 if missing.
+
+    Returns:
+        np.ndarray:
+            The (n_faces, 2) face centers, which are NaN for faces with a node
+            of which the coordinates are NaN.
+    """
+    valid = face_nodes >= 0
+    coordinates = np.where(
+        valid[..., np.newaxis], nodes[np.where(valid, face_nodes, 0)], 0.0
+    )
+    return coordinates.sum(axis=1) / np.maximum(valid.sum(axis=1), 1)[:, np.newaxis]
+
+
+class MeshSpatialIndex:
+    """MeshSpatialIndex holds the spatial indices of the nodes and faces of a mesh."""
+
+    # The number of faces of which the connectivity is read at a time.
+    chunk_size = 1 << 18
+
+    def __init__(self, network: LazyNetwork, mesh: str) -> None:
+        """Build the spatial indices of the specified mesh.
+
+        Args:
+            network (LazyNetwork): The network containing the mesh.
+            mesh (str): The name of the mesh.
+        """
+        nodes = network.read_nodes(mesh, masked=True)
+        self.nodes = UniformGridIndex(nodes)
+
+        face_count, _ = network.get_size(mesh, "faces")
+        centers = [
+            compute_face_centers(
+                nodes,
+                network.read_connectivity(mesh, "faces", start, self.chunk_size),
+            )
+            for start in range(0, face_count, self.chunk_size)
+        ]
+        self.faces = UniformGridIndex(
+            np.concatenate(centers) if centers else np.empty((0, 2))
+        )
+
+    def get(self, kind: SpatialKind) -> UniformGridIndex:
+        return self.nodes if kind == SpatialKind.nodes else self.faces
+
+    def nearest(
+        self, kind: SpatialKind, x: float, y: float
+    ) -> Optional[NearestElement]:
+        index = self.get(kind)
+        i, distance = index.nearest(x, y)
+        if i < 0:
+            return None
+
+        point_x, point_y = index.points[i]
+        return NearestElement(
+            index=i, x=float(point_x), y=float(point_y), distance=distance
+        )
+
+    def within(
+        self,
+        kind: SpatialKind,
+        bounding_box: Tuple[float, float, float, float],
+        limit: Optional[int] = None,
+    ) -> ElementsWithin:
+        indices = self.get(kind).within(*bounding_box)
+        truncated = limit is not None and len(indices) > limit
+        return ElementsWithin(
+            count=len(indices),
+            indices=(indices[:limit] if truncated else indices).tolist(),
+            truncated=truncated,
+        )
+
+
+class SpatialIndexRegistry:
+    """The SpatialIndexRegistry builds the spatial indices of meshes in the
+    background and keeps them per net file and mesh.
+
+    A failed build is not kept, such that the next request retries it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._indices: Dict[Tuple[Path, str], Future] = {}
+
+    def get(
+        self, network: LazyNetwork, mesh: str, executor: Executor
+    ) -> "Future[MeshSpatialIndex]":
+        """Get the spatial index of the specified mesh, building it on the executor
+        if it has not been requested before.
+
+        Args:
+            network (LazyNetwork): The network containing the mesh.
+            mesh (str): The name of the mesh.
+            executor (Executor): The executor to build the index on.
+
+        Returns:
+            Future[MeshSpatialIndex]: The (future) spatial index.
+        """
+        key = (network.path, mesh)
+
+        with self._lock:
+            future: Optional[Future] = self._indices.get(key)
+
+            if future is None or (
+                future.done() and (future.cancelled() or future.exception())
+            ):
+                future = executor.submit(MeshSpatialIndex, network, mesh)
+                self._indices[key] = future
+
+            return future
+
+    def discard(self, path: Path) -> None:
+        """Remove the spatial indices of the meshes of the specified net file."""
+        with self._lock:
+            for key in [key for key in self._indices if key[0] == path]:
+                del self._indices[key]
@@ -0,0 +1,210 @@
+import asyncio
+import json
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+# Note that this module is imported before the server is bound to its port, as
+# such it should only depend on the standard library.
+
+
+class StartupPhase(NamedTuple):
+    """StartupPhase describes a single timed phase of the startup.
+
+    Properties:
+        name (str): The name of the phase.
+        start (float): The time in seconds since the start of the process.
+        duration (float): The duration of the phase in seconds.
+    """
+
+    name: str
+    start: float
+    duration: float
+
+
+class StartupProfile:
+    """The StartupProfile records the duration of the phases of the startup,
+    such that the cold start time can be measured.
+    """
+
+    def __init__(self, started: Optional[float] = None) -> None:
+        """Create a new StartupProfile.
+
+        Args:
+            started (Optional[float], optional):
+                The time.perf_counter() at which the process started, if None
+                the current time. Defaults to None.
+        """
+        self._started = time.perf_counter() if started is None else started
+        self.phases: List[StartupPhase] = []
+
+    def record(self, name: str, start: float, end: Optional[float] = None) -> None:
+        """Record a phase between the provided time.perf_counter() values, where
+        the end defaults to the current time.
+        """
+        end = time.perf_counter() if end is None else end
+        self.phases.append(StartupPhase(name, start - self._started, end - start))
+
+    def mark(self, name: str) -> None:
+        """Record a moment of the startup as a phase without duration."""
+        self.record(name, time.perf_counter(), time.perf_counter())
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Record the duration of the context as a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start)
+
+    def to_dict(self) -> List[Dict[str, Any]]:
+        return [phase._asdict() for phase in self.phases]
+
+    def report(self) -> str:
+        """Format the recorded phases as a table."""
+        width = max((len(phase.name) for phase in self.phases), default=0)
+        lines = [f"{'phase':<{width}}  {'start':>9}  {'duration':>9}"]
+        lines.extend(
+            f"{p.name:<{width}}  {p.start * 1000:7.1f}ms  {p.duration * 1000:7.1f}ms"
+            for p in self.phases
+        )
+        return "\n".join(lines)
+
+
+class DeferredApp:
+    """The DeferredApp is an ASGI application which accepts requests as soon as
+    the server is bound, while the actual application is loaded in the
+    background.
+
+    The readiness of the application is reported at the health path, with a 503
+    while loading, a 200 once ready and a 500 if loading failed. Any other
+    request waits until the application is ready and is then passed on to it.
+
+    The application is loaded on a thread, after which its startup handlers
+    are executed on the event loop. As such loading can import modules and
+    construct objects, without blocking the health checks.
+    """
+
+    health_path = "/api/health"
+
+    def __init__(
+        self,
+        load: Callable[[], Any],
+        profile: Optional[StartupProfile] = None,
+        on_ready: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Create a new DeferredApp.
+
+        Args:
+            load (Callable[[], Any]):
+                The blocking function returning the FastAPI application.
+            profile (Optional[StartupProfile], optional):
+                The profile recording the startup phases, if any. Defaults to None.
+            on_ready (Optional[Callable[[], None]], optional):
+                Callback executed once the application is ready. Defaults to None.
+        """
+        self._load = load
+        self._profile = profile
+        self._on_ready = on_ready
+
+        self._app: Any = None
+        self._error: Optional[str] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def status(self) -> str:
+        if self._error is not None:
+            return "failed"
+        return "ready" if self._app is not None else "starting"
+
+    def _get_ready(self) -> asyncio.Event:
+        if self._ready is None:
+            self._ready = asyncio.Event()
+        return self._ready
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        if scope["type"] == "http" and scope["path"] == self.health_path:
+            await self._send_health(send)
+            return
+
+        if self._app is None:
+            await self._get_ready().wait()
+
+        if self._app is not None:
+            await self._app(scope, receive, send)
+        elif scope["type"] == "http":
+            await self._send_json(send, 500, {"detail": self._error})
+        else:
+            await send({"type": "websocket.close", "code": 1011})
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+
+            if message["type"] == "lifespan.startup":
+                if self._profile is not None:
+                    self._profile.mark("listening")
+                self._task = asyncio.create_task(self._initialize())
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._task is not None and not self._task.done():
+                    self._task.cancel()
+                if self._app is not None:
+                    await self._app.router.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _initialize(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        try:
+            app = await loop.run_in_executor(None, self._load)
+
+            start = time.perf_counter()
+            await app.router.startup()
+            if self._profile is not None:
+                self._profile.record("startup handlers", start)
+                self._profile.mark("ready")
+
+            self._app = app
+        except Exception as e:
+            self._error = f"Failed to start the server: {e}"
+            raise
+        finally:
+            self._get_ready().set()
+
+        if self._on_ready is not None:
+            self._on_ready()
+
+    async def _send_health(self, send) -> None:
+        content: Dict[str, Any] = {"status": self.status}
+        if self._error is not None:
+            content["detail"] = self._error
+        if self._profile is not None:
+            content["startup"] = self._profile.to_dict()
+
+        status_code = {"starting": 503, "ready": 200, "failed": 500}[self.status]
+        await self._send_json(send, status_code, content)
+
+    @staticmethod
+    async def _send_json(send, status_code: int, content: Any) -> None:
+        body = json.dumps(content).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status_code,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                    # The user interface polls the health from another origin.
+                    (b"access-control-allow-origin", b"*"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
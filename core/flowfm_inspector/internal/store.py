@@ -0,0 +1,277 @@
+import pickle
+import shutil
+import tempfile
+import threading
+import weakref
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterator, MutableMapping, Optional, TypeVar
+
+from hydrolib.core.basemodel import FileModel
+from pydantic.types import UUID4
+
+from flowfm_inspector.basemodel import BaseModel
+
+T = TypeVar("T")
+
+
+class ModelStoreStats(BaseModel):
+    """ModelStoreStats describes the current state of a ModelStore.
+
+    Properties:
+        memory_budget (Optional[int]): The memory budget in bytes, if any.
+        resident_count (int): The number of models held in memory.
+        resident_footprint (int): The estimated footprint of the models in memory.
+        spilled_count (int): The number of models spilled to disk.
+        spill_count (int): The total number of times a model was spilled.
+        reload_count (int): The total number of times a model was reloaded.
+    """
+
+    memory_budget: Optional[int]
+    resident_count: int
+    resident_footprint: int
+    spilled_count: int
+    spill_count: int
+    reload_count: int
+
+
+class ModelStore(MutableMapping[UUID4, FileModel]):
+    """The ModelStore holds the loaded models within a memory budget.
+
+    The footprint of each model is estimated by the size of its pickled
+    representation. Once the estimated footprint of the models in memory
+    exceeds the budget, the least recently used models are spilled to a
+    compressed snapshot on disk, and transparently reloaded upon their next
+    access. The most recently used model is always kept in memory.
+
+    Spilled models which are still referenced elsewhere, for example by a
+    request in progress, are reused upon reload instead of the snapshot.
+    However, changes made through such a reference after it was spilled are
+    lost once the reference is released, as such models should be modified
+    through update, which prevents the model from being spilled meanwhile.
+
+    The ModelStore can be accessed concurrently from multiple threads. Accessing
+    or adding a model might spill or reload models, as such this should be done
+    off the event loop when a memory budget is set.
+    """
+
+    def __init__(
+        self,
+        memory_budget: Optional[int] = None,
+        spill_folder: Optional[Path] = None,
+        on_spill: Optional[Callable[[UUID4], None]] = None,
+    ) -> None:
+        """Create a new ModelStore.
+
+        Args:
+            memory_budget (Optional[int], optional):
+                The memory budget in bytes, if None models are never spilled.
+                Defaults to None.
+            spill_folder (Optional[Path], optional):
+                The folder to write the snapshots to, if None a temporary folder
+                is created upon the first spill. Defaults to None.
+            on_spill (Optional[Callable[[UUID4], None]], optional):
+                Called with the id of each spilled model, such that data derived
+                from the model can be released. Defaults to None.
+        """
+        self._memory_budget = memory_budget
+        self._spill_folder = spill_folder
+        self._owns_spill_folder = spill_folder is None
+        self._on_spill = on_spill
+
+        self._lock = threading.RLock()
+        self._ids: Dict[UUID4, None] = {}
+        self._resident: "OrderedDict[UUID4, FileModel]" = OrderedDict()
+        self._footprints: Dict[UUID4, int] = {}
+        self._spilled: Dict[UUID4, Path] = {}
+        self._spilled_references: Dict[UUID4, weakref.ref] = {}
+
+        self._spill_count = 0
+        self._reload_count = 0
+
+    @property
+    def memory_budget(self) -> Optional[int]:
+        return self._memory_budget
+
+    @memory_budget.setter
+    def memory_budget(self, value: Optional[int]) -> None:
+        with self._lock:
+            self._memory_budget = value
+            self._enforce_budget()
+
+    @staticmethod
+    def estimate_footprint(model: FileModel) -> int:
+        """Estimate the memory footprint of the provided model in bytes."""
+        return len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def __getitem__(self, id: UUID4) -> FileModel:
+        with self._lock:
+            if id in self._resident:
+                self._resident.move_to_end(id)
+                return self._resident[id]
+
+            if id not in self._spilled:
+                raise KeyError(id)
+
+            model = self._reload(id)
+            self._resident[id] = model
+            self._enforce_budget()
+            return model
+
+    def __setitem__(self, id: UUID4, model: FileModel) -> None:
+        with self._lock:
+            self._discard_snapshot(id)
+            self._ids[id] = None
+            self._resident[id] = model
+            self._resident.move_to_end(id)
+            self._footprints.pop(id, None)
+            self._enforce_budget()
+
+    def __delitem__(self, id: UUID4) -> None:
+        with self._lock:
+            if id not in self._ids:
+                raise KeyError(id)
+
+            del self._ids[id]
+            self._resident.pop(id, None)
+            self._footprints.pop(id, None)
+            self._discard_snapshot(id)
+
+    def __contains__(self, id: object) -> bool:
+        return id in self._ids
+
+    def __iter__(self) -> Iterator[UUID4]:
+        return iter(list(self._ids))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def update(self, id: UUID4, modify: Callable[[FileModel], T]) -> T:
+        """Modify the specified model in place.
+
+        The model is held under the lock of the store while it is modified, such
+        that it is not spilled, and thereby snapshotted, during the modification.
+        Its estimated footprint is updated afterwards.
+
+        Args:
+            id (UUID4): The id of the model.
+            modify (Callable[[FileModel], T]): Called with the model to modify it.
+
+        Raises:
+            KeyError: When no model with the id exists.
+
+        Returns:
+            T: The result of modify.
+        """
+        with self._lock:
+            model = self[id]
+            try:
+                return modify(model)
+            finally:
+                self._footprints.pop(id, None)
+                self._enforce_budget()
+
+    def is_resident(self, id: UUID4) -> bool:
+        return id in self._resident
+
+    @property
+    def stats(self) -> ModelStoreStats:
+        with self._lock:
+            return ModelStoreStats(
+                memory_budget=self._memory_budget,
+                resident_count=len(self._resident),
+                resident_footprint=sum(self._footprints.values()),
+                spilled_count=len(self._spilled),
+                spill_count=self._spill_count,
+                reload_count=self._reload_count,
+            )
+
+    def estimate_resident_footprint(self) -> int:
+        """Estimate the footprint of the models in memory in bytes.
+
+        The footprint of each model is estimated once, until the model is replaced.
+        Note that changes made to a model in place are not reflected.
+
+        Returns:
+            int: The estimated footprint in bytes.
+        """
+        with self._lock:
+            missing = [
+                (id, model)
+                for id, model in self._resident.items()
+                if id not in self._footprints
+            ]
+
+        for id, model in missing:
+            footprint = self.estimate_footprint(model)
+            with self._lock:
+                if self._resident.get(id) is model:
+                    self._footprints[id] = footprint
+
+        with self._lock:
+            return sum(self._footprints.get(id, 0) for id in self._resident)
+
+    def close(self) -> None:
+        """Remove all snapshots, and the spill folder if it was created by this store."""
+        with self._lock:
+            for id in list(self._spilled):
+                self._discard_snapshot(id)
+
+            if self._owns_spill_folder and self._spill_folder is not None:
+                shutil.rmtree(self._spill_folder, ignore_errors=True)
+                self._spill_folder = None
+
+    def _enforce_budget(self) -> None:
+        if self._memory_budget is None:
+            return
+
+        for id, model in self._resident.items():
+            if id not in self._footprints:
+                self._footprints[id] = self.estimate_footprint(model)
+
+        footprint = sum(self._footprints.values())
+        while footprint > self._memory_budget and len(self._resident) > 1:
+            id = next(iter(self._resident))
+            footprint -= self._footprints[id]
+            self._spill(id)
+
+    def _get_spill_folder(self) -> Path:
+        if self._spill_folder is None:
+            self._spill_folder = Path(tempfile.mkdtemp(prefix="flowfm-inspector-"))
+        self._spill_folder.mkdir(parents=True, exist_ok=True)
+        return self._spill_folder
+
+    def _spill(self, id: UUID4) -> None:
+        model = self._resident.pop(id)
+        self._footprints.pop(id, None)
+
+        path = self._get_spill_folder() / f"{id}.pickle.z"
+        data = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+        path.write_bytes(zlib.compress(data, 1))
+
+        self._spilled[id] = path
+        self._spilled_references[id] = weakref.ref(model)
+        self._spill_count += 1
+
+        if self._on_spill is not None:
+            self._on_spill(id)
+
+    def _reload(self, id: UUID4) -> FileModel:
+        model = self._spilled_references.pop(id)()
+        path = self._spilled.pop(id)
+
+        if model is None:
+            data = zlib.decompress(path.read_bytes())
+            model = pickle.loads(data)
+            self._footprints[id] = len(data)
+            self._reload_count += 1
+
+        path.unlink(missing_ok=True)
+        return model
+
+    def _discard_snapshot(self, id: UUID4) -> None:
+        self._spilled_references.pop(id, None)
+        path = self._spilled.pop(id, None)
+        if path is not None:
+            path.unlink(missing_ok=True)
@@ -0,0 +1,209 @@
+from enum import Enum
+from typing import Any, Dict, List, Literal, Optional, Sequence, Set, Tuple, Union
+
+from pydantic import BaseModel as PydanticBaseModel
+from pydantic import StrictBool, StrictFloat, StrictInt, StrictStr, validator
+
+from flowfm_inspector.basemodel import BaseModel
+
+
+# The names of the submodels of an FMModel, which are the names of their fields.
+# The name of the schema of the external forcing is accepted as well.
+SubmodelName = Literal[
+    "general",
+    "geometry",
+    "volumetables",
+    "numerics",
+    "physics",
+    "sediment",
+    "wind",
+    "waves",
+    "time",
+    "restart",
+    "external_forcing",
+    "externalforcing",
+    "hydrology",
+    "trachytopes",
+    "output",
+]
+
+_SUBMODEL_FIELDS: Dict[str, str] = {"externalforcing": "external_forcing"}
+
+
+def to_submodel_field(submodel: str) -> str:
+    """Get the name of the FMModel field of the specified submodel.
+
+    Args:
+        submodel (str): The name of the submodel, or of its schema.
+
+    Returns:
+        str: The name of the field containing the submodel.
+    """
+    return _SUBMODEL_FIELDS.get(submodel, submodel)
+
+
+class DataSpecification(str, Enum):
+    comments = "comments"
+    values = "values"
+
+
+class ValueType(str, Enum):
+    number = "number"
+    enum = "enum"
+    boolean = "boolean"
+    path = "path"
+    string = "string"
+
+
+class FilePathModel(BaseModel):
+    filepath: str
+
+
+# pydantic uses the first type of the union a value can be converted to, as
+# such strict types are used to prevent for example 0.5 becoming 0 or True
+# becoming 1. Lists mixing integers and floats are converted to floats.
+FieldValue = Union[
+    StrictInt,
+    StrictFloat,
+    StrictBool,
+    StrictStr,
+    List[StrictInt],
+    List[StrictBool],
+    List[float],
+    List[StrictStr],
+    FilePathModel,
+    None,
+]
+
+
+class FieldUpdate(BaseModel):
+    """FieldUpdate describes a change of a single value or comment of a submodel.
+
+    Properties:
+        submodel (SubmodelName):
+            The name of the submodel containing the field, which is converted to
+            the name of the FMModel field of the submodel.
+        field (str): The name of the field to update.
+        type (DataSpecification): Whether to update the value or the comment.
+        value (FieldValue): The new value or comment of the field.
+        valuetype (Optional[ValueType]): The type of the value, only used for values.
+    """
+
+    submodel: SubmodelName
+    field: str
+    type: DataSpecification = DataSpecification.values
+    value: FieldValue
+    valuetype: Optional[ValueType] = None
+
+    @validator("submodel")
+    def _to_submodel_field(cls, submodel: str) -> str:
+        return to_submodel_field(submodel)
+
+
+class FieldUpdateResult(BaseModel):
+    """FieldUpdateResult describes the outcome of a single FieldUpdate.
+
+    Properties:
+        index (int): The index of the update within the batch.
+        ok (bool): Whether the update is valid.
+        error (Optional[str]): The reason the update is invalid, if any.
+    """
+
+    index: int
+    ok: bool
+    error: Optional[str] = None
+
+
+def _resolve_target(
+    model: PydanticBaseModel, update: FieldUpdate
+) -> Tuple[PydanticBaseModel, str, Any]:
+    submodel_ = getattr(model, update.submodel)
+
+    if update.type == DataSpecification.comments:
+        return submodel_.comments, update.field, update.value
+    elif update.valuetype == ValueType.path:
+        return getattr(submodel_, update.field), "filepath", update.value.filepath
+    else:
+        return submodel_, update.field, update.value
+
+
+def apply_update(model: PydanticBaseModel, update: FieldUpdate) -> None:
+    """Apply the provided update to the model.
+
+    Args:
+        model (PydanticBaseModel): The model to update.
+        update (FieldUpdate): The update to apply.
+
+    Raises:
+        AttributeError: When the submodel or field does not exist.
+        ValueError: When the value is not valid for the field.
+    """
+    target, attribute, value = _resolve_target(model, update)
+    setattr(target, attribute, value)
+
+
+class _Snapshot:
+    """Snapshot of the fields of a (sub)model, used to roll back assignments.
+
+    Note that pydantic replaces the __dict__ of a model upon a validated
+    assignment, as such a shallow copy is sufficient to restore the state.
+    """
+
+    def __init__(self, target: PydanticBaseModel) -> None:
+        self._target = target
+        self._values: Dict[str, Any] = dict(target.__dict__)
+        self._fields_set: Set[str] = set(target.__fields_set__)
+
+    def restore(self) -> None:
+        object.__setattr__(self._target, "__dict__", self._values)
+        object.__setattr__(self._target, "__fields_set__", self._fields_set)
+
+
+def apply_updates(
+    model: PydanticBaseModel, updates: Sequence[FieldUpdate]
+) -> List[FieldUpdateResult]:
+    """Apply all provided updates to the model, or none of them.
+
+    Every update is validated, even if a previous update turned out to be
+    invalid, such that all problems are reported at once. If any update is
+    invalid, the model is restored to its original state.
+
+    Args:
+        model (PydanticBaseModel): The model to update.
+        updates (Sequence[FieldUpdate]): The updates to apply in order.
+
+    Returns:
+        List[FieldUpdateResult]: The result of each update.
+    """
+    snapshots: List[_Snapshot] = []
+    results: List[FieldUpdateResult] = []
+
+    for index, update in enumerate(updates):
+        try:
+            target, attribute, value = _resolve_target(model, update)
+            snapshot = _Snapshot(target)
+            setattr(target, attribute, value)
+            snapshots.append(snapshot)
+            results.append(FieldUpdateResult(index=index, ok=True))
+        except (AttributeError, TypeError, ValueError) as e:
+            results.append(FieldUpdateResult(index=index, ok=False, error=str(e)))
+
+    if not all(result.ok for result in results):
+        for snapshot in reversed(snapshots):
+            snapshot.restore()
+
+    return results
+
+
+def read_value(model: PydanticBaseModel, update: FieldUpdate) -> Any:
+    """Read the current value of the field targeted by the provided update.
+
+    Args:
+        model (PydanticBaseModel): The model containing the field.
+        update (FieldUpdate): The update targeting the field.
+
+    Returns:
+        Any: The current value or comment of the field.
+    """
+    target, attribute, _ = _resolve_target(model, update)
+    return getattr(target, attribute, None)
@@ -0,0 +1,320 @@
+import threading
+from enum import Enum
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+)
+
+from hydrolib.core.basemodel import FileModel
+from pydantic.types import UUID4
+
+from flowfm_inspector.basemodel import BaseModel
+from flowfm_inspector.internal.dependencies import collect_references
+
+
+class Severity(str, Enum):
+    error = "error"
+    warning = "warning"
+
+
+class ValidationIssue(BaseModel):
+    """ValidationIssue describes a single problem found by a validation rule.
+
+    Properties:
+        rule (str): The name of the rule which found the problem.
+        severity (Severity): The severity of the problem.
+        message (str): The description of the problem.
+        fields (List[str]): The fields involved, formatted as "submodel.field".
+    """
+
+    rule: str
+    severity: Severity
+    message: str
+    fields: List[str]
+
+
+class ValidationReport(BaseModel):
+    """ValidationReport describes the validation state of a model.
+
+    Properties:
+        version (int): The version of the model which was validated.
+        valid (bool): Whether no errors were found, warnings are allowed.
+        issues (List[ValidationIssue]): The problems found.
+        evaluated (List[str]):
+            The rules evaluated for this version, the results of other rules were
+            reused from the previous version.
+    """
+
+    version: int
+    valid: bool
+    issues: List[ValidationIssue] = []
+    evaluated: List[str] = []
+
+
+class ValidationRule(NamedTuple):
+    """ValidationRule describes a single check of a model.
+
+    Properties:
+        name (str): The unique name of the rule.
+        severity (Severity): The severity of the problems found by this rule.
+        fields (FrozenSet[str]):
+            The fields the rule depends on, formatted as "submodel.field", or as
+            "submodel.*" to depend on every field of a submodel.
+        check (Callable[[FileModel], Iterable[str]]):
+            The check, yielding a message per problem found.
+    """
+
+    name: str
+    severity: Severity
+    fields: FrozenSet[str]
+    check: Callable[[FileModel], Iterable[str]]
+
+
+RULES: List[ValidationRule] = []
+
+
+def rule(name: str, *fields: str, severity: Severity = Severity.error):
+    """Register the decorated function as a validation rule.
+
+    Args:
+        name (str): The unique name of the rule.
+        *fields (str): The fields the rule depends on.
+        severity (Severity, optional): The severity. Defaults to Severity.error.
+    """
+
+    def decorator(check: Callable[[FileModel], Iterable[str]]):
+        RULES.append(ValidationRule(name, severity, frozenset(fields), check))
+        return check
+
+    return decorator
+
+
+@rule("stop_after_start", "time.tstart", "time.tstop")
+def _check_simulation_period(model: FileModel) -> Iterator[str]:
+    if model.time.tstop <= model.time.tstart:
+        yield "The stop time needs to be after the start time."
+
+
+@rule("positive_timesteps", "time.dtuser", "time.dtmax", "time.dtinit")
+def _check_positive_timesteps(model: FileModel) -> Iterator[str]:
+    for name in ("dtuser", "dtmax", "dtinit"):
+        if getattr(model.time, name) <= 0.0:
+            yield f"The time step {name} needs to be positive."
+
+
+@rule(
+    "consistent_timesteps",
+    "time.dtuser",
+    "time.dtmax",
+    "time.dtinit",
+    severity=Severity.warning,
+)
+def _check_consistent_timesteps(model: FileModel) -> Iterator[str]:
+    time = model.time
+    if time.dtmax > time.dtuser:
+        yield "The maximum time step is larger than the user time step."
+    if time.dtinit > time.dtmax:
+        yield "The initial time step is larger than the maximum time step."
+
+
+@rule(
+    "output_intervals_within_period",
+    "time.tstart",
+    "time.tstop",
+    "output.hisinterval",
+    "output.mapinterval",
+    "output.rstinterval",
+    severity=Severity.warning,
+)
+def _check_output_intervals(model: FileModel) -> Iterator[str]:
+    period = model.time.tstop - model.time.tstart
+    for name in ("hisinterval", "mapinterval", "rstinterval"):
+        interval = getattr(model.output, name, None)
+        if interval and interval[0] > period > 0.0:
+            yield f"The {name} exceeds the simulation period, no output is written."
+
+
+@rule("positive_courant_number", "numerics.cflmax")
+def _check_courant_number(model: FileModel) -> Iterator[str]:
+    if model.numerics.cflmax <= 0.0:
+        yield "The maximum Courant number needs to be positive."
+
+
+@rule("net_file_referenced", "geometry.netfile")
+def _check_net_file_referenced(model: FileModel) -> Iterator[str]:
+    netfile = model.geometry.netfile
+    if netfile is None or netfile.filepath is None:
+        yield "No net file is referenced."
+
+
+def _missing_files(model: FileModel, *prefixes: str) -> Iterator[str]:
+    for reference in collect_references(model):
+        if reference.field.startswith(prefixes) and not reference.target.exists():
+            yield (
+                f"The file {reference.target} referenced by {reference.field} "
+                "does not exist."
+            )
+
+
+@rule("geometry_files_exist", "geometry.*")
+def _check_geometry_files(model: FileModel) -> Iterator[str]:
+    return _missing_files(model, "geometry.")
+
+
+@rule(
+    "forcing_files_exist",
+    "external_forcing.extforcefile",
+    "external_forcing.extforcefilenew",
+)
+def _check_forcing_files(model: FileModel) -> Iterator[str]:
+    return _missing_files(model, "external_forcing.")
+
+
+@rule("restart_file_exists", "restart.restartfile")
+def _check_restart_file(model: FileModel) -> Iterator[str]:
+    return _missing_files(model, "restart.")
+
+
+@rule(
+    "observation_files_exist",
+    "output.obsfile",
+    "output.crsfile",
+    severity=Severity.warning,
+)
+def _check_observation_files(model: FileModel) -> Iterator[str]:
+    return _missing_files(model, "output.obsfile", "output.crsfile")
+
+
+class _ValidationState(NamedTuple):
+    version: int
+    issues: Dict[str, List[ValidationIssue]]
+
+
+class ValidationEngine:
+    """The ValidationEngine validates models incrementally.
+
+    The first validation of a model evaluates every rule. Later validations
+    only evaluate the rules depending on the fields changed since the previously
+    validated version, and reuse the results of the other rules. The report of
+    the latest validated version of each model is cached.
+
+    Rules checking referenced files can be outdated when files change without
+    the model changing, a full validation evaluates every rule again.
+    """
+
+    def __init__(self, rules: Optional[List[ValidationRule]] = None) -> None:
+        """Create a new ValidationEngine.
+
+        Args:
+            rules (Optional[List[ValidationRule]], optional):
+                The rules to evaluate, if None all registered rules.
+                Defaults to None.
+        """
+        self._rules = list(RULES if rules is None else rules)
+        self._rules_by_field: Dict[str, List[ValidationRule]] = {}
+        for rule_ in self._rules:
+            for field in rule_.fields:
+                self._rules_by_field.setdefault(field, []).append(rule_)
+
+        self._lock = threading.Lock()
+        self._states: Dict[UUID4, _ValidationState] = {}
+
+    def get_version(self, id: UUID4) -> Optional[int]:
+        """Get the latest validated version of the specified model, if any."""
+        with self._lock:
+            state = self._states.get(id)
+        return state.version if state is not None else None
+
+    def get_affected_rules(self, fields: Iterable[str]) -> List[ValidationRule]:
+        """Get the rules depending on any of the provided "submodel.field" fields."""
+        affected: Set[str] = set()
+        for field in fields:
+            submodel = field.split(".", 1)[0]
+            for key in (field, f"{submodel}.*"):
+                affected.update(r.name for r in self._rules_by_field.get(key, ()))
+
+        return [r for r in self._rules if r.name in affected]
+
+    def validate(
+        self,
+        id: UUID4,
+        model: FileModel,
+        version: int,
+        changed_fields: Optional[Iterable[str]] = None,
+    ) -> ValidationReport:
+        """Validate the specified model.
+
+        Args:
+            id (UUID4): The id of the model.
+            model (FileModel): The model to validate.
+            version (int): The version of the model.
+            changed_fields (Optional[Iterable[str]], optional):
+                The fields changed since the latest validated version, if None
+                every rule is evaluated. Defaults to None.
+
+        Returns:
+            ValidationReport: The validation state of the model.
+        """
+        with self._lock:
+            state = self._states.get(id)
+
+        if (
+            state is not None
+            and state.version == version
+            and changed_fields is not None
+        ):
+            return self._to_report(state, [])
+
+        if state is None or changed_fields is None:
+            rules = self._rules
+            issues: Dict[str, List[ValidationIssue]] = {}
+        else:
+            rules = self.get_affected_rules(changed_fields)
+            issues = dict(state.issues)
+
+        for rule_ in rules:
+            issues[rule_.name] = self._evaluate(rule_, model)
+
+        state = _ValidationState(version, issues)
+        with self._lock:
+            current = self._states.get(id)
+            if current is None or current.version <= version:
+                self._states[id] = state
+
+        return self._to_report(state, [r.name for r in rules])
+
+    @staticmethod
+    def _evaluate(rule_: ValidationRule, model: FileModel) -> List[ValidationIssue]:
+        fields = sorted(rule_.fields)
+        try:
+            messages = list(rule_.check(model))
+        except Exception as e:
+            messages = [f"The rule could not be evaluated: {e}"]
+
+        return [
+            ValidationIssue(
+                rule=rule_.name, severity=rule_.severity, message=m, fields=fields
+            )
+            for m in messages
+        ]
+
+    @staticmethod
+    def _to_report(state: _ValidationState, evaluated: List[str]) -> ValidationReport:
+        issues = [issue for issues in state.issues.values() for issue in issues]
+        return ValidationReport(
+            version=state.version,
+            valid=all(issue.severity != Severity.error for issue in issues),
+            issues=issues,
+            evaluated=evaluated,
+        )
+
+    def discard(self, id: UUID4) -> None:
+        with self._lock:
+            self._states.pop(id, None)
@@ -0,0 +1,483 @@
+import logging
+import re
+import threading
+import time
+from enum import Enum
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from hydrolib.core.basemodel import FileModel, file_load_context
+from hydrolib.core.io.net.models import NetworkModel
+from pydantic import BaseModel as PydanticBaseModel
+from pydantic.types import UUID4
+
+from flowfm_inspector.internal.dependencies import collect_file_models
+from flowfm_inspector.internal.saving import ROOT_FILE
+from flowfm_inspector.internal.updates import DataSpecification
+
+try:
+    from watchdog.events import FileSystemEvent, FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+
+logger = logging.getLogger(__name__)
+
+
+class WatcherBackend(str, Enum):
+    native = "native"
+    polling = "polling"
+
+
+# The identifying state of a file, its modification time and size, or None if the
+# file does not exist.
+_FileKey = Optional[Tuple[int, int]]
+
+
+def _get_file_key(path: Path) -> _FileKey:
+    try:
+        result = path.stat()
+    except OSError:
+        return None
+    return (result.st_mtime_ns, result.st_size)
+
+
+if Observer is not None:
+
+    class _EventHandler(FileSystemEventHandler):
+        def __init__(self, mark: Callable[[Path], None]) -> None:
+            self._mark = mark
+
+        def on_any_event(self, event: FileSystemEvent) -> None:
+            for path in (event.src_path, getattr(event, "dest_path", None)):
+                if path:
+                    self._mark(Path(path))
+
+
+class FileWatcher:
+    """The FileWatcher notices changes to the files of the loaded models.
+
+    Changes are detected through the native file system notifications if
+    watchdog is installed, and by periodically polling the modification time and
+    size of the watched files otherwise. Either way, a change is only reported
+    once the file has not changed for the debounce period, such that a burst of
+    writes results in a single report, and only if the modification time or size
+    of the file differs from its last known state.
+    """
+
+    def __init__(
+        self,
+        debounce: float = 0.5,
+        poll_interval: float = 1.0,
+        native: bool = True,
+    ) -> None:
+        """Create a new FileWatcher.
+
+        Args:
+            debounce (float, optional):
+                The time in seconds a file needs to be unchanged before its change
+                is reported. Defaults to 0.5.
+            poll_interval (float, optional):
+                The time in seconds between polls, if polling. Defaults to 1.0.
+            native (bool, optional):
+                Whether to use the native file system notifications if available.
+                Defaults to True.
+        """
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.backend = (
+            WatcherBackend.native
+            if native and Observer is not None
+            else WatcherBackend.polling
+        )
+
+        self._lock = threading.Lock()
+        self._owners: Dict[Path, Set[UUID4]] = {}
+        self._paths: Dict[UUID4, Set[Path]] = {}
+        self._states: Dict[Path, _FileKey] = {}
+        self._observed: Dict[Path, _FileKey] = {}
+        self._pending: Dict[Path, float] = {}
+
+        self._on_change: Optional[Callable[[UUID4, Set[Path]], None]] = None
+        self._observer: Any = None
+        self._watches: Dict[Path, Any] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, on_change: Callable[[UUID4, Set[Path]], None]) -> None:
+        """Start watching the files in the background.
+
+        Args:
+            on_change (Callable[[UUID4, Set[Path]], None]):
+                The callback receiving the id of a model and its changed files,
+                called from the thread of the watcher.
+        """
+        if self._thread is not None:
+            return
+
+        self._on_change = on_change
+        self._stopped.clear()
+
+        if self.backend == WatcherBackend.native:
+            self._observer = Observer()
+            self._observer.start()
+            with self._lock:
+                self._update_watches()
+
+        self._thread = threading.Thread(
+            target=self._run, name="filewatcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching the files, pending changes are not reported."""
+        if self._thread is None:
+            return
+
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+            self._watches.clear()
+
+    def watch(self, id: UUID4, paths: Iterable[Path]) -> None:
+        """Watch the specified files of a model, replacing its previously watched
+        files.
+
+        The current state of files which were not watched yet is recorded, against
+        which later changes are detected.
+
+        Args:
+            id (UUID4): The id of the model.
+            paths (Iterable[Path]): The absolute paths of the files of the model.
+        """
+        paths = set(paths)
+        new_paths = [p for p in paths if p not in self._states]
+        keys = {path: _get_file_key(path) for path in new_paths}
+
+        with self._lock:
+            previous = self._paths.get(id, set())
+            self._paths[id] = paths
+
+            for path in paths - previous:
+                self._owners.setdefault(path, set()).add(id)
+                self._states.setdefault(path, keys.get(path))
+            for path in previous - paths:
+                self._remove_owner(path, id)
+
+            self._update_watches()
+
+    def unwatch(self, id: UUID4) -> None:
+        """Stop watching the files of the specified model."""
+        with self._lock:
+            for path in self._paths.pop(id, set()):
+                self._remove_owner(path, id)
+            self._update_watches()
+
+    def _remove_owner(self, path: Path, id: UUID4) -> None:
+        owners = self._owners.get(path, set())
+        owners.discard(id)
+
+        if not owners:
+            self._owners.pop(path, None)
+            self._states.pop(path, None)
+            self._observed.pop(path, None)
+            self._pending.pop(path, None)
+
+    def acknowledge(self, paths: Iterable[Path]) -> None:
+        """Record the current state of the specified files as known, such that
+        changes made by the inspector itself, e.g. by saving, are not reported.
+        """
+        keys = {path: _get_file_key(path) for path in paths}
+
+        with self._lock:
+            for path, key in keys.items():
+                if path in self._states:
+                    self._states[path] = key
+                    self._observed.pop(path, None)
+                    self._pending.pop(path, None)
+
+    def _mark(self, path: Path) -> None:
+        with self._lock:
+            if path in self._owners:
+                self._pending[path] = time.monotonic()
+
+    def scan(self) -> None:
+        """Poll the state of all watched files once."""
+        with self._lock:
+            paths = list(self._states)
+
+        keys = {path: _get_file_key(path) for path in paths}
+        now = time.monotonic()
+
+        with self._lock:
+            for path, key in keys.items():
+                if path not in self._states or key == self._states[path]:
+                    continue
+
+                # Only a further change restarts the debounce period.
+                if path not in self._observed or self._observed[path] != key:
+                    self._observed[path] = key
+                    self._pending[path] = now
+
+    def flush(self, now: Optional[float] = None) -> Dict[UUID4, Set[Path]]:
+        """Collect the changed files which have not changed for the debounce
+        period.
+
+        Args:
+            now (Optional[float], optional):
+                The current time.monotonic(), if None it is retrieved.
+                Defaults to None.
+
+        Returns:
+            Dict[UUID4, Set[Path]]: The changed files per model.
+        """
+        if now is None:
+            now = time.monotonic()
+
+        with self._lock:
+            settled = [
+                path
+                for path, marked in self._pending.items()
+                if now - marked >= self.debounce
+            ]
+            for path in settled:
+                del self._pending[path]
+
+        keys = {path: _get_file_key(path) for path in settled}
+        changes: Dict[UUID4, Set[Path]] = {}
+
+        with self._lock:
+            for path, key in keys.items():
+                self._observed.pop(path, None)
+                if path not in self._states or self._states[path] == key:
+                    continue
+
+                self._states[path] = key
+                for id in self._owners.get(path, ()):
+                    changes.setdefault(id, set()).add(path)
+
+        return changes
+
+    def _update_watches(self) -> None:
+        if self._observer is None:
+            return
+
+        directories = {path.parent for path in self._owners}
+        for directory in set(self._watches) - directories:
+            self._observer.unschedule(self._watches.pop(directory))
+        for directory in directories - set(self._watches):
+            if directory.is_dir():
+                self._watches[directory] = self._observer.schedule(
+                    _EventHandler(self._mark), str(directory), recursive=False
+                )
+
+    def _run(self) -> None:
+        tick = min(self.poll_interval, self.debounce) or 0.01
+        last_scan = 0.0
+
+        while not self._stopped.wait(tick):
+            now = time.monotonic()
+            if self._observer is None and now - last_scan >= self.poll_interval:
+                self.scan()
+                last_scan = now
+
+            for id, paths in self.flush().items():
+                try:
+                    self._on_change(id, paths)  # type: ignore[misc]
+                except Exception:
+                    logger.exception(f"Failed to handle the changed files of {id}.")
+
+
+class ReloadedFile(NamedTuple):
+    """ReloadedFile describes a single file model parsed again after its file
+    changed.
+
+    Properties:
+        field (str): The field referencing the file, or ROOT_FILE.
+        path (Path): The absolute path of the file.
+        model (FileModel): The parsed file model.
+        changes (List[Tuple[str, str, DataSpecification]]):
+            The changed submodel fields, values and comments.
+    """
+
+    field: str
+    path: Path
+    model: FileModel
+    changes: List[Tuple[str, str, DataSpecification]]
+
+
+_FIELD_PART = re.compile(r"([^.\[\]]+)(?:\[(\d+)\])?")
+
+
+def _split_field(field: str) -> List[Tuple[str, Optional[int]]]:
+    return [
+        (name, int(index) if index else None)
+        for name, index in _FIELD_PART.findall(field)
+    ]
+
+
+def _set_field(model: PydanticBaseModel, field: str, value: FileModel) -> None:
+    *parents, (name, index) = _split_field(field)
+
+    owner: Any = model
+    for parent_name, parent_index in parents:
+        owner = getattr(owner, parent_name)
+        if parent_index is not None:
+            owner = owner[parent_index]
+
+    # The value is assigned without validation, as pydantic would assign a copy.
+    if index is not None:
+        getattr(owner, name)[index] = value
+    else:
+        owner.__dict__[name] = value
+
+
+def _find_parent(field: str, fields: Iterable[str]) -> str:
+    candidates = [f for f in fields if f == ROOT_FILE or field.startswith(f"{f}.")]
+    return max(candidates, key=len)
+
+
+def compare_submodels(
+    a: PydanticBaseModel, b: PydanticBaseModel
+) -> List[Tuple[str, str, DataSpecification]]:
+    """Compare the values and comments of the submodels of two models.
+
+    Args:
+        a (PydanticBaseModel): The first model.
+        b (PydanticBaseModel): The second model.
+
+    Returns:
+        List[Tuple[str, str, DataSpecification]]:
+            The submodel, field and specification of every field which differs.
+    """
+    changes = []
+    for name in a.__fields__:
+        submodel_a = getattr(a, name, None)
+        submodel_b = getattr(b, name, None)
+        if not isinstance(submodel_a, PydanticBaseModel) or not isinstance(
+            submodel_b, PydanticBaseModel
+        ):
+            continue
+
+        comments_a = getattr(submodel_a, "comments", None)
+        comments_b = getattr(submodel_b, "comments", None)
+
+        for field in submodel_a.__fields__:
+            if field == "comments":
+                continue
+            if getattr(submodel_a, field, None) != getattr(submodel_b, field, None):
+                changes.append((name, field, DataSpecification.values))
+            if getattr(comments_a, field, None) != getattr(comments_b, field, None):
+                changes.append((name, field, DataSpecification.comments))
+
+    return changes
+
+
+def load_changed_files(
+    model: FileModel, paths: Set[Path], skip: Iterable[str] = ()
+) -> List[ReloadedFile]:
+    """Parse the file models of the provided model tree of which the file
+    changed again, without modifying the model.
+
+    If the root model file changed, the whole model is parsed again. Otherwise
+    only the changed files are parsed, without the files referencing them. A
+    changed file of which an ancestor changed as well is parsed as part of the
+    ancestor. The net file is never parsed, as its network is not loaded by the
+    inspector.
+
+    Args:
+        model (FileModel): The root model.
+        paths (Set[Path]): The absolute paths of the changed files.
+        skip (Iterable[str], optional):
+            The fields of the files which should not be parsed again, e.g.
+            because they contain unsaved changes. Defaults to ().
+
+    Returns:
+        List[ReloadedFile]: The parsed file models, parents before children.
+    """
+    skip = set(skip)
+    file_models = collect_file_models(model)
+    root_path = model.save_location
+
+    if root_path in paths:
+        if ROOT_FILE in skip:
+            return []
+
+        reloaded = type(model)(root_path)
+        reloaded.filepath = model.filepath
+        return [
+            ReloadedFile(
+                ROOT_FILE, root_path, reloaded, compare_submodels(model, reloaded)
+            )
+        ]
+
+    models = {field: (file_model, path) for field, file_model, path in file_models}
+    result: List[ReloadedFile] = []
+
+    for field, file_model, path in file_models:
+        if (
+            path not in paths
+            or field in skip
+            or isinstance(file_model, NetworkModel)
+            or any(field.startswith(f"{r.field}.") for r in result)
+        ):
+            continue
+
+        parent, parent_path = models[_find_parent(field, models)]
+
+        # Reproduce the context in which hydrolib resolved the path originally.
+        with file_load_context() as context:
+            context.push_new_parent(root_path.parent, model._relative_mode)
+            if parent is not model:
+                context.push_new_parent(parent_path.parent, parent._relative_mode)
+            reloaded = type(file_model)(file_model.filepath)
+
+        reloaded._absolute_anchor_path = file_model._absolute_anchor_path
+
+        (submodel, _), (name, _) = _split_field(field)[:2]
+        result.append(
+            ReloadedFile(
+                field, path, reloaded, [(submodel, name, DataSpecification.values)]
+            )
+        )
+
+    return result
+
+
+def apply_reloaded_files(model: FileModel, reloaded: List[ReloadedFile]) -> FileModel:
+    """Swap the reloaded file models into the provided model tree.
+
+    Args:
+        model (FileModel): The root model.
+        reloaded (List[ReloadedFile]): The reloaded file models.
+
+    Returns:
+        FileModel: The root model, which is the reloaded root model if it changed.
+    """
+    for file in reloaded:
+        if file.field == ROOT_FILE:
+            model = file.model
+        else:
+            _set_field(model, file.field, file.model)
+
+    return model
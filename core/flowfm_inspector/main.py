@@ -1,258 +1,171 @@
-from enum import Enum
-from pathlib import Path
-from typing import Dict, List, Literal, Type, Union
-from uuid import uuid4
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from hydrolib.core.basemodel import FileModel
-from hydrolib.core.io.mdu.models import (
-    ExternalForcing,
-    FMModel,
-    General,
-    Geometry,
-    Hydrology,
-    Numerics,
-    Output,
-    Physics,
-    Restart,
-    Sediment,
-    Time,
-    Trachytopes,
-    VolumeTables,
-    Waves,
-)
-from hydrolib.core.io.net.models import NetworkModel
-from pydantic.types import UUID4
+import time
 
-from flowfm_inspector.basemodel import BaseModel
+started = time.perf_counter()
 
-import flowfm_inspector.state
-from flowfm_inspector.routers import appdata
+import importlib
+import multiprocessing
+import sys
+from pathlib import Path
+from typing import Optional
 
-import uvicorn
 import typer
+import uvicorn
 
+from flowfm_inspector.internal.startup import DeferredApp, StartupProfile
 
-# The network is currently problematic and we do not want to load it.
-NetworkModel.__fields__.pop("network", None)
-
-app = FastAPI()
-
-app.include_router(appdata.router)
-
-# origins = ["http://localhost:8002", "localhost:8002"]
-origins = ["*"]
-
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-
-mdu_models = [
-    General,
-    Geometry,
-    VolumeTables,
-    Numerics,
-    Physics,
-    Sediment,
-    Waves,
-    Time,
-    Restart,
-    ExternalForcing,
-    Hydrology,
-    Trachytopes,
-    Output,
-]
-
-
-schema_mapping: Dict[str, Dict[str, Type]] = {
-    "mdu": {m.__name__.lower(): m for m in mdu_models}
-}
-
-
-initial_uuid = uuid4()
-initial_model = FMModel()
-initial_model.general.fileversion = "1.12"
-initial_model.general.comments.fileversion = "A test value"
-initial_model.geometry.netfile.filepath = Path("test.nc")
-
-model_mapping: Dict[UUID4, FileModel] = {initial_uuid: initial_model}
-
-# Note that this has currently been set up for MDU files.
-def get_sanitized_schema(model_type: Type) -> Dict:
-    schema = dict(model_type.schema())
-
-    # No need to send unnecessary data
-    schema.pop("description", None)
-    schema.pop("definitions", None)
-
-    if "properties" in schema:
-        schema["properties"].pop("comments", None)
-
-        # we assume that every ref is a reference to another file
-        # and as such replace it with a filepath.
-        update_model_properties(schema["properties"])
-
-    return schema
-
-
-def update_model_properties(properties: dict) -> None:
-    for (key, value) in properties.items():
-        if "$ref" in value:
-            properties[key] = {
-                "title": key.capitalize(),
-                "type": "string",
-                "format": "path",
-            }
-
-        elif value["type"] == "array":
-            if (
-                "$ref" in value["items"] or "anyOf" in value["items"]
-            ):  # "anyOf" only occurs for dryPointsFile in mdu.
-                value["items"] = {
-                    "type": "string",
-                    "format": "path",
-                }
-
-
-def to_model(model_category: str, model_name: str) -> Type:
-    return schema_mapping[model_category][model_name]
-
-
-@app.get("/api/schema/{model_category}/{model_name}")
-async def request_schema(model_category, model_name):
-    return get_sanitized_schema(to_model(model_category, model_name))
-
-
-@app.get("/api/models")
-async def request_model_keys():
-    return {"models": list(model_mapping.keys())}
-
-
-@app.get("/api/models/{id}")
-async def request_specific_model(id: UUID4):
-    # TODO: make this more generic with a separate function
-    data = model_mapping[id].dict(
-        by_alias=True, exclude_defaults=False, exclude_none=False, exclude_unset=False
-    )
-
-    return data
-
-
-SubmodelName = Literal[
-    "general",
-    "geometry",
-    "volumetables",
-    "numerics",
-    "physics",
-    "sediment",
-    "waves",
-    "time",
-    "restart",
-    "externalforcing",
-    "hydrology",
-    "trachytopes",
-    "output",
-]
-
-
-class DataSpecification(str, Enum):
-    comments = "comments"
-    values = "values"
-
-
-@app.get("/api/models/{id}/{data_type}")
-async def get_model_field(
-    id: UUID4, data_type: DataSpecification, submodel: SubmodelName, field: str
-):
-    model = model_mapping[id]
-    submodel_ = getattr(model, submodel)
-
-    value = None
-
-    if data_type == DataSpecification.comments:
-        value = getattr(submodel_.comments, field)
-    elif data_type == DataSpecification.values:
-        value = getattr(submodel_, field)
-
-    return {
-        "id": id,
-        "subModel": submodel,
-        "field": field,
-        "type": str(data_type),
-        "value": value,
-    }
-
-
-class ValueType(str, Enum):
-    number = "number"
-    enum = "enum"
-    boolean = "boolean"
-    path = "path"
-    string = "string"
-
-
-class FilePathModel(BaseModel):
-    filepath: str
-
-
-class SetFieldValueBody(BaseModel):
-    value: Union[
-        int,
-        float,
-        bool,
-        str,
-        List[int],
-        List[float],
-        List[bool],
-        List[str],
-        FilePathModel,
-        None,
-    ]
-    valuetype: ValueType
-
-
-class SetFieldCommentBody(BaseModel):
-    value: str
-
+# The server and its dependencies are imported once the port is bound, such
+# that the user interface can connect and report progress as early as possible.
 
-@app.put("/api/models/{id}/comments", status_code=204)
-async def set_model_field_comment(
-    id: UUID4, submodel: SubmodelName, field: str, body: SetFieldCommentBody
-):
-    model = model_mapping[id]
-    submodel_ = getattr(model, submodel)
 
-    setattr(submodel_.comments, field, body.value)
+def load_server(profile: StartupProfile, settings: dict):
+    """Import and configure the server.
 
+    Args:
+        profile (StartupProfile): The profile recording the startup phases.
+        settings (dict): The keyword arguments of flowfm_inspector.server.configure.
 
-@app.put("/api/models/{id}/values", status_code=204)
-async def set_model_field_value(
-    id: UUID4, submodel: SubmodelName, field: str, body: SetFieldValueBody
-):
-    model = model_mapping[id]
-    submodel_ = getattr(model, submodel)
+    Returns:
+        FastAPI: The server application.
+    """
+    with profile.phase("import fastapi"):
+        importlib.import_module("fastapi")
+    with profile.phase("import hydrolib"):
+        importlib.import_module("hydrolib.core.io.mdu.models")
+    with profile.phase("import server"):
+        import flowfm_inspector.server as server
+    with profile.phase("configure server"):
+        server.configure(**settings)
 
-    if body.valuetype == ValueType.path:
-        subsubmodel = getattr(submodel_, field)
-        setattr(subsubmodel, "filepath", body.value.filepath)
-    else:
-        setattr(submodel_, field, body.value)
+    return server.app
 
 
 def main(
-    port: int = typer.Argument(..., help="The port to run the backend server on.")
+    port: int = typer.Argument(..., help="The port to run the backend server on."),
+    workers: Optional[int] = typer.Option(
+        None,
+        min=1,
+        help=(
+            "The number of workers used for serialization and disk access. "
+            "Defaults to the number of processors, at most 4."
+        ),
+    ),
+    load_workers: Optional[int] = typer.Option(
+        None,
+        min=1,
+        help="The number of workers used to load models from disk. Defaults to 2.",
+    ),
+    load: Optional[str] = typer.Option(
+        None,
+        help="A directory or glob pattern of MDU files to load in parallel on startup.",
+    ),
+    load_processes: int = typer.Option(
+        2,
+        min=1,
+        help="The number of processes used to load batches of models.",
+    ),
+    max_batch_concurrency: int = typer.Option(
+        8,
+        min=1,
+        help="The maximum number of models of batches being loaded at the same time.",
+    ),
+    memory_budget: Optional[int] = typer.Option(
+        None,
+        min=1,
+        help=(
+            "The memory budget in MB of the loaded models, beyond which the least "
+            "recently used models are spilled to disk."
+        ),
+    ),
+    parse_cache_size: int = typer.Option(
+        512,
+        min=0,
+        help=(
+            "The maximum size in MB of the parsed files cached on disk, such that "
+            "unchanged files are not parsed again when reopened. 0 disables it."
+        ),
+    ),
+    prewarm: int = typer.Option(
+        0,
+        min=0,
+        help="The number of most recent projects to pre-load in the background.",
+    ),
+    prewarm_memory: int = typer.Option(
+        1024,
+        min=1,
+        help="The maximum memory in MB used by the pre-loaded projects.",
+    ),
+    watch: bool = typer.Option(
+        False,
+        help=(
+            "Watch the files of the loaded models, and reload the files changed by "
+            "other programs."
+        ),
+    ),
+    watch_debounce: float = typer.Option(
+        0.5,
+        min=0.0,
+        help="The time in seconds a changed file needs to be unchanged to be reloaded.",
+    ),
+    profiling: bool = typer.Option(
+        False,
+        help=(
+            "Profile the requests carrying the X-Profile header or matching the "
+            "profile pattern. The profiles are listed at /api/profiles."
+        ),
+    ),
+    profile_dir: Optional[Path] = typer.Option(
+        None,
+        file_okay=False,
+        help="The directory to write the profiles to. Defaults to the app data.",
+    ),
+    profile_pattern: Optional[str] = typer.Option(
+        None,
+        help="A glob pattern of request paths to always profile, e.g. '/api/models/*'.",
+    ),
+    profile_startup: bool = typer.Option(
+        False,
+        help=(
+            "Print the duration of each phase of the startup once the server is "
+            "ready, and include it in the health response."
+        ),
+    ),
 ):
     """
     Run the FlowFM-inspector backend server on the localhost:PORT.
     """
+    profile = StartupProfile(started)
+    profile.record("import cli", started)
+
+    settings = dict(
+        workers=workers,
+        load_workers=load_workers,
+        load=load,
+        load_processes=load_processes,
+        max_batch_concurrency=max_batch_concurrency,
+        memory_budget=memory_budget,
+        parse_cache_size=parse_cache_size,
+        prewarm=prewarm,
+        prewarm_memory=prewarm_memory,
+        watch=watch,
+        watch_debounce=watch_debounce,
+        profiling=profiling,
+        profile_dir=profile_dir,
+        profile_pattern=profile_pattern,
+    )
+
+    def print_report():
+        print(profile.report(), file=sys.stderr, flush=True)
+
+    app = DeferredApp(
+        lambda: load_server(profile, settings),
+        profile=profile if profile_startup else None,
+        on_ready=print_report if profile_startup else None,
+    )
     uvicorn.run(app, host="0.0.0.0", port=port, log_level="info")
 
 
 if __name__ == "__main__":
+    # The frozen executable is also started for the spawned processes parsing
+    # models, which need to run the process instead of the server.
+    multiprocessing.freeze_support()
     typer.run(main)
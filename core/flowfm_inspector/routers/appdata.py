@@ -1,6 +1,6 @@
 from fastapi import APIRouter, status
 from pathlib import Path
-from flowfm_inspector.state import appdata
+from flowfm_inspector.state import appdata, metrics, worker_pool
 from flowfm_inspector.basemodel import BaseModel
 
 
@@ -9,7 +9,8 @@ router = APIRouter(prefix="/api/appdata", tags=["appdata"])
 
 @router.get("/recent-projects", tags=["appdata"])
 async def retrieve_recent_projects():
-    return appdata.content.recent_projects.dict()
+    with metrics.span("serialization"):
+        return appdata.content.recent_projects.dict()
 
 
 class RecentProjectPutBody(BaseModel):
@@ -20,4 +21,4 @@ class RecentProjectPutBody(BaseModel):
     "/recent-projects", tags=["appdata"], status_code=status.HTTP_204_NO_CONTENT
 )
 async def update_recent_project(body: RecentProjectPutBody):
-    appdata.update_recent_project(body.path)
+    await worker_pool.run(appdata.update_recent_project, body.path)
@@ -0,0 +1,1120 @@
+import asyncio
+import contextlib
+import logging
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple, Type, TypeVar
+from uuid import uuid4
+from fastapi import (
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.encoders import jsonable_encoder
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from hydrolib.core.basemodel import FileModel
+from hydrolib.core.io.mdu.models import (
+    ExternalForcing,
+    FMModel,
+    General,
+    Geometry,
+    Hydrology,
+    Numerics,
+    Output,
+    Physics,
+    Restart,
+    Sediment,
+    Time,
+    Trachytopes,
+    VolumeTables,
+    Waves,
+    Wind,
+)
+from pydantic.types import UUID4
+
+from flowfm_inspector.basemodel import BaseModel
+
+import flowfm_inspector.state
+from flowfm_inspector.state import (
+    appdata_description,
+    load_pool,
+    metrics,
+    worker_pool,
+)
+from flowfm_inspector.internal.batch import (
+    BatchLoader,
+    ParseCache,
+    find_model_files,
+    install_parse_cache,
+)
+from flowfm_inspector.internal.changes import ChangeLogRegistry, ModelChanges
+from flowfm_inspector.internal.dependencies import (
+    DependencyGraph,
+    DependencyTracker,
+    collect_file_models,
+)
+from flowfm_inspector.internal.diff import ModelDiff, diff_models
+from flowfm_inspector.internal.diskcache import DiskParseCache
+from flowfm_inspector.internal.geometry import (
+    GeometryKind,
+    get_geometry_range,
+    read_geometry_chunk,
+)
+from flowfm_inspector.internal.loading import ModelLoader
+from flowfm_inspector.internal.metrics import CONTENT_TYPE, MetricsMiddleware
+from flowfm_inspector.internal.network import (
+    LazyNetwork,
+    NetworkMetadata,
+    NetworkRegistry,
+    disable_network_loading,
+    resolve_netfile_path,
+)
+from flowfm_inspector.internal.notifications import (
+    ChangeBroadcaster,
+    ChangeNotification,
+    ChangeSubscription,
+)
+from flowfm_inspector.internal.profiling import (
+    ProfileInfo,
+    ProfilingMiddleware,
+    RequestProfiler,
+)
+from flowfm_inspector.internal.prewarm import Prewarmer, select_recent_projects
+from flowfm_inspector.internal.saving import ModelSaver, SaveResult
+from flowfm_inspector.internal.schema import (
+    SchemaRegistry,
+    SerializedSchema,
+    serialize_json,
+)
+from flowfm_inspector.internal.serialization import (
+    ModelSerializationCache,
+    serialize_submodel,
+)
+from flowfm_inspector.internal.spatial import (
+    ElementsWithin,
+    MeshSpatialIndex,
+    NearestElement,
+    SpatialIndexRegistry,
+    SpatialKind,
+)
+from flowfm_inspector.internal.store import ModelStore
+from flowfm_inspector.internal.updates import (
+    DataSpecification,
+    FieldUpdate,
+    FieldValue,
+    SubmodelName,
+    ValueType,
+    apply_update,
+    apply_updates,
+    to_submodel_field,
+)
+from flowfm_inspector.internal.validation import ValidationEngine, ValidationReport
+from flowfm_inspector.internal.watcher import (
+    FileWatcher,
+    apply_reloaded_files,
+    load_changed_files,
+)
+from flowfm_inspector.routers import appdata
+
+
+disable_network_loading()
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+app = FastAPI()
+
+app.include_router(appdata.router)
+
+# origins = ["http://localhost:8002", "localhost:8002"]
+origins = ["*"]
+
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=origins,
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+app.add_middleware(MetricsMiddleware, metrics=metrics, routes=app.router.routes)
+
+request_profiler = RequestProfiler(appdata_description.profiles_path)
+app.add_middleware(ProfilingMiddleware, profiler=request_profiler)
+
+
+mdu_models = [
+    General,
+    Geometry,
+    VolumeTables,
+    Numerics,
+    Physics,
+    Sediment,
+    Wind,
+    Waves,
+    Time,
+    Restart,
+    ExternalForcing,
+    Hydrology,
+    Trachytopes,
+    Output,
+]
+
+
+schema_mapping: Dict[str, Dict[str, Type]] = {
+    "mdu": {m.__name__.lower(): m for m in mdu_models}
+}
+
+schema_registry = SchemaRegistry(schema_mapping, metrics)
+
+
+initial_uuid = uuid4()
+initial_model = FMModel()
+initial_model.general.fileversion = "1.12"
+initial_model.general.comments.fileversion = "A test value"
+initial_model.geometry.netfile.filepath = Path("test.nc")
+
+model_cache = ModelSerializationCache(metrics)
+model_store = ModelStore(on_spill=model_cache.discard)
+model_store[initial_uuid] = initial_model
+change_logs = ChangeLogRegistry()
+change_logs.create(initial_uuid)
+networks = NetworkRegistry()
+spatial_indices = SpatialIndexRegistry()
+broadcaster = ChangeBroadcaster()
+dependencies = DependencyTracker(worker_pool)
+model_saver = ModelSaver()
+validation = ValidationEngine()
+file_watcher = FileWatcher()
+parse_cache = ParseCache()
+
+# The time to wait for further changes before pushing a notification, such that
+# bursts of edits are sent to the subscribers as a single notification.
+notification_coalesce_delay = 0.02
+
+
+def register_model(model: FileModel) -> UUID4:
+    """Register a loaded model. This is called on the load pool, as storing the
+    model might spill other models to disk.
+    """
+    id = uuid4()
+    change_logs.create(id)
+    model_store[id] = model
+
+    # Record the state of the referenced files as loaded, against which later
+    # dependency checks report modified files.
+    worker_pool.submit(dependencies.check, id, model)
+
+    if file_watcher.running:
+        worker_pool.submit(watch_model_files, id, model)
+    return id
+
+
+def watch_model_files(id: UUID4, model: FileModel) -> None:
+    file_watcher.watch(id, [path for _, _, path in collect_file_models(model)])
+
+
+async def reload_changed_files(id: UUID4, paths: Set[Path]) -> None:
+    """Parse the changed files of the specified model again, swap them into the
+    model and notify the subscribers of the changed fields.
+
+    Files containing unsaved changes are not reloaded, such that these changes
+    are not lost.
+    """
+    if id not in model_store:
+        return
+
+    model = await worker_pool.run(model_store.__getitem__, id)
+    try:
+        reloaded = await load_pool.run(
+            load_changed_files, model, paths, model_saver.get_dirty(id)
+        )
+    except Exception as e:
+        logger.warning(f"Failed to reload the changed files of {id}: {e}")
+        return
+
+    if not reloaded or await worker_pool.run(model_store.get, id) is not model:
+        return
+
+    netfile = resolve_netfile_path(model)
+    try:
+        reloaded_model = await worker_pool.run(
+            model_store.update, id, partial(apply_reloaded_files, reloaded=reloaded)
+        )
+    except KeyError:
+        return
+
+    if reloaded_model is not model:
+        model = reloaded_model
+        await worker_pool.run(model_store.__setitem__, id, model)
+
+    if netfile in paths:
+        networks.discard(id)
+        spatial_indices.discard(netfile)
+
+    fields = [field for file in reloaded for field in file.changes]
+    for submodel in {submodel for submodel, _, _ in fields}:
+        model_cache.invalidate(id, submodel)
+
+    if fields:
+        change_log = change_logs[id]
+        changes = change_log.record_fields(model, fields)
+        broadcaster.publish(id, change_log.version, changes)
+
+    dependencies.reset(id, [file.path for file in reloaded])
+    worker_pool.submit(watch_model_files, id, model)
+
+
+prewarmer = Prewarmer(load_pool, FMModel)
+model_loader = ModelLoader(load_pool, FMModel, register_model, prewarmer)
+batch_loader = BatchLoader(load_pool, FMModel, register_model)
+
+
+def to_model(model_category: str, model_name: str) -> Type:
+    return schema_registry.to_model(model_category, model_name)
+
+
+def cached_json_response(
+    content: bytes, etag: str, if_none_match: Optional[str]
+) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+@app.get("/api/health")
+async def request_health():
+    return {"status": "ready"}
+
+
+async def get_category_schema(model_category: str) -> SerializedSchema:
+    # Only the first request of a category generates the schemas on the worker
+    # pool, afterwards the cached schemas are returned immediately.
+    schema = schema_registry.get_cached(model_category)
+    if schema is not None:
+        return schema
+
+    try:
+        return await worker_pool.run(schema_registry.get_category, model_category)
+    except KeyError:
+        raise HTTPException(
+            status_code=404, detail=f"No model category named {model_category}."
+        )
+
+
+@app.get("/api/schema/{model_category}")
+async def request_category_schema(
+    model_category, if_none_match: Optional[str] = Header(None)
+):
+    schema = await get_category_schema(model_category)
+    return cached_json_response(schema.content, schema.etag, if_none_match)
+
+
+@app.get("/api/schema/{model_category}/{model_name}")
+async def request_schema(
+    model_category, model_name, if_none_match: Optional[str] = Header(None)
+):
+    schema = schema_registry.get_cached(model_category, model_name)
+    if schema is not None:
+        return cached_json_response(schema.content, schema.etag, if_none_match)
+
+    try:
+        schema = await worker_pool.run(schema_registry.get, model_category, model_name)
+    except KeyError:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No model named {model_name} in category {model_category}.",
+        )
+
+    return cached_json_response(schema.content, schema.etag, if_none_match)
+
+
+@app.get("/api/models")
+async def request_model_keys():
+    return {"models": list(model_store.keys())}
+
+
+async def get_model(id: UUID4) -> FileModel:
+    """Get the specified model on the worker pool, as a model spilled to disk is
+    reloaded upon access.
+
+    Raises:
+        HTTPException: 404 when no model with the id exists.
+    """
+    try:
+        return await worker_pool.run(model_store.__getitem__, id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No model with id {id}.")
+
+
+async def update_model(
+    id: UUID4, modify: Callable[[FileModel], T]
+) -> Tuple[FileModel, T]:
+    """Modify the specified model on the worker pool through the model store, such
+    that the model is not spilled to disk while it is modified.
+
+    Raises:
+        HTTPException: 404 when no model with the id exists.
+
+    Returns:
+        Tuple[FileModel, T]: The modified model and the result of modify.
+    """
+    try:
+        return await worker_pool.run(
+            model_store.update, id, lambda model: (model, modify(model))
+        )
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No model with id {id}.")
+
+
+def record_changes(id: UUID4, model: FileModel, updates: List[FieldUpdate]) -> None:
+    change_log = change_logs[id]
+    changes = change_log.record(model, updates)
+    broadcaster.publish(id, change_log.version, changes)
+    model_saver.mark_dirty(id)
+
+
+def serialize_model(id: UUID4) -> bytes:
+    return model_cache.serialize(id, model_store[id])
+
+
+class LoadModelBody(BaseModel):
+    path: Path
+
+
+@app.post("/api/models", status_code=202)
+async def load_model(body: LoadModelBody):
+    path = body.path.resolve()
+
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail=f"No model file at {path}.")
+
+    return model_loader.submit(path)
+
+
+class BatchLoadBody(BaseModel):
+    pattern: str
+
+
+async def stream_batch_results(paths: List[Path]):
+    async for result in batch_loader.load(paths):
+        yield result.json().encode("utf-8") + b"\n"
+
+
+@app.post("/api/models/batch")
+async def load_model_batch(body: BatchLoadBody):
+    """Load all MDU files within a directory or matching a glob pattern.
+
+    The result of each model is streamed as a line of JSON as soon as it has been
+    loaded, containing either the id of the loaded model or the error.
+    """
+    paths = await worker_pool.run(find_model_files, body.pattern)
+
+    if not paths:
+        raise HTTPException(
+            status_code=404, detail=f"No model files match {body.pattern}."
+        )
+
+    return StreamingResponse(
+        stream_batch_results(paths), media_type="application/x-ndjson"
+    )
+
+
+@app.get("/api/executors")
+async def request_executor_stats():
+    return {"executors": [worker_pool.stats, load_pool.stats]}
+
+
+@app.get("/api/store")
+async def request_store_stats():
+    return await worker_pool.run(lambda: model_store.stats)
+
+
+def collect_model_counts():
+    stats = model_store.stats
+    return {("resident",): stats.resident_count, ("spilled",): stats.spilled_count}
+
+
+def collect_executor_stats(attribute: str):
+    def collect():
+        pools = (worker_pool, load_pool)
+        return {(pool.stats.name,): getattr(pool.stats, attribute) for pool in pools}
+
+    return collect
+
+
+metrics.gauge(
+    "models",
+    "The number of loaded models.",
+    collect_model_counts,
+    labels=("state",),
+)
+metrics.gauge(
+    "model_footprint_bytes",
+    "The estimated memory footprint of the loaded models in memory.",
+    lambda: {(): model_store.estimate_resident_footprint()},
+)
+metrics.gauge(
+    "executor_active_tasks",
+    "The number of tasks running on the executor.",
+    collect_executor_stats("active"),
+    labels=("executor",),
+)
+metrics.gauge(
+    "executor_queued_tasks",
+    "The number of tasks waiting for a worker of the executor.",
+    collect_executor_stats("queued"),
+    labels=("executor",),
+)
+
+
+@app.get("/api/metrics")
+async def request_metrics():
+    """Get the metrics of the server in the Prometheus text format."""
+    content = await worker_pool.run(metrics.render)
+    return Response(content=content, media_type=CONTENT_TYPE)
+
+
+def get_request_profiler() -> RequestProfiler:
+    if not request_profiler.enabled:
+        raise HTTPException(status_code=404, detail="Profiling is not enabled.")
+    return request_profiler
+
+
+@app.get("/api/profiles")
+async def request_profiles():
+    """Get the profiles of the profiled requests, most recent first.
+
+    Requests are profiled when they carry the X-Profile header or match the
+    profile pattern, the name of their profile is returned in the X-Profile-Name
+    response header.
+    """
+    profiler = get_request_profiler()
+    profiles: List[ProfileInfo] = await worker_pool.run(lambda: profiler.profiles)
+    return {"folder": profiler.folder, "profiles": profiles}
+
+
+@app.get("/api/profiles/{name}")
+async def request_profile(name: str):
+    path = get_request_profiler().get_path(name)
+
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"No profile named {name}.")
+
+    return FileResponse(path, filename=name)
+
+
+@app.get("/api/parse-cache")
+async def request_parse_cache_stats():
+    disk = parse_cache.disk
+    return {
+        "hits": parse_cache.hits,
+        "misses": parse_cache.misses,
+        "disk": await worker_pool.run(lambda: disk.stats) if disk else None,
+    }
+
+
+@app.on_event("shutdown")
+def close_model_store():
+    model_store.close()
+
+
+@app.on_event("shutdown")
+def shutdown_batch_loader():
+    batch_loader.shutdown()
+
+
+# Whether to watch the files of the loaded models, and reload them when changed.
+watch_files = False
+
+
+@app.on_event("startup")
+async def start_file_watcher():
+    if not watch_files:
+        return
+
+    loop = asyncio.get_running_loop()
+
+    def on_change(id: UUID4, paths: Set[Path]) -> None:
+        asyncio.run_coroutine_threadsafe(reload_changed_files(id, paths), loop)
+
+    file_watcher.start(on_change)
+    logger.info(f"Watching model files using {file_watcher.backend.value} backend.")
+
+
+@app.on_event("shutdown")
+def stop_file_watcher():
+    file_watcher.stop()
+
+
+# The directory or glob pattern of the models to load upon startup, if any.
+startup_batch_pattern: Optional[str] = None
+
+
+@app.on_event("startup")
+async def load_startup_batch():
+    if startup_batch_pattern is None:
+        return
+
+    async def load():
+        paths = await worker_pool.run(find_model_files, startup_batch_pattern)
+        async for result in batch_loader.load(paths):
+            if result.error is not None:
+                logger.warning(f"Failed to load {result.path}: {result.error}")
+
+    asyncio.create_task(load())
+
+
+# The number of recent projects to pre-load upon startup.
+prewarm_count = 0
+
+
+@app.on_event("startup")
+async def start_prewarming():
+    if prewarm_count == 0:
+        return
+
+    recent_projects = flowfm_inspector.state.appdata.content.recent_projects
+    paths = await worker_pool.run(
+        select_recent_projects, recent_projects, prewarm_count
+    )
+    prewarmer.start(paths)
+
+
+@app.on_event("shutdown")
+def cancel_prewarming():
+    prewarmer.cancel()
+
+
+@app.get("/api/prewarm")
+async def request_prewarm_state():
+    return {"footprint": prewarmer.footprint, "entries": prewarmer.entries}
+
+
+@app.delete("/api/prewarm", status_code=204)
+async def cancel_prewarm():
+    """Stop pre-loading recent projects, the projects pre-loaded so far are kept."""
+    prewarmer.cancel()
+
+
+@app.get("/api/jobs")
+async def request_jobs():
+    return {"jobs": model_loader.jobs}
+
+
+@app.get("/api/jobs/{job_id}")
+async def request_job(job_id: UUID4):
+    job = model_loader.get_job(job_id)
+
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"No job with id {job_id}.")
+
+    return job
+
+
+@app.get("/api/models/{id}")
+async def request_specific_model(id: UUID4):
+    if id not in model_store:
+        raise HTTPException(status_code=404, detail=f"No model with id {id}.")
+
+    # The version is retrieved before serializing, such that changes applied during
+    # the serialization are reported again when requesting the changes since.
+    version = change_logs[id].version
+    content = await worker_pool.run(serialize_model, id)
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers={"X-Model-Version": str(version)},
+    )
+
+
+@app.get("/api/models/{id}/changes", response_model=ModelChanges)
+async def request_model_changes(id: UUID4, since: int):
+    if id not in model_store:
+        raise HTTPException(status_code=404, detail=f"No model with id {id}.")
+
+    return change_logs[id].changes_since(since)
+
+
+@app.get("/api/models/{id}/submodels/{submodel}")
+async def request_submodel(
+    id: UUID4,
+    submodel: SubmodelName,
+    fields: Optional[str] = None,
+    comments: bool = True,
+):
+    """Request the data of a single submodel.
+
+    Args:
+        fields (Optional[str], optional):
+            Comma separated names of the fields to retrieve, if not specified all
+            fields are retrieved. Defaults to None.
+        comments (bool, optional):
+            Whether to include the comments of the retrieved fields.
+            Defaults to True.
+    """
+    submodel = to_submodel_field(submodel)
+    model = await get_model(id)
+    submodel_ = getattr(model, submodel)
+
+    if fields is None and comments:
+        content = await worker_pool.run(
+            model_cache.serialize_submodel, id, model, submodel
+        )
+        return Response(content=content, media_type="application/json")
+
+    if submodel_ is None:
+        return Response(content=b"null", media_type="application/json")
+
+    selected = None
+    if fields is not None:
+        selected = [f for f in fields.split(",") if f]
+        unknown = [f for f in selected if f not in submodel_.__dict__]
+
+        if unknown:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Unknown fields in {submodel}: {', '.join(unknown)}.",
+            )
+
+    def serialize():
+        with metrics.span("serialization"):
+            return serialize_submodel(submodel_, selected, comments)
+
+    content = await worker_pool.run(serialize)
+    return Response(content=content, media_type="application/json")
+
+
+def diff_stored_models(a: UUID4, b: UUID4) -> ModelDiff:
+    return diff_models(model_cache, a, model_store[a], b, model_store[b])
+
+
+@app.get("/api/models/{a}/diff/{b}", response_model=ModelDiff)
+async def request_model_diff(a: UUID4, b: UUID4):
+    """Get the fields of which the values or comments differ between two models."""
+    for id in (a, b):
+        if id not in model_store:
+            raise HTTPException(status_code=404, detail=f"No model with id {id}.")
+
+    return await worker_pool.run(diff_stored_models, a, b)
+
+
+@app.get("/api/models/{id}/validation", response_model=ValidationReport)
+async def request_model_validation(id: UUID4, full: bool = False):
+    """Validate the model.
+
+    Only the rules affected by the fields changed since the previous validation
+    are evaluated, unless a full validation is requested, which is necessary to
+    notice changes of referenced files.
+    """
+    model = await get_model(id)
+    change_log = change_logs[id]
+    version = change_log.version
+    validated_version = validation.get_version(id)
+
+    changed_fields = None
+    if validated_version is not None and not full:
+        changes = change_log.changes_since(validated_version)
+        if not changes.resync:
+            changed_fields = {
+                f"{change.submodel}.{change.field}"
+                for change in changes.changes
+                if change.type == DataSpecification.values
+            }
+
+    return await worker_pool.run(
+        validation.validate, id, model, version, changed_fields
+    )
+
+
+def save_model(id: UUID4) -> SaveResult:
+    model = model_store[id]
+    if model.filepath is None:
+        raise HTTPException(
+            status_code=409, detail=f"Model {id} has no file path to save to."
+        )
+
+    result = model_saver.save(id, model)
+
+    # The written files are expected to differ from the files as loaded.
+    dependencies.reset(id, result.written)
+    file_watcher.acknowledge(result.written)
+    return result
+
+
+@app.post("/api/models/{id}/save", response_model=SaveResult)
+async def request_save_model(id: UUID4):
+    """Write the files of the model which changed since the last save.
+
+    Every file is written to a temporary file first, which then replaces the
+    original file, such that an interrupted save does not corrupt the model. A
+    model without a file path, such as a new model, cannot be saved.
+    """
+    if id not in model_store:
+        raise HTTPException(status_code=404, detail=f"No model with id {id}.")
+
+    return await worker_pool.run(save_model, id)
+
+
+@app.get("/api/models/{id}/dependencies", response_model=DependencyGraph)
+async def request_model_dependencies(id: UUID4):
+    """Get the files referenced by the model, and whether they are missing or
+    modified since the model was loaded.
+    """
+    model = await get_model(id)
+    return await worker_pool.run(dependencies.check, id, model)
+
+
+def get_network(id: UUID4) -> LazyNetwork:
+    try:
+        return networks.get(id, model_store[id])
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+def get_network_metadata(id: UUID4) -> NetworkMetadata:
+    network = get_network(id)
+
+    # Start building the spatial indices in the background, such that they are
+    # likely available by the time the first spatial query arrives.
+    for mesh in network.mesh_names:
+        spatial_indices.get(network, mesh, load_pool)
+
+    return network.metadata
+
+
+@app.get("/api/models/{id}/network", response_model=NetworkMetadata)
+async def request_network_metadata(id: UUID4):
+    return await worker_pool.run(get_network_metadata, id)
+
+
+# The number of elements read from the net file per streamed chunk.
+geometry_chunk_size = 1 << 16
+
+
+@app.get("/api/models/{id}/geometry/{mesh}/{kind}")
+async def stream_geometry(
+    id: UUID4,
+    mesh: str,
+    kind: GeometryKind,
+    start: int = Query(0, ge=0),
+    count: Optional[int] = Query(None, ge=0),
+):
+    """Stream a range of node coordinates or edge or face connectivity of a mesh.
+
+    The response is a binary stream, consisting of a header followed by
+    little-endian float64 node coordinates, or int32 zero-based node indices.
+    See flowfm_inspector.internal.geometry for the exact format.
+    """
+    network = await worker_pool.run(get_network, id)
+
+    try:
+        geometry_range = await worker_pool.run(
+            get_geometry_range, network, mesh, kind, start, count
+        )
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+
+    async def content():
+        yield geometry_range.header
+
+        stop = geometry_range.start + geometry_range.count
+        for chunk_start in range(geometry_range.start, stop, geometry_chunk_size):
+            chunk_count = min(geometry_chunk_size, stop - chunk_start)
+            yield await worker_pool.run(
+                read_geometry_chunk, network, mesh, kind, chunk_start, chunk_count
+            )
+
+    return StreamingResponse(
+        content(),
+        media_type="application/octet-stream",
+        headers={"Content-Length": str(geometry_range.content_length)},
+    )
+
+
+async def get_spatial_index(id: UUID4, mesh: str) -> MeshSpatialIndex:
+    network = await worker_pool.run(get_network, id)
+    if mesh not in network.mesh_names:
+        raise HTTPException(status_code=404, detail=f"No mesh named {mesh}.")
+
+    return await asyncio.wrap_future(spatial_indices.get(network, mesh, load_pool))
+
+
+@app.get(
+    "/api/models/{id}/geometry/{mesh}/{kind}/nearest", response_model=NearestElement
+)
+async def request_nearest_element(
+    id: UUID4, mesh: str, kind: SpatialKind, x: float, y: float
+):
+    index = await get_spatial_index(id, mesh)
+    result = await worker_pool.run(index.nearest, kind, x, y)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Mesh {mesh} contains no {kind}.")
+    return result
+
+
+@app.get(
+    "/api/models/{id}/geometry/{mesh}/{kind}/within", response_model=ElementsWithin
+)
+async def request_elements_within(
+    id: UUID4,
+    mesh: str,
+    kind: SpatialKind,
+    xmin: float,
+    ymin: float,
+    xmax: float,
+    ymax: float,
+    limit: Optional[int] = Query(None, ge=0),
+):
+    index = await get_spatial_index(id, mesh)
+    return await worker_pool.run(index.within, kind, (xmin, ymin, xmax, ymax), limit)
+
+
+@app.websocket("/api/models/{id}/events")
+async def push_model_changes(websocket: WebSocket, id: UUID4):
+    """Push the changes of the specified model to the client.
+
+    Upon connecting the current version is sent, after which every change
+    notification contains the latest value of each field changed since the
+    previous notification.
+    """
+    if id not in model_store:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    change_log = change_logs[id]
+    await websocket.accept()
+
+    async def send_notifications(subscription: ChangeSubscription) -> None:
+        await websocket.send_json(
+            jsonable_encoder(ChangeNotification(version=change_log.version))
+        )
+
+        while True:
+            notification = await subscription.next(notification_coalesce_delay)
+            await websocket.send_json(jsonable_encoder(notification))
+
+    async def receive_until_disconnect() -> None:
+        while True:
+            await websocket.receive_text()
+
+    with broadcaster.subscribe(id, change_log.version) as subscription:
+        tasks = {
+            asyncio.create_task(send_notifications(subscription)),
+            asyncio.create_task(receive_until_disconnect()),
+        }
+
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    # The receiving task completes with a WebSocketDisconnect once the client
+    # disconnects, which is the expected way for this connection to end.
+    for task in done:
+        with contextlib.suppress(WebSocketDisconnect):
+            task.result()
+
+
+@app.get("/api/views/{model_category}")
+async def request_model_view(model_category: str, id: Optional[UUID4] = None):
+    """Request everything required to display a model in a single request.
+
+    The view consists of the ids of the available models, the data and version
+    of the requested model, and the schemas of the specified model category. If
+    no id is specified, the first available model is used.
+    """
+    if id is None:
+        id = next(iter(model_store), None)
+        if id is None:
+            raise HTTPException(status_code=404, detail="No models are loaded.")
+    elif id not in model_store:
+        raise HTTPException(status_code=404, detail=f"No model with id {id}.")
+
+    schemas = await get_category_schema(model_category)
+    models = serialize_json(jsonable_encoder(list(model_store.keys())))
+    version = change_logs[id].version
+    model = await worker_pool.run(serialize_model, id)
+
+    # All parts are already serialized, as such we only need to splice them
+    # into the resulting JSON object.
+    content = (
+        b'{"models":'
+        + models
+        + b',"id":'
+        + serialize_json(str(id))
+        + b',"version":'
+        + serialize_json(version)
+        + b',"model":'
+        + model
+        + b',"schemas":'
+        + schemas.content
+        + b"}"
+    )
+
+    return Response(content=content, media_type="application/json")
+
+
+@app.get("/api/models/{id}/{data_type}")
+async def get_model_field(
+    id: UUID4, data_type: DataSpecification, submodel: SubmodelName, field: str
+):
+    model = await get_model(id)
+    submodel_ = getattr(model, to_submodel_field(submodel))
+
+    value = None
+
+    if data_type == DataSpecification.comments:
+        value = getattr(submodel_.comments, field)
+    elif data_type == DataSpecification.values:
+        value = getattr(submodel_, field)
+
+    return {
+        "id": id,
+        "subModel": submodel,
+        "field": field,
+        "type": str(data_type),
+        "value": value,
+    }
+
+
+class SetFieldValueBody(BaseModel):
+    value: FieldValue
+    valuetype: ValueType
+
+
+class SetFieldCommentBody(BaseModel):
+    value: str
+
+
+@app.put("/api/models/{id}/comments", status_code=204)
+async def set_model_field_comment(
+    id: UUID4, submodel: SubmodelName, field: str, body: SetFieldCommentBody
+):
+    update = FieldUpdate(
+        submodel=submodel,
+        field=field,
+        type=DataSpecification.comments,
+        value=body.value,
+    )
+
+    try:
+        model, _ = await update_model(id, partial(apply_update, update=update))
+        record_changes(id, model, [update])
+    finally:
+        model_cache.invalidate(id, update.submodel)
+
+
+@app.put("/api/models/{id}/values", status_code=204)
+async def set_model_field_value(
+    id: UUID4, submodel: SubmodelName, field: str, body: SetFieldValueBody
+):
+    update = FieldUpdate(
+        submodel=submodel,
+        field=field,
+        type=DataSpecification.values,
+        value=body.value,
+        valuetype=body.valuetype,
+    )
+
+    try:
+        model, _ = await update_model(id, partial(apply_update, update=update))
+        record_changes(id, model, [update])
+    finally:
+        model_cache.invalidate(id, update.submodel)
+
+
+class UpdateFieldsBody(BaseModel):
+    updates: List[FieldUpdate]
+
+
+@app.patch("/api/models/{id}")
+async def update_model_fields(id: UUID4, body: UpdateFieldsBody):
+    """Apply a batch of value and comment updates to the specified model.
+
+    The updates are applied atomically: if any of the updates is invalid, none
+    of them is applied and a 422 is returned. The result of each update is
+    reported in the same order as the provided updates.
+    """
+    try:
+        model, results = await update_model(
+            id, partial(apply_updates, updates=body.updates)
+        )
+    finally:
+        for submodel in {update.submodel for update in body.updates}:
+            model_cache.invalidate(id, submodel)
+
+    applied = all(result.ok for result in results)
+    if applied:
+        record_changes(id, model, body.updates)
+
+    return JSONResponse(
+        status_code=200 if applied else 422,
+        content=jsonable_encoder({"applied": applied, "results": results}),
+    )
+
+
+def configure(
+    workers: Optional[int] = None,
+    load_workers: Optional[int] = None,
+    load: Optional[str] = None,
+    load_processes: int = 2,
+    max_batch_concurrency: int = 8,
+    memory_budget: Optional[int] = None,
+    parse_cache_size: int = 512,
+    prewarm: int = 0,
+    prewarm_memory: int = 1024,
+    watch: bool = False,
+    watch_debounce: float = 0.5,
+    profiling: bool = False,
+    profile_dir: Optional[Path] = None,
+    profile_pattern: Optional[str] = None,
+) -> None:
+    """Configure the server before it is started.
+
+    See flowfm_inspector.main for a description of each option.
+    """
+    if workers is not None:
+        worker_pool.resize(workers)
+    if load_workers is not None:
+        load_pool.resize(load_workers)
+
+    if parse_cache_size > 0:
+        parse_cache.disk = DiskParseCache(
+            appdata_description.parse_cache_path, parse_cache_size * 1024 * 1024
+        )
+    install_parse_cache(parse_cache)
+
+    batch_loader.configure(load_processes, max_batch_concurrency, parse_cache.disk)
+
+    global prewarm_count
+    prewarm_count = prewarm
+    prewarmer.memory_ceiling = prewarm_memory * 1024 * 1024
+    prewarmer.disk_cache = parse_cache.disk
+
+    global startup_batch_pattern
+    startup_batch_pattern = load
+
+    if memory_budget is not None:
+        model_store.memory_budget = memory_budget * 1024 * 1024
+
+    global watch_files
+    watch_files = watch
+    file_watcher.debounce = watch_debounce
+
+    request_profiler.enabled = profiling
+    request_profiler.pattern = profile_pattern
+    if profile_dir is not None:
+        request_profiler.folder = profile_dir
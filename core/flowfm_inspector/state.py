@@ -1,11 +1,23 @@
+import os
+
 from flowfm_inspector.internal.appdata import (
     AppDataFileDescription,
     AppDataManager,
 )
+from flowfm_inspector.internal.executor import WorkerPool
+from flowfm_inspector.internal.metrics import MetricsRegistry
 
 
 appdata_description = AppDataFileDescription(
     name="FlowFM-inspector", author="BeardedPlatypus"
 )
 
-appdata = AppDataManager(appdata_description)
+metrics = MetricsRegistry()
+
+appdata = AppDataManager(appdata_description, metrics)
+
+# Blocking serialization and disk access is executed on the worker pool, while the
+# (potentially long running) parsing of models is executed on the load pool, such
+# that loading large models does not stall other requests.
+worker_pool = WorkerPool("worker", max_workers=min(4, os.cpu_count() or 1))
+load_pool = WorkerPool("loader", max_workers=2)
@@ -0,0 +1,198 @@
+import asyncio
+import os
+import pickle
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Type
+from uuid import uuid4
+
+from hydrolib.core.basemodel import FileModel
+from hydrolib.core.io.mdu.models import FMModel
+from pydantic.types import UUID4
+
+from flowfm_inspector.internal.batch import (
+    BatchLoader,
+    BatchLoadResult,
+    ParseCache,
+    find_model_files,
+)
+from flowfm_inspector.internal.diskcache import DiskParseCache
+from tests.paths import Paths
+
+
+def create_batch_folder(name: str, n_models: int) -> Path:
+    folder = Paths.temp_folder() / "TestBatch" / name
+    shutil.rmtree(folder, ignore_errors=True)
+    (folder / "variants").mkdir(parents=True)
+
+    source = Paths.test_data_folder() / "models" / "simple.mdu"
+    for i in range(n_models):
+        shutil.copy(source, folder / "variants" / f"variant_{i}.mdu")
+
+    (folder / "notes.txt").write_text("not a model")
+    return folder
+
+
+class TestFindModelFiles:
+    def test_directory_is_searched_recursively(self):
+        folder = create_batch_folder("directory", n_models=3)
+
+        result = find_model_files(str(folder))
+
+        assert [p.name for p in result] == [f"variant_{i}.mdu" for i in range(3)]
+
+    def test_glob_pattern(self):
+        folder = create_batch_folder("glob", n_models=3)
+
+        result = find_model_files(str(folder / "**" / "variant_[01].mdu"))
+
+        assert [p.name for p in result] == ["variant_0.mdu", "variant_1.mdu"]
+
+
+class TestParseCache:
+    def test_identical_files_are_parsed_once(self):
+        folder = create_batch_folder("cache", n_models=1)
+        path = folder / "variants" / "variant_0.mdu"
+        cache = ParseCache()
+        calls = []
+
+        def parse():
+            calls.append(path)
+            return {"general": {"fileversion": "1.09"}}
+
+        first = cache.parse(FMModel, path, parse)
+        second = cache.parse(FMModel, path, parse)
+
+        assert len(calls) == 1
+        assert first == second
+        assert first is not second
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_least_recently_used_entries_are_evicted_by_size(self):
+        folder = create_batch_folder("evict", n_models=3)
+        paths = [folder / "variants" / f"variant_{i}.mdu" for i in range(3)]
+        data = {"general": {"fileversion": "1.09"}}
+        size = len(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        cache = ParseCache(max_size=int(size * 2.5))
+        calls = []
+
+        def parse(path: Path):
+            calls.append(path)
+            return data
+
+        for path in [paths[0], paths[1], paths[0], paths[2], paths[0], paths[1]]:
+            cache.parse(FMModel, path, lambda: parse(path))
+
+        assert calls == [paths[0], paths[1], paths[2], paths[1]]
+        assert (cache.hits, cache.misses) == (2, 4)
+
+    def test_files_not_in_memory_are_retrieved_from_disk(self):
+        folder = create_batch_folder("disk", n_models=1)
+        path = folder / "variants" / "variant_0.mdu"
+        disk = DiskParseCache(folder / "cache")
+        calls = []
+
+        def parse():
+            calls.append(path)
+            return {"general": {"fileversion": "1.09"}}
+
+        ParseCache(disk=disk).parse(FMModel, path, parse)
+        result = ParseCache(disk=disk).parse(FMModel, path, parse)
+
+        assert len(calls) == 1
+        assert result == {"general": {"fileversion": "1.09"}}
+        assert disk.stats.hits == 1
+
+
+class CrashingFMModel(FMModel):
+    """An FMModel of which the parsing process crashes for files named crash.mdu.
+
+    Files named slow.mdu are parsed only once the process parsing crash.mdu is
+    about to crash, and a while after, such that they are still in flight when
+    the pool breaks regardless of the order in which the processes are started.
+    """
+
+    def __init__(self, filepath: Optional[Path] = None, *args, **kwargs):
+        if filepath is not None and filepath.name == "crash.mdu":
+            (filepath.parent / "crashing").touch()
+            os._exit(1)
+        if filepath is not None and filepath.name == "slow.mdu":
+            crashing = filepath.parent / "crashing"
+            deadline = time.monotonic() + 30.0
+            while not crashing.exists() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            # The broken pool terminates this process while it is sleeping.
+            time.sleep(5.0)
+        super().__init__(filepath, *args, **kwargs)
+
+
+class TestBatchLoader:
+    @staticmethod
+    def load(
+        paths: List[Path],
+        model_type: Type[FileModel] = FMModel,
+        max_concurrency: int = 8,
+    ) -> Tuple[List[BatchLoadResult], Dict[UUID4, FileModel]]:
+        registered: Dict[UUID4, FileModel] = {}
+
+        def register(model: FileModel) -> UUID4:
+            id = uuid4()
+            registered[id] = model
+            return id
+
+        async def run() -> List[BatchLoadResult]:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                loader = BatchLoader(
+                    executor,
+                    model_type,
+                    register,
+                    max_processes=2,
+                    max_concurrency=max_concurrency,
+                )
+                try:
+                    return [result async for result in loader.load(paths)]
+                finally:
+                    loader.shutdown()
+
+        return asyncio.run(run()), registered
+
+    def test_load_yields_result_per_model(self):
+        folder = create_batch_folder("load", n_models=3)
+        invalid = folder / "variants" / "invalid.mdu"
+        invalid.write_text("[General]\nfileVersion = 1.09\n\n[Time]\ntStop = abc\n")
+
+        paths = find_model_files(str(folder))
+        results, registered = TestBatchLoader.load(paths)
+
+        assert sorted(r.path for r in results) == paths
+
+        failed = [r for r in results if r.error is not None]
+        assert [r.path for r in failed] == [invalid]
+
+        loaded = [r for r in results if r.model_id is not None]
+        assert len(loaded) == 3
+        for result in loaded:
+            assert registered[result.model_id].time.tstop == 3600.0
+
+    def test_crashed_process_fails_models_in_flight_only(self):
+        folder = create_batch_folder("crash", n_models=3)
+        source = folder / "variants" / "variant_0.mdu"
+        crash, slow = folder / "crash.mdu", folder / "slow.mdu"
+        shutil.copy(source, crash)
+        shutil.copy(source, slow)
+
+        paths = [slow, crash] + find_model_files(str(folder / "variants"))
+        results, registered = TestBatchLoader.load(
+            paths, CrashingFMModel, max_concurrency=2
+        )
+
+        assert sorted(r.path for r in results) == sorted(paths)
+
+        failed = [r for r in results if r.error is not None]
+        assert sorted(r.path for r in failed) == [crash, slow]
+
+        loaded = [r for r in results if r.model_id is not None]
+        assert len(loaded) == 3
+        assert len(registered) == 3
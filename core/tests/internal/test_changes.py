@@ -0,0 +1,78 @@
+from uuid import uuid4
+
+import pytest
+from hydrolib.core.io.mdu.models import FMModel
+
+from flowfm_inspector.internal.changes import ChangeLogRegistry, ModelChangeLog
+from flowfm_inspector.internal.updates import (
+    DataSpecification,
+    FieldUpdate,
+    apply_update,
+)
+
+
+class TestModelChangeLog:
+    @staticmethod
+    def apply(model: FMModel, log: ModelChangeLog, *updates: FieldUpdate) -> None:
+        for update in updates:
+            apply_update(model, update)
+        log.record(model, updates)
+
+    def test_changes_since_yields_changes_after_version(self):
+        model = FMModel()
+        log = ModelChangeLog()
+
+        TestModelChangeLog.apply(
+            model, log, FieldUpdate(submodel="time", field="tstop", value=10.0)
+        )
+        TestModelChangeLog.apply(
+            model,
+            log,
+            FieldUpdate(submodel="time", field="tstart", value=1.0),
+            FieldUpdate(
+                submodel="time",
+                field="tstart",
+                type=DataSpecification.comments,
+                value="Start",
+            ),
+        )
+
+        result = log.changes_since(1)
+
+        assert result.version == 2
+        assert not result.resync
+        assert [(c.version, c.field, c.value) for c in result.changes] == [
+            (2, "tstart", 1.0),
+            (2, "tstart", "Start"),
+        ]
+        assert log.changes_since(2).changes == []
+
+    def test_changes_since_evicted_version_requires_resync(self):
+        model = FMModel()
+        log = ModelChangeLog(max_changes=2)
+
+        for value in range(4):
+            TestModelChangeLog.apply(
+                model,
+                log,
+                FieldUpdate(submodel="time", field="tstop", value=float(value)),
+            )
+
+        assert log.changes_since(1).resync
+        assert not log.changes_since(2).resync
+        assert [c.value for c in log.changes_since(2).changes] == [2.0, 3.0]
+        assert log.changes_since(5).resync
+
+
+class TestChangeLogRegistry:
+    def test_unknown_model_has_no_change_log(self):
+        registry = ChangeLogRegistry()
+        id = uuid4()
+
+        with pytest.raises(KeyError):
+            registry[id]
+
+        log = registry.create(id)
+
+        assert registry[id] is log
+        assert log.version == 0
@@ -0,0 +1,107 @@
+import os
+import shutil
+from pathlib import Path
+
+from hydrolib.core.io.mdu.models import FMModel
+
+from flowfm_inspector.internal.dependencies import (
+    DependencyTracker,
+    FileState,
+    collect_references,
+)
+from flowfm_inspector.internal.executor import WorkerPool
+from tests.paths import Paths
+
+
+MDU_CONTENT = """[General]
+fileVersion = 1.09
+program     = D-Flow FM
+
+[External Forcing]
+extForceFileNew = forcing/boundaries.ext
+
+[Output]
+obsFile = obs_obs.xyn
+crsFile = missing_crs.pli
+hisFile = output_his.nc
+"""
+
+
+def create_model(name: str) -> Path:
+    folder = Paths.temp_folder() / "TestDependencies" / name
+    shutil.rmtree(folder, ignore_errors=True)
+    (folder / "forcing").mkdir(parents=True)
+
+    (folder / "model.mdu").write_text(MDU_CONTENT)
+    (folder / "forcing" / "boundaries.ext").write_text(
+        "[General]\nfileVersion = 2.01\nfileType = extForce\n"
+    )
+    (folder / "obs_obs.xyn").write_text("0.0 0.0 obs\n")
+    return folder
+
+
+class TestCollectReferences:
+    def test_references_are_resolved_relative_to_model(self):
+        folder = create_model("collect")
+        model = FMModel(folder / "model.mdu")
+
+        result = {r.field: r.target for r in collect_references(model)}
+
+        assert result == {
+            "external_forcing.extforcefilenew": folder / "forcing" / "boundaries.ext",
+            "output.obsfile[0]": folder / "obs_obs.xyn",
+            "output.crsfile[0]": folder / "missing_crs.pli",
+        }
+
+
+class TestDependencyTracker:
+    def test_check_reports_missing_files(self):
+        folder = create_model("missing")
+        model = FMModel(folder / "model.mdu")
+
+        result = DependencyTracker().check(1, model)
+
+        assert result.root == folder / "model.mdu"
+        assert len(result.files) == 4
+        assert result.missing == [folder / "missing_crs.pli"]
+        assert result.modified == []
+
+    def test_check_reports_modified_files(self):
+        folder = create_model("modified")
+        model = FMModel(folder / "model.mdu")
+        tracker = DependencyTracker()
+        tracker.check(1, model)
+
+        (folder / "obs_obs.xyn").write_text("1.0 1.0 moved_obs\n")
+        result = tracker.check(1, model)
+
+        assert result.modified == [folder / "obs_obs.xyn"]
+        state = {f.path: f.state for f in result.files}
+        assert state[folder / "obs_obs.xyn"] == FileState.modified
+
+        tracker.reset(1, [folder / "obs_obs.xyn"])
+        assert tracker.check(1, model).modified == []
+
+    def test_check_reports_touched_files_as_modified(self):
+        folder = create_model("touched")
+        model = FMModel(folder / "model.mdu")
+        tracker = DependencyTracker()
+        tracker.check(1, model)
+
+        path = folder / "obs_obs.xyn"
+        mtime_ns = path.stat().st_mtime_ns
+        os.utime(path, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+        assert tracker.check(1, model).modified == [path]
+
+    def test_check_on_saturated_executor(self):
+        folder = create_model("executor")
+        model = FMModel(folder / "model.mdu")
+        pool = WorkerPool("test", max_workers=1)
+        tracker = DependencyTracker(pool)
+
+        # Every worker waiting for the files of its own check must not deadlock.
+        results = [pool.submit(tracker.check, i, model) for i in range(4)]
+
+        for result in results:
+            assert result.result(timeout=10).missing == [folder / "missing_crs.pli"]
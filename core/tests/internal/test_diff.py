@@ -0,0 +1,43 @@
+from uuid import uuid4
+
+from hydrolib.core.io.mdu.models import FMModel
+
+from flowfm_inspector.internal.diff import diff_models
+from flowfm_inspector.internal.serialization import ModelSerializationCache
+from flowfm_inspector.internal.updates import DataSpecification
+
+
+def create_model() -> FMModel:
+    model = FMModel()
+    model.geometry.netfile = None
+    return model
+
+
+class TestDiffModels:
+    def test_identical_models_have_no_differences(self):
+        id_a, id_b = uuid4(), uuid4()
+
+        result = diff_models(
+            ModelSerializationCache(), id_a, create_model(), id_b, create_model()
+        )
+
+        assert result.differences == []
+        assert "time" in result.identical
+        assert "filepath" not in result.identical
+
+    def test_differences_of_values_and_comments(self):
+        id_a, id_b = uuid4(), uuid4()
+        model_a, model_b = create_model(), create_model()
+        model_b.time.tstop = 42.0
+        model_b.general.comments.program = "Changed"
+
+        result = diff_models(ModelSerializationCache(), id_a, model_a, id_b, model_b)
+
+        assert [
+            (d.submodel, d.field, d.type, d.a, d.b) for d in result.differences
+        ] == [
+            ("general", "program", DataSpecification.comments, None, "Changed"),
+            ("time", "tstop", DataSpecification.values, 86400.0, 42.0),
+        ]
+        assert "general" not in result.identical
+        assert "numerics" in result.identical
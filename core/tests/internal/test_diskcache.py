@@ -0,0 +1,92 @@
+import shutil
+from pathlib import Path
+from typing import List
+
+from hydrolib.core.io.mdu.models import FMModel
+
+from flowfm_inspector.internal.diskcache import DiskParseCache
+from tests.paths import Paths
+
+
+def create_folder(name: str) -> Path:
+    folder = Paths.temp_folder() / "TestDiskParseCache" / name
+    shutil.rmtree(folder, ignore_errors=True)
+    folder.mkdir(parents=True)
+    return folder
+
+
+def create_file(folder: Path, name: str, content: str) -> Path:
+    path = folder / name
+    path.write_text(content)
+    return path
+
+
+class TestDiskParseCache:
+    @staticmethod
+    def parse(cache: DiskParseCache, path: Path, calls: List[Path]):
+        def parse():
+            calls.append(path)
+            return {"content": path.read_text()}
+
+        return cache.parse(FMModel, path, parse)
+
+    def test_entries_are_reused_by_new_cache(self):
+        folder = create_folder("reuse")
+        path = create_file(folder, "model.mdu", "a")
+        calls = []
+
+        first = self.parse(DiskParseCache(folder / "cache"), path, calls)
+        cache = DiskParseCache(folder / "cache")
+        second = self.parse(cache, path, calls)
+
+        assert calls == [path]
+        assert first == second == {"content": "a"}
+        assert (cache.stats.hits, cache.stats.entry_count) == (1, 1)
+
+    def test_entries_are_keyed_by_content(self):
+        folder = create_folder("content")
+        path = create_file(folder, "model.mdu", "a")
+        copy = create_file(folder, "copy.mdu", "a")
+        cache = DiskParseCache(folder / "cache")
+        calls = []
+
+        self.parse(cache, path, calls)
+        self.parse(cache, copy, calls)
+        path.write_text("b")
+        result = self.parse(cache, path, calls)
+
+        assert calls == [path, path]
+        assert result == {"content": "b"}
+
+    def test_least_recently_used_entries_are_evicted(self):
+        folder = create_folder("evict")
+        paths = [create_file(folder, f"{i}.mdu", str(i) * 100) for i in range(3)]
+        calls = []
+
+        self.parse(DiskParseCache(folder / "cache"), paths[0], calls)
+        entry_size = DiskParseCache(folder / "cache").stats.size
+        cache = DiskParseCache(folder / "cache", max_size=int(entry_size * 2.5))
+
+        self.parse(cache, paths[1], calls)
+        self.parse(cache, paths[0], calls)
+        self.parse(cache, paths[2], calls)
+        self.parse(cache, paths[0], calls)
+        self.parse(cache, paths[1], calls)
+
+        assert calls == [paths[0], paths[1], paths[2], paths[1]]
+        assert cache.stats.entry_count == 2
+        assert cache.stats.size <= entry_size * 2.5
+
+    def test_corrupt_entry_is_parsed_again(self):
+        folder = create_folder("corrupt")
+        path = create_file(folder, "model.mdu", "a")
+        cache = DiskParseCache(folder / "cache")
+        calls = []
+
+        self.parse(cache, path, calls)
+        for entry in (folder / "cache").glob("*.bin"):
+            entry.write_bytes(b"corrupt")
+        result = self.parse(cache, path, calls)
+
+        assert calls == [path, path]
+        assert result == {"content": "a"}
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+from flowfm_inspector.internal.executor import WorkerPool
+
+
+class TestWorkerPool:
+    def test_run_yields_result(self):
+        pool = WorkerPool("test", max_workers=2)
+
+        result = asyncio.run(pool.run(sum, [1, 2, 3]))
+
+        assert result == 6
+        assert pool.stats.completed == 1
+
+    def test_stats_reflect_active_and_queued_tasks(self):
+        pool = WorkerPool("test", max_workers=1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def block() -> None:
+            started.set()
+            release.wait()
+
+        first = pool.submit(block)
+        started.wait()
+        second = pool.submit(block)
+
+        stats = pool.stats
+        assert stats.active == 1
+        assert stats.queued == 1
+        assert stats.saturation == 2.0
+
+        release.set()
+        first.result()
+        second.result()
+
+        stats = pool.stats
+        assert stats.active == 0
+        assert stats.queued == 0
+        assert stats.completed == 2
+        assert stats.peak_queued == 1
+
+    def test_cancelled_tasks_are_not_queued(self):
+        pool = WorkerPool("test", max_workers=1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def block() -> None:
+            started.set()
+            release.wait()
+
+        first = pool.submit(block)
+        started.wait()
+
+        assert pool.submit(block).cancel()
+        assert pool.stats.queued == 0
+
+        release.set()
+        first.result()
+
+    def test_resize_changes_max_workers(self):
+        pool = WorkerPool("test", max_workers=1)
+
+        pool.resize(3)
+
+        assert pool.max_workers == 3
+        assert pool.submit(lambda: 42).result() == 42
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from flowfm_inspector.internal.geometry import (
+    GEOMETRY_HEADER,
+    GEOMETRY_MAGIC,
+    GeometryDataType,
+    GeometryKind,
+    get_geometry_range,
+    read_geometry_chunk,
+)
+from flowfm_inspector.internal.network import LazyNetwork
+from tests.paths import Paths
+from tests.ugrid import write_rectilinear_ugrid
+
+
+class TestGeometry:
+    @staticmethod
+    def open_network(name: str) -> LazyNetwork:
+        path = Paths.temp_folder() / TestGeometry.__name__ / f"{name}_net.nc"
+        write_rectilinear_ugrid(path, nx=3, ny=2)
+        return LazyNetwork(path)
+
+    def test_geometry_range_is_clipped_to_mesh(self):
+        network = TestGeometry.open_network("range")
+
+        result = get_geometry_range(network, "mesh2d", GeometryKind.faces, start=4)
+        network.close()
+
+        assert result.data_type == GeometryDataType.int32
+        assert result.components == 5
+        assert (result.start, result.count) == (4, 2)
+        assert result.content_length == GEOMETRY_HEADER.size + 2 * 5 * 4
+
+        magic, _, data_type, components, start, count = GEOMETRY_HEADER.unpack(
+            result.header
+        )
+        assert magic == GEOMETRY_MAGIC
+        assert (data_type, components, start, count) == (2, 5, 4, 2)
+
+    def test_geometry_range_does_not_read_nodes(self, monkeypatch):
+        network = TestGeometry.open_network("sizes")
+        monkeypatch.setattr(
+            LazyNetwork,
+            "_compute_bounding_box",
+            lambda *_: pytest.fail("The bounding box was computed."),
+        )
+
+        nodes = get_geometry_range(network, "mesh2d", GeometryKind.nodes)
+        edges = get_geometry_range(network, "mesh2d", GeometryKind.edges, count=3)
+        network.close()
+
+        assert (nodes.data_type, nodes.components, nodes.count) == (
+            GeometryDataType.float64,
+            2,
+            12,
+        )
+        assert (edges.data_type, edges.components, edges.count) == (
+            GeometryDataType.int32,
+            2,
+            3,
+        )
+
+    def test_read_geometry_chunk_yields_little_endian_values(self):
+        network = TestGeometry.open_network("chunk")
+
+        nodes = read_geometry_chunk(network, "mesh2d", GeometryKind.nodes, 1, 2)
+        edges = read_geometry_chunk(network, "mesh2d", GeometryKind.edges, 0, 1)
+        network.close()
+
+        np.testing.assert_array_equal(
+            np.frombuffer(nodes, dtype="<f8"), [1.0, 0.0, 2.0, 0.0]
+        )
+        np.testing.assert_array_equal(np.frombuffer(edges, dtype="<i4"), [0, 1])
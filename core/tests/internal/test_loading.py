@@ -0,0 +1,75 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Tuple
+from uuid import uuid4
+
+from hydrolib.core.basemodel import FileModel
+from hydrolib.core.io.mdu.models import FMModel
+from pydantic.types import UUID4
+
+from flowfm_inspector.internal.loading import LoadJob, LoadStatus, ModelLoader
+from tests.paths import Paths
+
+
+class TestModelLoader:
+    @staticmethod
+    def load(path: Path) -> Tuple[LoadJob, Dict[UUID4, FileModel]]:
+        registered: Dict[UUID4, FileModel] = {}
+
+        def register(model: FileModel) -> UUID4:
+            id = uuid4()
+            registered[id] = model
+            return id
+
+        async def run() -> LoadJob:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                loader = ModelLoader(executor, FMModel, register)
+                job = loader.submit(path)
+                return await loader.wait(job.id)
+
+        return asyncio.run(run()), registered
+
+    def test_load_registers_parsed_model(self):
+        path = Paths.test_data_folder() / "models" / "simple.mdu"
+
+        job, registered = TestModelLoader.load(path)
+
+        assert job.status == LoadStatus.completed
+        assert job.loaded_files >= 1
+        assert job.finished is not None
+
+        model = registered[job.model_id]
+        assert model.geometry.bedlevuni == -3.0
+        assert model.time.tstop == 3600.0
+
+    def test_load_invalid_model_fails(self):
+        folder = Paths.temp_folder() / TestModelLoader.__name__
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / "invalid.mdu"
+
+        with path.open("w") as f:
+            f.write("[Time]\ntStop = not-a-number\n")
+
+        job, registered = TestModelLoader.load(path)
+
+        assert job.status == LoadStatus.failed
+        assert job.error
+        assert job.model_id is None
+        assert not registered
+
+    def test_finished_jobs_are_discarded_after_ttl(self):
+        path = Paths.test_data_folder() / "models" / "simple.mdu"
+
+        async def run():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                loader = ModelLoader(executor, FMModel, lambda _: uuid4(), job_ttl=0)
+                job = loader.submit(path)
+
+                assert loader.get_job(job.id) is job
+                await loader.wait(job.id)
+
+                assert loader.get_job(job.id) is None
+                assert loader.jobs == []
+
+        asyncio.run(run())
@@ -0,0 +1,109 @@
+import asyncio
+
+from fastapi import FastAPI
+
+from flowfm_inspector.internal.metrics import MetricsMiddleware, MetricsRegistry
+
+
+class TestMetricsRegistry:
+    def test_render_counter(self):
+        metrics = MetricsRegistry(prefix="test")
+        counter = metrics.counter("requests_total", "Requests.", labels=("route",))
+
+        counter.inc("/a")
+        counter.inc("/a")
+        counter.inc('/"b"')
+
+        lines = metrics.render().splitlines()
+        assert "# TYPE test_requests_total counter" in lines
+        assert 'test_requests_total{route="/a"} 2.0' in lines
+        assert 'test_requests_total{route="/\\"b\\""} 1.0' in lines
+
+    def test_render_histogram_buckets_are_cumulative(self):
+        metrics = MetricsRegistry(prefix="test")
+        histogram = metrics.histogram("duration", "Duration.", buckets=(0.1, 1.0))
+
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5.0)
+
+        lines = metrics.render().splitlines()
+        assert 'test_duration_bucket{le="0.1"} 1' in lines
+        assert 'test_duration_bucket{le="1.0"} 2' in lines
+        assert 'test_duration_bucket{le="+Inf"} 3' in lines
+        assert "test_duration_sum 5.55" in lines
+        assert "test_duration_count 3" in lines
+
+    def test_render_gauge_collects_values(self):
+        metrics = MetricsRegistry(prefix="test")
+        values = {("resident",): 1}
+        metrics.gauge("models", "Models.", lambda: values, labels=("state",))
+
+        values[("resident",)] = 3
+
+        assert 'test_models{state="resident"} 3.0' in metrics.render().splitlines()
+
+    def test_span_records_duration(self):
+        metrics = MetricsRegistry(prefix="test")
+
+        with metrics.span("serialization"):
+            pass
+
+        assert metrics.spans.get_count("serialization") == 1
+
+
+class TestMetricsMiddleware:
+    @staticmethod
+    async def request(app, path: str) -> int:
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http",
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [],
+            "server": ("localhost", 8000),
+            "client": ("localhost", 1234),
+        }
+        await app(scope, receive, send)
+        return messages[0]["status"]
+
+    def test_requests_are_labelled_with_route_template(self):
+        metrics = MetricsRegistry(prefix="test")
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware, metrics=metrics, routes=app.router.routes)
+
+        @app.get("/api/models/{id}")
+        async def get_model(id: int):
+            return {"id": id}
+
+        async def run():
+            assert await self.request(app, "/api/models/1") == 200
+            assert await self.request(app, "/api/models/2") == 200
+            assert await self.request(app, "/api/unknown") == 404
+
+        asyncio.run(run())
+
+        lines = metrics.render().splitlines()
+        assert (
+            'test_http_requests_total{method="GET",route="/api/models/{id}",'
+            'status="200"} 2.0'
+        ) in lines
+        assert (
+            'test_http_requests_total{method="GET",route="unmatched",status="404"} 1.0'
+        ) in lines
+        assert (
+            'test_http_request_duration_seconds_count{method="GET",'
+            'route="/api/models/{id}"} 2'
+        ) in lines
@@ -0,0 +1,94 @@
+from pathlib import Path
+from uuid import uuid4
+
+import netCDF4 as nc
+import numpy as np
+from hydrolib.core.io.mdu.models import FMModel
+
+from flowfm_inspector.internal.network import LazyNetwork, NetworkRegistry
+from tests.paths import Paths
+from tests.ugrid import write_rectilinear_ugrid
+
+
+class TestLazyNetwork:
+    @staticmethod
+    def open_network(name: str) -> LazyNetwork:
+        path = Paths.temp_folder() / TestLazyNetwork.__name__ / f"{name}_net.nc"
+        write_rectilinear_ugrid(path, nx=3, ny=2, dx=10.0)
+        return LazyNetwork(path)
+
+    def test_metadata_describes_mesh(self):
+        network = TestLazyNetwork.open_network("metadata")
+
+        metadata = network.metadata
+        network.close()
+
+        assert metadata.coordinate_system.epsg == 28992
+        assert len(metadata.meshes) == 1
+
+        mesh = metadata.meshes[0]
+        assert mesh.name == "mesh2d"
+        assert mesh.node_count == 12
+        assert mesh.edge_count == 17
+        assert mesh.face_count == 6
+        assert mesh.max_face_nodes == 5
+        assert (mesh.bounding_box.xmin, mesh.bounding_box.ymin) == (0.0, 0.0)
+        assert (mesh.bounding_box.xmax, mesh.bounding_box.ymax) == (30.0, 20.0)
+
+    def test_read_nodes_yields_requested_range(self):
+        network = TestLazyNetwork.open_network("nodes")
+
+        nodes = network.read_nodes("mesh2d", start=3, count=2)
+        network.close()
+
+        assert nodes.dtype == np.float64
+        np.testing.assert_array_equal(nodes, [[30.0, 0.0], [0.0, 10.0]])
+
+    def test_read_connectivity_is_zero_based_with_missing_nodes(self):
+        network = TestLazyNetwork.open_network("connectivity")
+
+        faces = network.read_connectivity("mesh2d", "faces", start=0, count=1)
+        edges = network.read_connectivity("mesh2d", "edges", start=16)
+        network.close()
+
+        np.testing.assert_array_equal(faces, [[0, 1, 5, 4, -1]])
+        np.testing.assert_array_equal(edges, [[7, 11]])
+
+    def test_bounding_box_ignores_missing_coordinates(self):
+        path = Paths.temp_folder() / TestLazyNetwork.__name__ / "missing_net.nc"
+        write_rectilinear_ugrid(path, nx=3, ny=2, dx=10.0)
+
+        with nc.Dataset(path, "a") as dataset:
+            dataset.variables["mesh2d_node_x"][11] = np.nan
+            dataset.variables["mesh2d_node_y"][0] = nc.default_fillvals["f8"]
+
+        network = LazyNetwork(path)
+        box = network.metadata.meshes[0].bounding_box
+        network.close()
+
+        assert (box.xmin, box.ymin, box.xmax, box.ymax) == (0.0, 0.0, 30.0, 20.0)
+
+
+class TestNetworkRegistry:
+    @staticmethod
+    def create_model(netfile: Path) -> FMModel:
+        model = FMModel()
+        model.filepath = netfile.parent / "model.mdu"
+        model.geometry.netfile.filepath = Path(netfile.name)
+        return model
+
+    def test_replaced_network_remains_readable(self):
+        folder = Paths.temp_folder() / TestNetworkRegistry.__name__
+        first, second = folder / "first_net.nc", folder / "second_net.nc"
+        write_rectilinear_ugrid(first, nx=3, ny=2, dx=10.0)
+        write_rectilinear_ugrid(second, nx=1, ny=1, dx=10.0)
+
+        registry = NetworkRegistry()
+        id = uuid4()
+        network = registry.get(id, TestNetworkRegistry.create_model(first))
+
+        assert registry.get(id, TestNetworkRegistry.create_model(second)) is not network
+        registry.discard(id)
+
+        assert network.read_nodes("mesh2d").shape == (12, 2)
+        network.close()
@@ -0,0 +1,69 @@
+import asyncio
+from uuid import uuid4
+
+from flowfm_inspector.internal.changes import FieldChange
+from flowfm_inspector.internal.notifications import (
+    ChangeBroadcaster,
+    ChangeSubscription,
+)
+from flowfm_inspector.internal.updates import DataSpecification
+
+
+def create_change(version: int, field: str, value: float) -> FieldChange:
+    return FieldChange(
+        version=version,
+        submodel="time",
+        field=field,
+        type=DataSpecification.values,
+        value=value,
+    )
+
+
+class TestChangeSubscription:
+    def test_next_coalesces_changes_per_field(self):
+        async def run():
+            subscription = ChangeSubscription(version=0)
+            subscription.push(1, [create_change(1, "tstop", 1.0)])
+            subscription.push(2, [create_change(2, "tstart", 2.0)])
+            subscription.push(3, [create_change(3, "tstop", 3.0)])
+            return await subscription.next()
+
+        notification = asyncio.run(run())
+
+        assert notification.version == 3
+        assert not notification.resync
+        assert [(c.field, c.value) for c in notification.changes] == [
+            ("tstart", 2.0),
+            ("tstop", 3.0),
+        ]
+
+    def test_exceeding_max_pending_yields_resync(self):
+        async def run():
+            subscription = ChangeSubscription(version=0, max_pending=1)
+            subscription.push(1, [create_change(1, "tstop", 1.0)])
+            subscription.push(2, [create_change(2, "tstart", 2.0)])
+            return await subscription.next()
+
+        notification = asyncio.run(run())
+
+        assert notification.version == 2
+        assert notification.resync
+        assert notification.changes == []
+
+
+class TestChangeBroadcaster:
+    def test_publish_only_reaches_subscriptions_of_model(self):
+        broadcaster = ChangeBroadcaster()
+        id = uuid4()
+
+        async def run():
+            with broadcaster.subscribe(id, 0) as subscription:
+                with broadcaster.subscribe(uuid4(), 0) as other:
+                    broadcaster.publish(id, 1, [create_change(1, "tstop", 1.0)])
+                    assert not other._available.is_set()
+                return await subscription.next()
+
+        notification = asyncio.run(run())
+
+        assert notification.version == 1
+        assert broadcaster.subscriber_count(id) == 0
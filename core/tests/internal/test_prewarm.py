@@ -0,0 +1,147 @@
+import asyncio
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from hydrolib.core.io.mdu.models import FMModel
+
+from flowfm_inspector.internal import prewarm
+from flowfm_inspector.internal.appdata import RecentProject, RecentProjectData
+from flowfm_inspector.internal.prewarm import (
+    Prewarmer,
+    PrewarmState,
+    select_recent_projects,
+)
+from tests.paths import Paths
+
+
+def create_models(name: str, n_models: int) -> List[Path]:
+    folder = Paths.temp_folder() / "TestPrewarm" / name
+    shutil.rmtree(folder, ignore_errors=True)
+    folder.mkdir(parents=True)
+
+    source = Paths.test_data_folder() / "models" / "simple.mdu"
+    paths = [folder / f"model_{i}.mdu" for i in range(n_models)]
+    for path in paths:
+        shutil.copy(source, path)
+    return paths
+
+
+def test_select_recent_projects_orders_by_last_opened():
+    paths = create_models("select", n_models=3)
+    now = datetime.now()
+    projects = RecentProjectData(
+        recent_projects=[
+            RecentProject(project_path=paths[0], last_opened=now - timedelta(days=2)),
+            RecentProject(project_path=paths[1], last_opened=now),
+            RecentProject(project_path=paths[2], last_opened=now - timedelta(days=1)),
+        ]
+    )
+
+    assert select_recent_projects(projects, 2) == [paths[1], paths[2]]
+
+
+def test_priority_is_lowered_on_windows(monkeypatch):
+    calls = []
+    kernel32 = SimpleNamespace(
+        GetCurrentProcess=lambda: -1,
+        SetPriorityClass=lambda process, priority: calls.append((process, priority)),
+    )
+    monkeypatch.setattr(prewarm.sys, "platform", "win32")
+    monkeypatch.setattr(
+        prewarm.ctypes, "windll", SimpleNamespace(kernel32=kernel32), raising=False
+    )
+    monkeypatch.setattr(
+        prewarm.os, "nice", lambda _: pytest.fail("nice was called."), raising=False
+    )
+
+    prewarm._lower_process_priority()
+
+    assert calls == [(-1, 0x4000)]
+
+
+class TestPrewarmer:
+    @staticmethod
+    def run(test) -> None:
+        async def run():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                prewarmer = Prewarmer(executor, FMModel)
+                try:
+                    await test(prewarmer)
+                finally:
+                    prewarmer.cancel()
+
+        asyncio.run(run())
+
+    def test_take_returns_prewarmed_model_once(self):
+        paths = create_models("take", n_models=2)
+
+        async def test(prewarmer: Prewarmer):
+            prewarmer.start(paths)
+            await prewarmer._task
+
+            model = await prewarmer.take(paths[0])
+            assert model is not None
+            assert model.time.tstop == 3600.0
+            assert await prewarmer.take(paths[0]) is None
+
+        TestPrewarmer.run(test)
+
+    def test_take_ignores_changed_model(self):
+        paths = create_models("changed", n_models=1)
+
+        async def test(prewarmer: Prewarmer):
+            prewarmer.start(paths)
+            await prewarmer._task
+
+            paths[0].write_text(paths[0].read_text() + "\n")
+            assert await prewarmer.take(paths[0]) is None
+
+        TestPrewarmer.run(test)
+
+    def test_models_exceeding_memory_ceiling_are_skipped(self):
+        paths = create_models("ceiling", n_models=2)
+
+        async def test(prewarmer: Prewarmer):
+            prewarmer.memory_ceiling = 1
+            prewarmer.start(paths)
+            await prewarmer._task
+
+            assert [e.state for e in prewarmer.entries] == [
+                PrewarmState.skipped,
+                PrewarmState.skipped,
+            ]
+            assert prewarmer.footprint == 0
+
+        TestPrewarmer.run(test)
+
+    def test_pending_model_is_not_prewarmed_once_taken(self):
+        paths = create_models("pending", n_models=1)
+
+        async def test(prewarmer: Prewarmer):
+            with prewarmer.interactive():
+                prewarmer.start(paths)
+                assert await prewarmer.take(paths[0]) is None
+
+            await prewarmer._task
+            assert prewarmer.entries == []
+
+        TestPrewarmer.run(test)
+
+    def test_interactive_loads_pause_prewarming(self):
+        paths = create_models("interactive", n_models=1)
+
+        async def test(prewarmer: Prewarmer):
+            with prewarmer.interactive():
+                prewarmer.start(paths)
+                await asyncio.sleep(0.1)
+                assert prewarmer.entries[0].state == PrewarmState.pending
+
+            await prewarmer._task
+            assert prewarmer.entries[0].state == PrewarmState.ready
+
+        TestPrewarmer.run(test)
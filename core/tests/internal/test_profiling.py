@@ -0,0 +1,114 @@
+import asyncio
+import pstats
+import shutil
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from fastapi import FastAPI
+
+from flowfm_inspector.internal.executor import WorkerPool
+from flowfm_inspector.internal.profiling import (
+    ProfilerKind,
+    ProfilingMiddleware,
+    RequestProfiler,
+)
+from tests.paths import Paths
+
+
+def create_folder(name: str) -> Path:
+    folder = Paths.temp_folder() / "TestRequestProfiler" / name
+    shutil.rmtree(folder, ignore_errors=True)
+    return folder
+
+
+def create_scope(path: str, headers: List[Tuple[bytes, bytes]] = []) -> Dict:
+    return {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+        "server": ("localhost", 8000),
+        "client": ("localhost", 1234),
+    }
+
+
+async def request(app, scope: Dict) -> Dict:
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return dict(messages[0]["headers"])
+
+
+def expensive_sum() -> int:
+    return sum(range(1000))
+
+
+class TestRequestProfiler:
+    def test_should_profile_requests_with_header_or_matching_pattern(self):
+        profiler = RequestProfiler(
+            create_folder("should"), pattern="/api/models/*", enabled=True
+        )
+
+        assert profiler.should_profile(create_scope("/api/models/1"))
+        assert profiler.should_profile(
+            create_scope("/api/schema", [(b"x-profile", b"1")])
+        )
+        assert not profiler.should_profile(
+            create_scope("/api/schema", [(b"x-profile", b"0")])
+        )
+        assert not profiler.should_profile(create_scope("/api/schema"))
+
+        profiler.enabled = False
+        assert not profiler.should_profile(create_scope("/api/models/1"))
+
+    def test_profile_includes_work_on_worker_pool(self):
+        folder = create_folder("worker")
+        profiler = RequestProfiler(folder, sampling=False, enabled=True)
+        pool = WorkerPool("test", max_workers=1)
+
+        app = FastAPI()
+        app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
+        @app.get("/api/sum")
+        async def get_sum():
+            return {"sum": await pool.run(expensive_sum)}
+
+        headers = asyncio.run(
+            request(app, create_scope("/api/sum", [(b"x-profile", b"1")]))
+        )
+        name = headers[b"x-profile-name"].decode()
+
+        (info,) = profiler.profiles
+        assert info.name == name
+        assert info.kind == ProfilerKind.cprofile
+        assert (info.path, info.status_code) == ("/api/sum", 200)
+
+        stats = pstats.Stats(str(profiler.get_path(name)))
+        functions = [function for _, _, function in stats.stats]
+        assert "expensive_sum" in functions
+
+    def test_requests_without_header_are_not_profiled(self):
+        profiler = RequestProfiler(create_folder("skip"), enabled=True)
+
+        app = FastAPI()
+        app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
+        @app.get("/api/value")
+        async def get_value():
+            return {"value": 42}
+
+        headers = asyncio.run(request(app, create_scope("/api/value")))
+
+        assert b"x-profile-name" not in headers
+        assert profiler.profiles == []
@@ -0,0 +1,108 @@
+import re
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from hydrolib.core.io.mdu.models import FMModel
+
+from flowfm_inspector.internal.saving import ModelSaver, write_atomic
+from tests.paths import Paths
+
+
+MDU_CONTENT = """[General]
+fileVersion = 1.09
+program     = D-Flow FM
+
+[Geometry]
+bedLevUni   = -3.0
+
+[External Forcing]
+extForceFileNew = forcing/boundaries.ext
+"""
+
+EXT_CONTENT = "[General]\nfileVersion = 2.01\nfileType = extForce\n"
+
+
+def create_model(name: str) -> Path:
+    folder = Paths.temp_folder() / "TestSaving" / name
+    shutil.rmtree(folder, ignore_errors=True)
+    (folder / "forcing").mkdir(parents=True)
+
+    (folder / "model.mdu").write_text(MDU_CONTENT)
+    (folder / "forcing" / "boundaries.ext").write_text(EXT_CONTENT)
+    return folder / "model.mdu"
+
+
+class TestModelSaver:
+    def test_save_writes_only_dirty_files(self):
+        path = create_model("dirty")
+        model = FMModel(path)
+        saver = ModelSaver()
+
+        model.geometry.bedlevuni = -5.0
+        saver.mark_dirty(1)
+        result = saver.save(1, model)
+
+        ext_path = path.parent / "forcing" / "boundaries.ext"
+        assert result.written == [path]
+        assert result.unchanged == [ext_path]
+        assert ext_path.read_text() == EXT_CONTENT
+        # The written model is not parsed again, as hydrolib cannot read back every
+        # field it writes.
+        assert re.search(r"bedLevUni\s*=\s*-5.0", path.read_text())
+        assert saver.get_dirty(1) == set()
+
+    def test_save_without_changes_writes_nothing(self):
+        path = create_model("clean")
+        content = path.read_text()
+
+        result = ModelSaver().save(1, FMModel(path))
+
+        assert result.written == []
+        assert path.read_text() == content
+
+    def test_save_writes_missing_files(self):
+        path = create_model("missing")
+        model = FMModel(path)
+        saver = ModelSaver()
+
+        model.external_forcing.extforcefilenew.filepath = Path("renamed.ext")
+        saver.mark_dirty(1)
+        result = saver.save(1, model)
+
+        assert set(result.written) == {path, path.parent / "renamed.ext"}
+
+    def test_failed_save_keeps_files_dirty(self):
+        path = create_model("failed")
+        model = FMModel(path)
+        saver = ModelSaver()
+        saver.mark_dirty(1)
+
+        with patch.object(FMModel, "_save", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                saver.save(1, model)
+
+        assert saver.get_dirty(1) == {""}
+
+    def test_save_without_file_path_fails(self):
+        saver = ModelSaver()
+        saver.mark_dirty(1)
+
+        with pytest.raises(ValueError):
+            saver.save(1, FMModel())
+
+        assert saver.get_dirty(1) == {""}
+        assert not (Path.cwd() / "fm.mdu").exists()
+
+
+def test_write_atomic_keeps_original_on_failure():
+    path = create_model("atomic")
+    model = FMModel(path)
+
+    with patch.object(FMModel, "_save", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            write_atomic(model, path)
+
+    assert path.read_text() == MDU_CONTENT
+    assert list(path.parent.glob("*.tmp")) == []
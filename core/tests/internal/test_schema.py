@@ -0,0 +1,70 @@
+import json
+import pytest
+from hydrolib.core.io.mdu.models import General, Numerics
+from flowfm_inspector.internal.schema import SchemaRegistry, get_sanitized_schema
+
+
+class TestSchemaRegistry:
+    @staticmethod
+    def create_registry() -> SchemaRegistry:
+        return SchemaRegistry({"mdu": {"general": General, "numerics": Numerics}})
+
+    def test_get_yields_sanitized_schema(self):
+        registry = TestSchemaRegistry.create_registry()
+
+        result = registry.get("mdu", "numerics")
+
+        assert json.loads(result.content) == get_sanitized_schema(Numerics)
+
+    def test_get_is_only_generated_once(self):
+        registry = TestSchemaRegistry.create_registry()
+
+        first = registry.get("mdu", "general")
+        second = registry.get("mdu", "general")
+
+        assert first is second
+
+    def test_etag_is_stable_across_registries(self):
+        first = TestSchemaRegistry.create_registry().get("mdu", "general")
+        second = TestSchemaRegistry.create_registry().get("mdu", "general")
+
+        assert first.etag == second.etag
+        assert first.etag != TestSchemaRegistry.create_registry().get(
+            "mdu", "numerics"
+        ).etag
+
+    def test_get_category_yields_all_schemas_of_category(self):
+        registry = TestSchemaRegistry.create_registry()
+
+        result = registry.get_category("mdu")
+
+        assert json.loads(result.content) == {
+            "general": get_sanitized_schema(General),
+            "numerics": get_sanitized_schema(Numerics),
+        }
+
+    def test_get_unknown_model_raises_without_caching(self):
+        registry = TestSchemaRegistry.create_registry()
+
+        with pytest.raises(KeyError):
+            registry.get("unknown", "general")
+        with pytest.raises(KeyError):
+            registry.get("mdu", "unknown")
+
+        with pytest.raises(KeyError):
+            registry.get_category("unknown")
+
+        assert "unknown" not in registry._schemas
+
+    def test_get_cached_yields_only_generated_schemas(self):
+        registry = TestSchemaRegistry.create_registry()
+
+        assert registry.get_cached("mdu", "general") is None
+        assert registry.get_cached("mdu") is None
+
+        general = registry.get("mdu", "general")
+        category = registry.get_category("mdu")
+
+        assert registry.get_cached("mdu", "general") is general
+        assert registry.get_cached("mdu") is category
+        assert registry.get_cached("unknown", "general") is None
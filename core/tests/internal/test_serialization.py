@@ -0,0 +1,96 @@
+import json
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from hydrolib.core.io.mdu.models import FMModel
+
+from flowfm_inspector.internal.serialization import (
+    ModelSerializationCache,
+    serialize_submodel,
+)
+
+
+class TestModelSerializationCache:
+    @staticmethod
+    def create_model() -> FMModel:
+        model = FMModel()
+        # The network cannot be serialized to JSON, and is not loaded by the inspector.
+        model.geometry.netfile = None
+        return model
+
+    @staticmethod
+    def expected(model: FMModel) -> dict:
+        return jsonable_encoder(model.dict(by_alias=True))
+
+    def test_serialize_yields_model_dict(self):
+        model = TestModelSerializationCache.create_model()
+        model.general.comments.fileversion = "A comment"
+
+        result = ModelSerializationCache().serialize(uuid4(), model)
+
+        assert json.loads(result) == TestModelSerializationCache.expected(model)
+
+    def test_serialize_reuses_submodels_until_invalidated(self):
+        id = uuid4()
+        model = TestModelSerializationCache.create_model()
+        cache = ModelSerializationCache()
+        cache.serialize(id, model)
+
+        model.time.tstop = 42.0
+        model.general.program = "Something else"
+        stale = json.loads(cache.serialize(id, model))
+
+        assert stale["time"]["tStop"] == 86400.0
+        assert stale["general"]["program"] == "D-Flow FM"
+
+        cache.invalidate(id, "time")
+        result = json.loads(cache.serialize(id, model))
+
+        assert result["time"]["tStop"] == 42.0
+        assert result["general"]["program"] == "D-Flow FM"
+
+        cache.invalidate(id)
+        assert json.loads(cache.serialize(id, model)) == (
+            TestModelSerializationCache.expected(model)
+        )
+
+    def test_submodel_digest_follows_invalidation(self):
+        id_a, id_b = uuid4(), uuid4()
+        model_a = TestModelSerializationCache.create_model()
+        model_b = TestModelSerializationCache.create_model()
+        cache = ModelSerializationCache()
+
+        assert cache.submodel_digest(id_a, model_a, "time") == cache.submodel_digest(
+            id_b, model_b, "time"
+        )
+
+        model_b.time.tstop = 42.0
+        cache.invalidate(id_b, "time")
+
+        assert cache.submodel_digest(id_a, model_a, "time") != cache.submodel_digest(
+            id_b, model_b, "time"
+        )
+
+
+class TestSerializeSubmodel:
+    def test_selected_fields_include_only_their_comments(self):
+        model = FMModel()
+        model.time.comments.tstop = "Stop"
+        model.time.comments.tstart = "Start"
+
+        result = json.loads(serialize_submodel(model.time, ["tstop", "dtuser"]))
+
+        assert result == {
+            "comments": {"tstop": "Stop"},
+            "tStop": 86400.0,
+            "dtUser": 300.0,
+        }
+
+    def test_comments_can_be_excluded(self):
+        model = FMModel()
+        model.time.comments.tstop = "Stop"
+
+        result = json.loads(serialize_submodel(model.time, comments=False))
+
+        assert "comments" not in result
+        assert result["tStop"] == 86400.0
@@ -0,0 +1,147 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import netCDF4 as nc
+import numpy as np
+import pytest
+
+from flowfm_inspector.internal.network import LazyNetwork
+from flowfm_inspector.internal.spatial import (
+    MeshSpatialIndex,
+    SpatialIndexRegistry,
+    SpatialKind,
+    UniformGridIndex,
+    compute_face_centers,
+)
+from tests.paths import Paths
+from tests.ugrid import write_rectilinear_ugrid
+
+
+class TestUniformGridIndex:
+    @staticmethod
+    def random_points(n: int) -> np.ndarray:
+        generator = np.random.default_rng(42)
+        return generator.uniform((-50.0, 10.0), (150.0, 30.0), size=(n, 2))
+
+    @pytest.mark.parametrize(
+        "location", [(0.0, 20.0), (149.0, 11.0), (-500.0, 400.0), (75.3, -2.0)]
+    )
+    def test_nearest_matches_linear_scan(self, location):
+        points = TestUniformGridIndex.random_points(5000)
+        index = UniformGridIndex(points)
+
+        result, distance = index.nearest(*location)
+
+        distances = np.hypot(points[:, 0] - location[0], points[:, 1] - location[1])
+        assert result == int(np.argmin(distances))
+        assert distance == pytest.approx(distances.min())
+
+    def test_within_matches_linear_scan(self):
+        points = TestUniformGridIndex.random_points(5000)
+        index = UniformGridIndex(points)
+
+        result = index.within(10.0, 12.0, 40.0, 25.0)
+
+        expected = np.flatnonzero(
+            (points[:, 0] >= 10.0)
+            & (points[:, 0] <= 40.0)
+            & (points[:, 1] >= 12.0)
+            & (points[:, 1] <= 25.0)
+        )
+        np.testing.assert_array_equal(result, expected)
+
+    def test_within_outside_bounds_is_empty(self):
+        index = UniformGridIndex(TestUniformGridIndex.random_points(100))
+        assert len(index.within(200.0, 200.0, 300.0, 300.0)) == 0
+
+    def test_within_inverted_bounds_is_empty(self):
+        index = UniformGridIndex(TestUniformGridIndex.random_points(5000))
+        assert len(index.within(10.0, 25.0, 40.0, 15.0)) == 0
+        assert len(index.within(40.0, 12.0, 10.0, 25.0)) == 0
+        assert len(index.within(float("nan"), 12.0, 40.0, 25.0)) == 0
+
+    def test_degenerate_points(self):
+        index = UniformGridIndex(np.array([[1.0, 2.0], [1.0, 2.0], [1.0, 5.0]]))
+
+        assert index.nearest(0.0, 4.5) == (2, pytest.approx(np.hypot(1.0, 0.5)))
+        np.testing.assert_array_equal(index.within(0.0, 0.0, 2.0, 3.0), [0, 1])
+
+    def test_points_without_coordinates_are_ignored(self):
+        points = np.array([[0.0, 0.0], [np.nan, 1.0], [3.0, np.inf], [4.0, 4.0]])
+        index = UniformGridIndex(points)
+
+        assert len(index) == 2
+        assert index.nearest(1.0, 1.0) == (0, pytest.approx(np.hypot(1.0, 1.0)))
+        assert index.nearest(3.0, 3.0)[0] == 3
+        np.testing.assert_array_equal(index.within(-10.0, -10.0, 10.0, 10.0), [0, 3])
+
+    def test_empty_index(self):
+        index = UniformGridIndex(np.empty((0, 2)))
+
+        assert index.nearest(0.0, 0.0)[0] == -1
+        assert len(index.within(-1.0, -1.0, 1.0, 1.0)) == 0
+
+
+def test_compute_face_centers_ignores_missing_nodes():
+    nodes = np.array([[0.0, 0.0], [2.0, 0.0], [2.0, 2.0], [0.0, 2.0]])
+    faces = np.array([[0, 1, 2, 3], [0, 1, 2, -1]])
+
+    np.testing.assert_allclose(
+        compute_face_centers(nodes, faces), [[1.0, 1.0], [4.0 / 3.0, 2.0 / 3.0]]
+    )
+
+
+class TestMeshSpatialIndex:
+    @staticmethod
+    def open_network(name: str) -> LazyNetwork:
+        path = Paths.temp_folder() / TestMeshSpatialIndex.__name__ / f"{name}_net.nc"
+        write_rectilinear_ugrid(path, nx=4, ny=3, dx=10.0)
+        return LazyNetwork(path)
+
+    def test_queries_nodes_and_faces(self):
+        network = TestMeshSpatialIndex.open_network("queries")
+        index = MeshSpatialIndex(network, "mesh2d")
+        network.close()
+
+        node = index.nearest(SpatialKind.nodes, 21.0, 9.0)
+        face = index.nearest(SpatialKind.faces, 21.0, 9.0)
+        within = index.within(SpatialKind.faces, (0.0, 0.0, 20.0, 10.0), limit=1)
+
+        assert (node.index, node.x, node.y) == (7, 20.0, 10.0)
+        assert (face.index, face.x, face.y) == (2, 25.0, 5.0)
+        assert within.count == 2
+        assert within.indices == [0]
+        assert within.truncated
+
+    def test_nodes_with_fill_values_are_ignored(self):
+        path = Paths.temp_folder() / TestMeshSpatialIndex.__name__ / "fill_net.nc"
+        write_rectilinear_ugrid(path, nx=4, ny=3, dx=10.0)
+        with nc.Dataset(path, "a") as dataset:
+            dataset.variables["mesh2d_node_x"][0] = nc.default_fillvals["f8"]
+            dataset.variables["mesh2d_node_y"][19] = np.nan
+
+        network = LazyNetwork(path)
+        index = MeshSpatialIndex(network, "mesh2d")
+        network.close()
+
+        node = index.nearest(SpatialKind.nodes, 1.0, -1.0)
+        face = index.nearest(SpatialKind.faces, 1.0, -1.0)
+        within = index.within(SpatialKind.faces, (0.0, 0.0, 20.0, 10.0))
+
+        assert (len(index.nodes), len(index.faces)) == (18, 10)
+        assert (node.index, node.x, node.y) == (1, 10.0, 0.0)
+        assert (face.index, face.x, face.y) == (1, 15.0, 5.0)
+        assert within.indices == [1]
+
+    def test_registry_builds_index_once(self):
+        network = TestMeshSpatialIndex.open_network("registry")
+        registry = SpatialIndexRegistry()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            first = registry.get(network, "mesh2d", executor)
+            second = registry.get(network, "mesh2d", executor)
+            result = first.result()
+
+        network.close()
+
+        assert first is second
+        assert len(result.faces) == 12
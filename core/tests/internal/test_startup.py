@@ -0,0 +1,156 @@
+import asyncio
+import json
+import threading
+from typing import Dict, List, Tuple
+
+from fastapi import FastAPI
+
+from flowfm_inspector.internal.startup import DeferredApp, StartupProfile
+
+
+def create_app(events: List[str]) -> FastAPI:
+    app = FastAPI()
+
+    @app.on_event("startup")
+    async def startup():
+        events.append("startup")
+
+    @app.on_event("shutdown")
+    async def shutdown():
+        events.append("shutdown")
+
+    @app.get("/api/value")
+    async def value():
+        return {"value": 42}
+
+    return app
+
+
+async def request(app: DeferredApp, path: str) -> Tuple[int, Dict]:
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "server": ("localhost", 8000),
+        "client": ("localhost", 1234),
+    }
+    await app(scope, receive, send)
+
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return messages[0]["status"], json.loads(body)
+
+
+class Lifespan:
+    def __init__(self, app: DeferredApp) -> None:
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._sent: asyncio.Queue = asyncio.Queue()
+        self._task = asyncio.create_task(
+            app({"type": "lifespan"}, self._queue.get, self._sent.put)
+        )
+
+    async def send(self, message_type: str) -> str:
+        await self._queue.put({"type": message_type})
+        return (await self._sent.get())["type"]
+
+    async def close(self) -> None:
+        await self.send("lifespan.shutdown")
+        await self._task
+
+
+class TestDeferredApp:
+    def test_health_reports_starting_until_loaded(self):
+        events = []
+        release = threading.Event()
+
+        def load():
+            release.wait()
+            return create_app(events)
+
+        async def run():
+            app = DeferredApp(load)
+            lifespan = Lifespan(app)
+
+            assert await lifespan.send("lifespan.startup") == (
+                "lifespan.startup.complete"
+            )
+            assert await request(app, "/api/health") == (503, {"status": "starting"})
+
+            release.set()
+            await asyncio.wait_for(app._task, 5.0)
+            assert await request(app, "/api/health") == (200, {"status": "ready"})
+
+            await lifespan.close()
+
+        asyncio.run(run())
+        assert events == ["startup", "shutdown"]
+
+    def test_requests_wait_until_loaded(self):
+        release = threading.Event()
+
+        def load():
+            release.wait()
+            return create_app([])
+
+        async def run():
+            app = DeferredApp(load)
+            lifespan = Lifespan(app)
+            await lifespan.send("lifespan.startup")
+
+            pending = asyncio.create_task(request(app, "/api/value"))
+            await asyncio.sleep(0.05)
+            assert not pending.done()
+
+            release.set()
+            assert await asyncio.wait_for(pending, 5.0) == (200, {"value": 42})
+
+            await lifespan.close()
+
+        asyncio.run(run())
+
+    def test_failed_load_is_reported(self):
+        def load():
+            raise RuntimeError("broken")
+
+        async def run():
+            app = DeferredApp(load)
+            lifespan = Lifespan(app)
+            await lifespan.send("lifespan.startup")
+
+            try:
+                await app._task
+            except RuntimeError:
+                pass
+
+            status, content = await request(app, "/api/health")
+            assert (status, content["status"]) == (500, "failed")
+            assert (await request(app, "/api/value"))[0] == 500
+
+            await lifespan.close()
+
+        asyncio.run(run())
+
+
+def test_startup_profile_records_phases():
+    profile = StartupProfile()
+
+    with profile.phase("first"):
+        pass
+    profile.mark("second")
+
+    assert [phase.name for phase in profile.phases] == ["first", "second"]
+    assert all(phase.duration >= 0.0 for phase in profile.phases)
+    assert "second" in profile.report().splitlines()[2]
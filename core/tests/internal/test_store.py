@@ -0,0 +1,134 @@
+import threading
+from typing import Callable, Optional
+from uuid import uuid4
+
+import pytest
+from hydrolib.core.io.mdu.models import FMModel
+from pydantic.types import UUID4
+
+from flowfm_inspector.internal.store import ModelStore
+from tests.paths import Paths
+
+
+class TestModelStore:
+    @staticmethod
+    def create_model(fileversion: str) -> FMModel:
+        model = FMModel()
+        # The network cannot be pickled, and is not loaded by the inspector.
+        model.geometry.netfile = None
+        model.general.fileversion = fileversion
+        return model
+
+    @staticmethod
+    def create_store(
+        name: str, n_models: int, on_spill: Optional[Callable[[UUID4], None]] = None
+    ) -> ModelStore:
+        footprint = ModelStore.estimate_footprint(TestModelStore.create_model("1.0"))
+        return ModelStore(
+            memory_budget=int(footprint * (n_models + 0.5)),
+            spill_folder=Paths.temp_folder() / TestModelStore.__name__ / name,
+            on_spill=on_spill,
+        )
+
+    def test_without_budget_models_are_resident(self):
+        store = ModelStore()
+        ids = [uuid4() for _ in range(5)]
+
+        for id in ids:
+            store[id] = TestModelStore.create_model("1.0")
+
+        assert list(store) == ids
+        assert all(store.is_resident(id) for id in ids)
+        assert store.stats.spilled_count == 0
+
+    def test_least_recently_used_models_are_spilled(self):
+        store = TestModelStore.create_store("spill", n_models=2)
+        ids = [uuid4() for _ in range(3)]
+
+        store[ids[0]] = TestModelStore.create_model("1.0")
+        store[ids[1]] = TestModelStore.create_model("1.1")
+        _ = store[ids[0]]
+        store[ids[2]] = TestModelStore.create_model("1.2")
+
+        assert store.is_resident(ids[0])
+        assert not store.is_resident(ids[1])
+        assert store.is_resident(ids[2])
+        assert len(store) == 3
+        assert ids[1] in store
+
+    def test_spilled_models_are_reported(self):
+        spilled = []
+        store = TestModelStore.create_store("report", 1, on_spill=spilled.append)
+        first, second = uuid4(), uuid4()
+
+        store[first] = TestModelStore.create_model("1.0")
+        store[second] = TestModelStore.create_model("1.1")
+
+        assert spilled == [first]
+
+    def test_spilled_model_is_reloaded_transparently(self):
+        store = TestModelStore.create_store("reload", n_models=1)
+        first, second = uuid4(), uuid4()
+
+        store[first] = TestModelStore.create_model("1.0")
+        store[second] = TestModelStore.create_model("1.1")
+        result = store[first]
+
+        assert result.general.fileversion == "1.0"
+        assert store.is_resident(first)
+        assert not store.is_resident(second)
+        assert store.stats.reload_count == 1
+
+        store.close()
+
+    def test_referenced_spilled_model_is_reused(self):
+        store = TestModelStore.create_store("reuse", n_models=1)
+        first, second = uuid4(), uuid4()
+
+        model = TestModelStore.create_model("1.0")
+        store[first] = model
+        store[second] = TestModelStore.create_model("1.1")
+        model.general.fileversion = "2.0"
+
+        assert store[first] is model
+        assert store.stats.reload_count == 0
+
+        store.close()
+
+    def test_delete_removes_snapshot(self):
+        store = TestModelStore.create_store("delete", n_models=1)
+        first, second = uuid4(), uuid4()
+
+        store[first] = TestModelStore.create_model("1.0")
+        store[second] = TestModelStore.create_model("1.1")
+        del store[first]
+
+        assert first not in store
+        assert store.stats.spilled_count == 0
+        with pytest.raises(KeyError):
+            _ = store[first]
+
+    def test_model_is_not_spilled_while_updated(self):
+        store = TestModelStore.create_store("update", n_models=1)
+        first, second = uuid4(), uuid4()
+        store[first] = TestModelStore.create_model("1.0")
+        # Adding the second model spills the first, which has to wait for the update.
+        add = threading.Thread(
+            target=store.__setitem__, args=(second, TestModelStore.create_model("1.1"))
+        )
+
+        def modify(model: FMModel) -> str:
+            add.start()
+            add.join(timeout=0.1)
+            model.general.fileversion = "2.0"
+            return model.general.fileversion
+
+        result = store.update(first, modify)
+        add.join()
+
+        assert result == "2.0"
+        assert not store.is_resident(first)
+        assert store[first].general.fileversion == "2.0"
+        assert store.stats.reload_count == 1
+
+        store.close()
@@ -0,0 +1,111 @@
+from typing import get_args
+
+from hydrolib.core.io.ini.models import INIBasedModel
+from hydrolib.core.io.mdu.models import FMModel
+
+from flowfm_inspector.internal.updates import (
+    DataSpecification,
+    FieldUpdate,
+    FilePathModel,
+    SubmodelName,
+    ValueType,
+    apply_updates,
+    to_submodel_field,
+)
+
+
+class TestApplyUpdates:
+    def test_valid_updates_are_all_applied(self):
+        model = FMModel()
+        updates = [
+            FieldUpdate(submodel="time", field="tstop", value=100.0),
+            FieldUpdate(
+                submodel="time",
+                field="tstop",
+                type=DataSpecification.comments,
+                value="Stop time",
+            ),
+            FieldUpdate(
+                submodel="geometry",
+                field="netfile",
+                value=FilePathModel(filepath="net.nc"),
+                valuetype=ValueType.path,
+            ),
+        ]
+
+        results = apply_updates(model, updates)
+
+        assert all(result.ok for result in results)
+        assert model.time.tstop == 100.0
+        assert model.time.comments.tstop == "Stop time"
+        assert str(model.geometry.netfile.filepath) == "net.nc"
+
+    def test_invalid_update_rolls_back_all_updates(self):
+        model = FMModel()
+        updates = [
+            FieldUpdate(submodel="time", field="tstop", value=100.0),
+            FieldUpdate(submodel="numerics", field="cflmax", value="not-a-number"),
+            FieldUpdate(submodel="time", field="tstart", value=10.0),
+            FieldUpdate(submodel="time", field="tstop", value=200.0),
+        ]
+
+        results = apply_updates(model, updates)
+
+        assert [result.ok for result in results] == [True, False, True, True]
+        assert results[1].error
+        assert model.time.tstop == FMModel().time.tstop
+        assert model.time.tstart == FMModel().time.tstart
+        assert model.numerics.cflmax == FMModel().numerics.cflmax
+
+    def test_values_keep_their_type(self):
+        values = [0.5, 3, True, "3", [1, 2], [0.5, 1], [True, False], ["a"]]
+
+        updates = [
+            FieldUpdate(submodel="time", field="dtuser", value=value)
+            for value in values
+        ]
+
+        assert [update.value for update in updates] == values
+        assert [type(update.value) for update in updates[:4]] == [
+            float,
+            int,
+            bool,
+            str,
+        ]
+        assert type(updates[4].value[0]) is int
+        assert type(updates[6].value[0]) is bool
+
+    def test_float_update_is_applied(self):
+        model = FMModel()
+
+        update = FieldUpdate.parse_raw(
+            '{"submodel": "time", "field": "dtuser", "value": 0.5}'
+        )
+        results = apply_updates(model, [update])
+
+        assert results[0].ok
+        assert model.time.dtuser == 0.5
+
+
+class TestSubmodelName:
+    def test_every_submodel_is_a_field_of_the_model(self):
+        fields = FMModel.__fields__
+        submodels = {
+            name
+            for name, field in fields.items()
+            if isinstance(field.type_, type) and issubclass(field.type_, INIBasedModel)
+        }
+
+        names = {to_submodel_field(name) for name in get_args(SubmodelName)}
+
+        assert names == submodels
+
+    def test_schema_name_is_converted_to_field_name(self):
+        model = FMModel()
+        update = FieldUpdate(submodel="externalforcing", field="rainfall", value=True)
+
+        results = apply_updates(model, [update])
+
+        assert update.submodel == "external_forcing"
+        assert results[0].ok
+        assert model.external_forcing.rainfall is True
@@ -0,0 +1,96 @@
+import shutil
+from pathlib import Path
+
+from hydrolib.core.io.mdu.models import FMModel
+
+from flowfm_inspector.internal.validation import (
+    RULES,
+    Severity,
+    ValidationEngine,
+    ValidationRule,
+)
+from tests.paths import Paths
+
+
+def create_model() -> FMModel:
+    model = FMModel()
+    model.geometry.netfile = None
+    return model
+
+
+class TestValidationEngine:
+    def test_first_validation_evaluates_every_rule(self):
+        report = ValidationEngine().validate(1, create_model(), 0)
+
+        assert report.evaluated == [r.name for r in RULES]
+        assert not report.valid
+        assert [i.rule for i in report.issues] == ["net_file_referenced"]
+
+    def test_only_affected_rules_are_evaluated(self):
+        engine = ValidationEngine()
+        model = create_model()
+        engine.validate(1, model, 0)
+
+        model.time.tstop = -1.0
+        report = engine.validate(1, model, 1, {"time.tstop"})
+
+        assert report.evaluated == [
+            "stop_after_start",
+            "output_intervals_within_period",
+        ]
+        assert {i.rule for i in report.issues} == {
+            "stop_after_start",
+            "net_file_referenced",
+        }
+
+    def test_submodel_wildcard_matches_any_field(self):
+        rules = ValidationEngine().get_affected_rules({"geometry.bedlevuni"})
+        assert [r.name for r in rules] == ["geometry_files_exist"]
+
+    def test_changed_forcing_file_is_validated(self):
+        folder = Paths.temp_folder() / "TestValidation" / "forcing"
+        shutil.rmtree(folder, ignore_errors=True)
+        folder.mkdir(parents=True)
+        (folder / "model.mdu").write_text(
+            "[General]\nfileVersion = 1.09\n\n"
+            "[External Forcing]\nextForceFileNew = boundaries.ext\n"
+        )
+        (folder / "boundaries.ext").write_text(
+            "[General]\nfileVersion = 2.01\nfileType = extForce\n"
+        )
+
+        engine = ValidationEngine()
+        model = FMModel(folder / "model.mdu")
+        report = engine.validate(1, model, 0)
+        assert "forcing_files_exist" not in {i.rule for i in report.issues}
+
+        model.external_forcing.extforcefilenew.filepath = Path("renamed.ext")
+        report = engine.validate(1, model, 1, {"external_forcing.extforcefilenew"})
+
+        assert report.evaluated == ["forcing_files_exist"]
+        assert "forcing_files_exist" in {i.rule for i in report.issues}
+
+    def test_same_version_reuses_cached_report(self):
+        engine = ValidationEngine()
+        model = create_model()
+        engine.validate(1, model, 3)
+
+        model.numerics.cflmax = 0.0
+        report = engine.validate(1, model, 3, set())
+
+        assert report.version == 3
+        assert report.evaluated == []
+        assert "positive_courant_number" not in {i.rule for i in report.issues}
+
+    def test_failing_rule_is_reported(self):
+        def check(model: FMModel):
+            raise AttributeError("broken")
+
+        rule = ValidationRule(
+            "broken", Severity.error, frozenset({"time.tstop"}), check
+        )
+        report = ValidationEngine([rule]).validate(1, create_model(), 0)
+
+        assert not report.valid
+        assert len(report.issues) == 1
+        assert report.issues[0].message == "The rule could not be evaluated: broken"
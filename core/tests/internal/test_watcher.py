@@ -0,0 +1,161 @@
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from hydrolib.core.io.mdu.models import FMModel
+
+from flowfm_inspector.internal.updates import DataSpecification
+from flowfm_inspector.internal.watcher import (
+    FileWatcher,
+    apply_reloaded_files,
+    load_changed_files,
+)
+from tests.paths import Paths
+
+
+MDU_CONTENT = """[General]
+fileVersion = 1.09
+program     = D-Flow FM
+
+[Geometry]
+bedLevUni   = -3.0
+
+[External Forcing]
+extForceFileNew = forcing/boundaries.ext
+"""
+
+EXT_CONTENT = "[General]\nfileVersion = 2.01\nfileType = extForce\n"
+
+
+def create_model(name: str) -> Path:
+    folder = Paths.temp_folder() / "TestWatcher" / name
+    shutil.rmtree(folder, ignore_errors=True)
+    (folder / "forcing").mkdir(parents=True)
+
+    (folder / "model.mdu").write_text(MDU_CONTENT)
+    (folder / "forcing" / "boundaries.ext").write_text(EXT_CONTENT)
+    return folder / "model.mdu"
+
+
+def create_file(name: str) -> Path:
+    folder = Paths.temp_folder() / "TestWatcher" / name
+    shutil.rmtree(folder, ignore_errors=True)
+    folder.mkdir(parents=True)
+
+    path = folder / "watched.txt"
+    path.write_text("a")
+    return path
+
+
+class TestFileWatcher:
+    def test_change_is_reported_after_debounce(self):
+        path = create_file("debounce")
+        watcher = FileWatcher(debounce=1.0, native=False)
+        watcher.watch(1, [path])
+
+        path.write_text("ab")
+        watcher.scan()
+        now = time.monotonic()
+
+        assert watcher.flush(now) == {}
+        assert watcher.flush(now + 1.0) == {1: {path}}
+        assert watcher.flush(now + 2.0) == {}
+
+    def test_further_change_restarts_debounce(self):
+        path = create_file("burst")
+        watcher = FileWatcher(debounce=1.0, native=False)
+        watcher.watch(1, [path])
+
+        path.write_text("ab")
+        watcher.scan()
+        first = time.monotonic()
+        time.sleep(0.01)
+
+        path.write_text("abc")
+        watcher.scan()
+
+        assert watcher.flush(first + 1.0) == {}
+        assert watcher.flush(first + 2.0) == {1: {path}}
+
+    def test_acknowledged_change_is_not_reported(self):
+        path = create_file("acknowledge")
+        watcher = FileWatcher(debounce=0.0, native=False)
+        watcher.watch(1, [path])
+
+        path.write_text("ab")
+        watcher.acknowledge([path])
+        watcher.scan()
+
+        assert watcher.flush() == {}
+
+    def test_running_watcher_reports_change(self):
+        path = create_file("running")
+        watcher = FileWatcher(debounce=0.05, poll_interval=0.01, native=False)
+        watcher.watch(1, [path])
+
+        reported = threading.Event()
+        changes = []
+
+        def on_change(id, paths):
+            changes.append((id, paths))
+            reported.set()
+
+        watcher.start(on_change)
+        try:
+            path.write_text("ab")
+            assert reported.wait(5.0)
+        finally:
+            watcher.stop()
+
+        assert changes == [(1, {path})]
+
+
+class TestLoadChangedFiles:
+    def test_only_changed_child_is_reloaded(self):
+        path = create_model("child")
+        model = FMModel(path)
+        ext_path = path.parent / "forcing" / "boundaries.ext"
+        general = model.general
+
+        ext_path.write_text(EXT_CONTENT.replace("2.01", "2.02"))
+        reloaded = load_changed_files(model, {ext_path})
+
+        assert [(f.field, f.path) for f in reloaded] == [
+            ("external_forcing.extforcefilenew", ext_path)
+        ]
+        assert reloaded[0].changes == [
+            ("external_forcing", "extforcefilenew", DataSpecification.values)
+        ]
+
+        result = apply_reloaded_files(model, reloaded)
+
+        extforcefile = result.external_forcing.extforcefilenew
+        assert result is model
+        assert model.general is general
+        assert extforcefile.general.fileversion == "2.02"
+        assert extforcefile.filepath == Path("forcing/boundaries.ext")
+
+    def test_changed_root_reloads_model(self):
+        path = create_model("root")
+        model = FMModel(path)
+
+        path.write_text(MDU_CONTENT.replace("-3.0", "-4.0"))
+        reloaded = load_changed_files(model, {path})
+
+        assert len(reloaded) == 1
+        assert ("geometry", "bedlevuni", DataSpecification.values) in (
+            reloaded[0].changes
+        )
+
+        result = apply_reloaded_files(model, reloaded)
+        assert result is not model
+        assert result.geometry.bedlevuni == -4.0
+
+    def test_skipped_files_are_not_reloaded(self):
+        path = create_model("skipped")
+        model = FMModel(path)
+
+        path.write_text(MDU_CONTENT.replace("-3.0", "-4.0"))
+
+        assert load_changed_files(model, {path}, skip={""}) == []
@@ -0,0 +1,39 @@
+import shutil
+
+from hydrolib.core.io.mdu.models import FMModel
+
+from benchmarks.models import SIZES, generate_model
+from benchmarks.suite import compare_results, create_benchmarks
+from flowfm_inspector.internal.network import disable_network_loading
+from tests.paths import Paths
+
+
+def test_generated_model_contains_all_objects():
+    folder = Paths.temp_folder() / "TestBenchmarks" / "model"
+    shutil.rmtree(folder, ignore_errors=True)
+    size = SIZES["small"]
+
+    disable_network_loading()
+    model = FMModel(generate_model(folder, size))
+
+    structures = model.geometry.structurefile
+    assert sum(len(s.structure) for s in structures) == size.structures
+    assert len(model.geometry.crosslocfile.crosssection) == size.cross_sections
+    assert len(model.external_forcing.extforcefilenew.boundary) == size.boundaries
+    assert len(model.output.obsfile) == size.observation_files
+
+
+def test_benchmarks_run():
+    folder = Paths.temp_folder() / "TestBenchmarks" / "run"
+    shutil.rmtree(folder, ignore_errors=True)
+    model_path = generate_model(folder / "model", SIZES["small"])
+
+    for benchmark in create_benchmarks(model_path, folder):
+        benchmark.run()
+
+
+def test_compare_results():
+    baseline = {"results": {"a": {"median": 1.0}, "b": {"median": 2.0}}}
+    current = {"results": {"a": {"median": 1.5}, "c": {"median": 1.0}}}
+
+    assert compare_results(baseline, current) == {"a": 1.5, "c": None}
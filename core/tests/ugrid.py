@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import netCDF4 as nc
+import numpy as np
+
+
+def write_rectilinear_ugrid(path: Path, nx: int, ny: int, dx: float = 1.0) -> None:
+    """Write a rectilinear 2D UGRID net file of nx by ny cells to the path.
+
+    The face node connectivity is one-based and has room for five nodes per
+    face, of which the last is always a fill value.
+    """
+    x, y = np.meshgrid(np.arange(nx + 1) * dx, np.arange(ny + 1) * dx)
+    node_x, node_y = x.ravel(), y.ravel()
+
+    def node(i: int, j: int) -> int:
+        return j * (nx + 1) + i
+
+    edges = [(node(i, j), node(i + 1, j)) for j in range(ny + 1) for i in range(nx)]
+    edges += [(node(i, j), node(i, j + 1)) for j in range(ny) for i in range(nx + 1)]
+    faces = [
+        (node(i, j), node(i + 1, j), node(i + 1, j + 1), node(i, j + 1))
+        for j in range(ny)
+        for i in range(nx)
+    ]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with nc.Dataset(path, "w") as dataset:
+        dataset.createDimension("mesh2d_nNodes", len(node_x))
+        dataset.createDimension("mesh2d_nEdges", len(edges))
+        dataset.createDimension("mesh2d_nFaces", len(faces))
+        dataset.createDimension("Two", 2)
+        dataset.createDimension("mesh2d_nMax_face_nodes", 5)
+
+        crs = dataset.createVariable("projected_coordinate_system", "i4")
+        crs.epsg = 28992
+        crs.grid_mapping_name = "Unknown projected"
+
+        mesh = dataset.createVariable("mesh2d", "i4")
+        mesh.cf_role = "mesh_topology"
+        mesh.topology_dimension = 2
+        mesh.node_coordinates = "mesh2d_node_x mesh2d_node_y"
+        mesh.edge_node_connectivity = "mesh2d_edge_nodes"
+        mesh.face_node_connectivity = "mesh2d_face_nodes"
+
+        dataset.createVariable("mesh2d_node_x", "f8", ("mesh2d_nNodes",))[:] = node_x
+        dataset.createVariable("mesh2d_node_y", "f8", ("mesh2d_nNodes",))[:] = node_y
+
+        edge_nodes = dataset.createVariable(
+            "mesh2d_edge_nodes", "i4", ("mesh2d_nEdges", "Two")
+        )
+        edge_nodes.start_index = 1
+        edge_nodes[:] = np.array(edges) + 1
+
+        face_nodes = dataset.createVariable(
+            "mesh2d_face_nodes",
+            "i4",
+            ("mesh2d_nFaces", "mesh2d_nMax_face_nodes"),
+            fill_value=-999,
+        )
+        face_nodes.start_index = 1
+        face_data = np.full((len(faces), 5), -999, dtype=np.int32)
+        face_data[:, :4] = np.array(faces) + 1
+        face_nodes[:] = face_data
@@ -6,7 +6,7 @@ import { CollapsiblePanel } from "../components/collapsible-panel"
 import Seo from "../components/seo"
 import { SupportedType, ValueType } from "../components/tables/input-elements"
 
-const schema_url = "http://localhost:8000/api/schema"
+const view_url = "http://localhost:8000/api/views/mdu"
 
 const tables = [
     "general",
@@ -45,13 +45,16 @@ function put<TIn>(url: string, data: TIn): Promise<void> {
     })
 }
 
-interface ModelsResult {
-    models: string[]
-}
-
 interface MduResult { [key: string]: Model }
 interface SchemaResult { [key: string]: Schema }
 
+interface ViewResult {
+    models: string[]
+    id: string
+    model: MduResult
+    schemas: SchemaResult
+}
+
 function adjustPropertyValueInModel(
     previousMduResult: MduResult,
     modelKey: string,
@@ -91,26 +94,11 @@ const MduPage: React.FC<PageProps> = () => {
     const [schemaData, setSchemaData] = React.useState<SchemaResult>({})
 
     React.useEffect(() => {
-        api<ModelsResult>(models_url)
-            .then(data => {
-                setModelID(data.models[0]);
-                api<MduResult>(`${models_url}/${data.models[0]}`)
-                    .then(v => {
-                        setModelData(v)
-                    });
-            })
-
-    }, []);
-
-    React.useEffect(() => {
-        const schemas: Promise<[string, Schema]>[] = tables.map(modelName =>
-            api<Schema>(`${schema_url}/mdu/${modelName}`).then(value => [modelName, value])
-        )
-
-        Promise.all(schemas)
-            .then(values => {
-                const schema = Object.fromEntries(new Map(values))
-                setSchemaData(schema);
+        api<ViewResult>(view_url)
+            .then(view => {
+                setModelID(view.id);
+                setModelData(view.model);
+                setSchemaData(view.schemas);
             })
     }, []);
 